@@ -0,0 +1,8 @@
+#/bin/bash
+
+parts=""
+for package in "$@"; do
+    parts="$parts -F package=@${package//\'/\'}"
+done
+
+curl -X POST $parts http://127.0.0.1:5000/vnsfs/batch
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import hashlib
+import json
+import logging
+import os
+import tarfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Response, abort, request
+from storeutils import http_utils
+
+VNSFS_RESOURCE = 'vnsfs'
+
+INDEX_FILENAME = 'index.json'
+
+CHUNK_SIZE = 255 * 1024
+
+
+class AttestationExport(object):
+    """
+    Exports the attestation files of many vNSFs at once, as a tarball streamed while it's built. Each vNSF attestation
+    file is stored as '<vnsf_id>/<filename>' and an index, the last member, holds the digests of every file exported.
+    The attestation files are fetched from GridFS ahead of being streamed, a few at a time.
+    """
+
+    def __init__(self, app, workers=4, logger=None):
+        """
+        :param app: the Eve application.
+        :param workers: the number of attestation files fetched at the same time.
+        """
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.app = app
+        self.workers = workers
+
+    def register(self):
+        """
+        Adds the export endpoint to the attestation resource, i.e. '/attestation/vnsfs/export'.
+        """
+
+        url = '{}/{}/export'.format(self.app.api_prefix, self.app.config['DOMAIN']['attestation']['url'])
+        self.app.add_url_rule(url, 'attestation|export', self.export, methods=['GET', 'POST'])
+
+    def export(self):
+        """
+        Streams the attestation files of the vNSFs requested. The vNSFs are selected through a list of 'vnsf_id's
+        and/or a 'where' filter (as for listing vNSFs), provided either as query parameters (a comma-separated list of
+        'vnsf_id's) or as a JSON body. All vNSFs are exported when neither is provided.
+
+        :return: the tarball of the attestation files.
+        """
+
+        vnsf_ids, where = self._selection()
+
+        query = {}
+        if where:
+            query = self.app.data._sanitize(self.app.data._mongotize(where, VNSFS_RESOURCE))
+        if vnsf_ids is not None:
+            query = {'$and': [query, {'vnsf_id': {'$in': vnsf_ids}}]} if query else {'vnsf_id': {'$in': vnsf_ids}}
+
+        source = self.app.config['DOMAIN'][VNSFS_RESOURCE]['datasource']['source']
+        vnsfs = list(self.app.data.driver.db[source].find(query, projection={'vnsf_id': 1, 'attestation_file': 1},
+                                                           sort=[('vnsf_id', 1)]))
+
+        missing = sorted(set(vnsf_ids or []) - set(vnsf['vnsf_id'] for vnsf in vnsfs))
+        missing.extend(vnsf['vnsf_id'] for vnsf in vnsfs if not vnsf.get('attestation_file'))
+
+        attestations = [(vnsf['vnsf_id'], vnsf['attestation_file']) for vnsf in vnsfs if vnsf.get('attestation_file')]
+
+        # GridFS is only reachable within the application context, which is over by the time the tarball is streamed.
+        fs = self.app.media.fs(VNSFS_RESOURCE)
+
+        response = Response(self._stream(fs, attestations, missing), mimetype='application/x-tar',
+                            direct_passthrough=True)
+        response.headers['Content-Disposition'] = 'attachment;filename=attestations.tar'
+
+        return response
+
+    @staticmethod
+    def _selection():
+        """
+        Provides the vNSFs selection requested.
+
+        :return: the 'vnsf_id's requested (None for any) and the 'where' filter (None for all).
+        """
+
+        if request.method == 'POST':
+            selection = request.get_json(silent=True)
+            if not isinstance(selection, dict):
+                abort(http_utils.HTTP_400_BAD_REQUEST, description='A JSON object is expected')
+            vnsf_ids = selection.get('vnsf_id')
+            where = selection.get('where')
+
+        else:
+            vnsf_ids = request.args.get('vnsf_id')
+            vnsf_ids = [vnsf_id.strip() for vnsf_id in vnsf_ids.split(',') if vnsf_id.strip()] \
+                if vnsf_ids is not None else None
+            try:
+                where = json.loads(request.args['where']) if 'where' in request.args else None
+            except ValueError:
+                abort(http_utils.HTTP_400_BAD_REQUEST, description="Unable to parse the 'where' clause")
+
+        if vnsf_ids is not None and (not isinstance(vnsf_ids, list) or
+                                     not all(isinstance(vnsf_id, str) for vnsf_id in vnsf_ids)):
+            abort(http_utils.HTTP_400_BAD_REQUEST, description="'vnsf_id' must be a list of vNSF identifiers")
+
+        if where is not None and not isinstance(where, dict):
+            abort(http_utils.HTTP_400_BAD_REQUEST, description="'where' must be a JSON object")
+
+        return vnsf_ids, where
+
+    def _stream(self, fs, attestations, missing):
+        """
+        Builds the tarball of the attestation files, one member at a time.
+
+        :param fs: the GridFS the attestation files are stored in.
+        :param attestations: the identifier of each vNSF and of its attestation file.
+        :param missing: the vNSFs requested with no attestation file to export.
+        """
+
+        index = {'attestations': [], 'missing': missing}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # Keep a few attestation files fetched ahead of the one being streamed.
+            pending = deque((vnsf_id, executor.submit(self._fetch, fs, file_id))
+                            for vnsf_id, file_id in attestations[:self.workers])
+            ahead = iter(attestations[self.workers:])
+
+            while pending:
+                vnsf_id, future = pending.popleft()
+                following = next(ahead, None)
+                if following is not None:
+                    pending.append((following[0], executor.submit(self._fetch, fs, following[1])))
+
+                attestation = future.result()
+                if attestation is None:
+                    self.logger.warning('Attestation file of vNSF %s not found', vnsf_id)
+                    index['missing'].append(vnsf_id)
+                    continue
+
+                filename, md5, chunks = attestation
+                name = '{}/{}'.format(vnsf_id, filename or vnsf_id)
+
+                sha256 = hashlib.sha256()
+                for chunk in chunks:
+                    sha256.update(chunk)
+
+                index['attestations'].append({'vnsf_id': vnsf_id,
+                                              'filename': name,
+                                              'size': sum(len(chunk) for chunk in chunks),
+                                              'md5': md5,
+                                              'sha256': sha256.hexdigest()})
+
+                yield from self._member(name, chunks)
+
+        yield from self._member(INDEX_FILENAME, [json.dumps(index, indent=2).encode('utf-8')])
+
+        # End-of-archive marker.
+        yield tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+
+    @staticmethod
+    def _fetch(fs, file_id):
+        """
+        Reads an attestation file out of GridFS.
+
+        :param fs: the GridFS the attestation file is stored in.
+        :param file_id: the attestation file identifier.
+        :return: the file name, MD5 digest and contents (as chunks) or None if it's not found.
+        """
+
+        media = fs.find_one({'_id': file_id})
+        if media is None:
+            return None
+
+        chunks = []
+        while True:
+            chunk = media.read(media.chunk_size or CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        return os.path.basename(media.filename or ''), media.md5, chunks
+
+    @staticmethod
+    def _member(name, chunks):
+        """
+        Provides a tarball member: its header, contents and padding to the block size.
+
+        :param name: the member name.
+        :param chunks: the member contents.
+        """
+
+        info = tarfile.TarInfo(name)
+        info.size = sum(len(chunk) for chunk in chunks)
+        info.mtime = time.time()
+        info.mode = 0o644
+
+        yield info.tobuf(tarfile.PAX_FORMAT)
+        yield from chunks
+
+        remainder = info.size % tarfile.BLOCKSIZE
+        if remainder:
+            yield tarfile.NUL * (tarfile.BLOCKSIZE - remainder)
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+
+from flask import Response, abort, make_response, request, stream_with_context
+from pymongo import CursorType, ReturnDocument
+from pymongo.errors import PyMongoError
+from storeutils import http_utils
+
+CHANGES_COLLECTION = 'changes'
+COUNTERS_COLLECTION = 'counters'
+
+# The resources whose changes are published, along with the field identifying their documents.
+FEED_RESOURCES = {'vnsfs': 'vnsf_id', 'nss': 'ns_id'}
+
+# Kinds of changes.
+INSERTED = 'inserted'
+DELETED = 'deleted'
+STATE = 'state'
+
+# The most changes provided at once.
+MAX_CHANGES = 100
+
+# The time (in seconds) a gap in the changes sequence is waited for to be filled. Changes are numbered before being
+# recorded, so concurrent publishers may record them out of sequence. A gap lasting longer is a change which failed to
+# be recorded.
+GAP_WAIT = 2
+GAP_POLL_INTERVAL = 0.1
+
+
+class ChangeFeed(object):
+    """
+    Publishes the changes to the catalogue (vNSFs and NSs inserted, deleted or changing state) so consumers can follow
+    it rather than polling it. Changes are numbered in sequence and kept, up to a size, in a capped collection, shared
+    by all the Store instances, so consumers resume from the last change they got (the resume token).
+
+    Changes are provided by long-polling, as JSON, or streamed as Server-Sent Events when the client accepts
+    'text/event-stream'. A single thread per Store instance tails the changes collection, waking up the consumers
+    waiting for changes.
+    """
+
+    def __init__(self, app, size=16 * 1024 ** 2, max_wait=25, keepalive=15, logger=None):
+        """
+        :param app: the Eve application.
+        :param size: the size (in bytes) of the changes kept for consumers to resume from.
+        :param max_wait: the longest time (in seconds) a long-poll waits for changes.
+        :param keepalive: the time (in seconds) between comments sent to keep an event stream open while there are no
+        changes.
+        """
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.app = app
+        self.size = size
+        self.max_wait = max_wait
+        self.keepalive = keepalive
+
+        self._changed = threading.Condition()
+        self._latest = 0
+        self._stop = threading.Event()
+        self._tailer = None
+
+    @property
+    def collection(self):
+        return self.app.data.driver.db[CHANGES_COLLECTION]
+
+    def register(self):
+        """
+        Publishes the changes written through Eve and adds the changes endpoint, i.e. '/changes'.
+        """
+
+        self.app.on_inserted += self.inserted
+        self.app.on_deleted_item += self.deleted
+        self.app.on_updated += self.updated
+        self.app.on_replaced += self.updated
+
+        self.app.add_url_rule('{}/{}'.format(self.app.api_prefix, CHANGES_COLLECTION), 'changes|feed',
+                              self.send_changes, methods=['GET'])
+
+    def start(self):
+        """
+        Sets up the changes collection, if needed, and starts tailing it.
+        """
+
+        if self._tailer is not None:
+            return
+
+        with self.app.app_context():
+            db = self.app.data.driver.db
+            if CHANGES_COLLECTION not in db.collection_names():
+                db.create_collection(CHANGES_COLLECTION, capped=True, size=self.size)
+                self.collection.create_index('seq', name='seq')
+
+            counter = db[COUNTERS_COLLECTION].find_one({'_id': CHANGES_COLLECTION})
+            self._latest = counter['seq'] if counter else 0
+
+            self._tailer = threading.Thread(target=self._tail, args=(self.collection,), name='changes-tailer',
+                                            daemon=True)
+            self._tailer.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._changed:
+            self._changed.notify_all()
+
+    def inserted(self, resource, documents):
+        for document in documents:
+            self.publish(resource, INSERTED, document)
+
+    def deleted(self, resource, document):
+        self.publish(resource, DELETED, document)
+
+    def updated(self, resource, updates, original):
+        if 'state' in updates and updates['state'] != original.get('state'):
+            self.publish(resource, STATE, dict(original, **updates))
+
+    def publish(self, resource, change, document):
+        """
+        Records a change to a document of the catalogue.
+
+        :param resource: the resource the document belongs to.
+        :param change: the kind of change.
+        :param document: the document (as it is after the change).
+        """
+
+        if resource not in FEED_RESOURCES:
+            return
+
+        try:
+            counter = self.app.data.driver.db[COUNTERS_COLLECTION].find_one_and_update(
+                {'_id': CHANGES_COLLECTION}, {'$inc': {'seq': 1}}, upsert=True, return_document=ReturnDocument.AFTER)
+
+            lookup_field = FEED_RESOURCES[resource]
+            self.collection.insert_one({'seq':        counter['seq'],
+                                        'resource':   resource,
+                                        'change':     change,
+                                        'document':   document.get('_id'),
+                                        lookup_field: document.get(lookup_field),
+                                        'state':      document.get('state'),
+                                        '_created':   datetime.utcnow().replace(microsecond=0)})
+
+        except PyMongoError:
+            # The change itself took place, only its consumers miss it.
+            self.logger.exception('Unable to publish the %s %s %s', resource, document.get('_id'), change)
+            return
+
+        self._notify(counter['seq'])
+
+    def send_changes(self):
+        """
+        Provides the changes following the resume token ('since' query parameter or, for event streams, the
+        'Last-Event-ID' header). With no resume token only the changes from now on are provided.
+
+        Long-polls wait for changes up to 'wait' seconds (at most the configured maximum), replying with the changes
+        and the token to resume from ('_meta.cursor'). Event streams go on until the client leaves.
+
+        :return: the changes. '410 Gone' when the changes following the resume token are no longer kept, in which case
+        the catalogue must be read again.
+        """
+
+        stream = request.accept_mimetypes.best == 'text/event-stream'
+
+        since = request.args.get('since', request.headers.get('Last-Event-ID') if stream else None)
+        try:
+            since = int(since) if since is not None else self._latest
+            wait = min(float(request.args.get('wait', self.max_wait)), self.max_wait)
+        except ValueError:
+            abort(http_utils.HTTP_400_BAD_REQUEST, description="'since' and 'wait' must be numbers")
+
+        collection = self.collection
+        self._check_kept(collection, since)
+
+        if stream:
+            response = Response(stream_with_context(self._stream(collection, since)), mimetype='text/event-stream')
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
+        changes = self._wait(collection, since, wait)
+        cursor = changes[-1]['seq'] if changes else since
+
+        response = make_response(json.dumps({'_items': changes, '_meta': {'cursor': cursor}},
+                                            cls=self.app.data.json_encoder_class), http_utils.HTTP_200_OK)
+        response.mimetype = 'application/json'
+        response.headers['Cache-Control'] = 'no-cache'
+
+        return response
+
+    def _stream(self, collection, since):
+        """
+        Streams the changes as Server-Sent Events, the change sequence number being the event ID.
+
+        :param collection: the changes collection.
+        :param since: the sequence number of the last change the client got.
+        """
+
+        yield 'retry: 5000\n\n'
+
+        while not self._stop.is_set():
+            changes = self._wait(collection, since, self.keepalive)
+            if not changes:
+                yield ': keepalive\n\n'
+                continue
+
+            for change in changes:
+                yield 'id: {}\nevent: {}\ndata: {}\n\n'.format(
+                    change['seq'], change['change'], json.dumps(change, cls=self.app.data.json_encoder_class))
+                since = change['seq']
+
+    def _wait(self, collection, since, timeout):
+        """
+        Waits for the changes following a given one.
+
+        :param collection: the changes collection.
+        :param since: the sequence number of the last change the client got.
+        :param timeout: the longest time (in seconds) to wait.
+        :return: the changes following, in sequence. Empty if there were none in time.
+        """
+
+        with self._changed:
+            self._changed.wait_for(lambda: self._latest > since or self._stop.is_set(), timeout)
+
+        # Only the changes in sequence are provided, lest a change recorded late is skipped by resuming past it.
+        deadline = time.monotonic() + GAP_WAIT
+        while True:
+            changes = list(collection.find({'seq': {'$gt': since}}, projection={'_id': False},
+                                           sort=[('seq', 1)], limit=MAX_CHANGES))
+
+            in_sequence = self._in_sequence(changes, since)
+            if in_sequence or not changes:
+                return in_sequence
+
+            if time.monotonic() >= deadline or self._stop.is_set():
+                self.logger.warning('Changes %d to %d are missing', since + 1, changes[0]['seq'] - 1)
+                return self._in_sequence(changes, changes[0]['seq'] - 1)
+
+            self._stop.wait(GAP_POLL_INTERVAL)
+
+    @staticmethod
+    def _in_sequence(changes, since):
+        """
+        :param changes: the changes following a given one, sorted.
+        :param since: the sequence number of the last change the client got.
+        :return: the changes leading the list which follow the given one with no gap.
+        """
+
+        for index, change in enumerate(changes):
+            if change['seq'] != since + index + 1:
+                return changes[:index]
+
+        return changes
+
+    @staticmethod
+    def _check_kept(collection, since):
+        """
+        Ensures the changes following the resume token are still kept, aborting with '410 Gone' otherwise.
+        """
+
+        oldest = collection.find_one(projection={'seq': True}, sort=[('$natural', 1)])
+        if oldest is not None and oldest['seq'] > since + 1:
+            abort(http_utils.HTTP_410_GONE,
+                  description='The changes since {} are no longer available. Read the catalogue again and resume from '
+                              'the latest change'.format(since))
+
+    def _notify(self, seq):
+        with self._changed:
+            if seq > self._latest:
+                self._latest = seq
+                self._changed.notify_all()
+
+    def _tail(self, collection):
+        """
+        Follows the changes published, by this or any other Store instance, waking up the consumers waiting for them.
+
+        :param collection: the changes collection.
+        """
+
+        while not self._stop.is_set():
+            try:
+                cursor = collection.find({'seq': {'$gt': self._latest}}, projection={'seq': True},
+                                         cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive and not self._stop.is_set():
+                    for change in cursor:
+                        self._notify(change['seq'])
+
+            except PyMongoError as e:
+                self.logger.warning('Unable to follow the changes: %s', e)
+
+            # Tailable cursors die when there's nothing to tail yet.
+            self._stop.wait(1)
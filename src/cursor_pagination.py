@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from flask import abort, g
+from storeutils import http_utils
+from werkzeug.datastructures import ImmutableMultiDict
+
+# The resources which can be paged through with a cursor.
+CURSOR_RESOURCES = ['vnsfs', 'nss', 'validation']
+
+# The keys documents can be ordered by, each backed by an index ending in '_id' so the ordering is total.
+CURSOR_KEYS = ['_id', '_updated']
+
+DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+def apply_cursor(resource, request, lookup=None):
+    """
+    Pages through the resource with a cursor rather than by skipping documents, so every page costs the same however
+    deep it is. Requested through the 'cursor' query parameter: the key to order the documents by ('_id' or
+    '_updated') for the first page and the continuation token provided along with each page ('_meta.cursor') for the
+    following ones. Documents are provided in ascending order, inserts (and updates, when ordering by '_updated') taking
+    place meanwhile showing up in the last pages.
+
+    :param resource: the resource requested.
+    :param request: the HTTP request data.
+    :param lookup: the lookup of the documents requested.
+    """
+
+    if resource not in CURSOR_RESOURCES or 'cursor' not in request.args or \
+            not (request.endpoint or '').endswith('|resource'):
+        return
+
+    if 'sort' in request.args or 'page' in request.args:
+        abort(http_utils.HTTP_400_BAD_REQUEST, description="'cursor' can not be combined with 'sort' nor 'page'")
+
+    cursor = request.args['cursor']
+    if cursor in CURSOR_KEYS:
+        key, position = cursor, None
+    else:
+        key, position = _decode(cursor)
+
+    if position is not None:
+        value, last_id = position
+        if key == '_id':
+            lookup['_id'] = {'$gt': last_id}
+        else:
+            lookup['$or'] = [{key: {'$gt': value}}, {key: value, '_id': {'$gt': last_id}}]
+
+    # The query as requested, for linking the next page.
+    g.cursor_query = [(name, value) for name, value in parse_qsl(request.query_string.decode('utf-8'))
+                      if name != 'cursor']
+    g.cursor_key = key
+
+    args = request.args.copy()
+    args['sort'] = key if key == '_id' else '{},_id'.format(key)
+    request.args = ImmutableMultiDict(args)
+
+
+def link_next_page(resource, response):
+    """
+    Provides the continuation token to the next page, replacing the page-based links, when paging through a cursor.
+
+    :param resource: the resource requested.
+    :param response: the response data, holding the page of documents.
+    """
+
+    key = g.get('cursor_key')
+    if key is None:
+        return
+
+    meta = response.get('_meta', {})
+    meta.pop('page', None)
+
+    items = response.get('_items', [])
+    last = items[-1] if items else None
+
+    cursor = None
+    if last is not None and len(items) >= meta.get('max_results', len(items)) and key in last:
+        cursor = _encode(key, last[key], last['_id'])
+
+    meta['cursor'] = cursor
+
+    links = response.get('_links')
+    if links is not None:
+        for link in ('prev', 'next', 'last'):
+            links.pop(link, None)
+
+        if cursor is not None:
+            href = links.get('self', {}).get('href', resource).split('?')[0]
+            links['next'] = {'title': 'next page',
+                             'href':  '{}?{}'.format(href, urlencode(g.cursor_query + [('cursor', cursor)]))}
+
+
+def _encode(key, value, last_id):
+    """
+    :return: the continuation token to the documents following the one with the key value and '_id' provided.
+    """
+
+    value = value.strftime(DATETIME_FORMAT) if isinstance(value, datetime) else str(value)
+    token = json.dumps([key, value, str(last_id)], separators=(',', ':'))
+
+    return base64.urlsafe_b64encode(token.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode(cursor):
+    """
+    :return: the key the documents are ordered by and the key value and '_id' of the last document provided.
+    """
+
+    try:
+        key, value, last_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8'))
+        if key not in CURSOR_KEYS:
+            raise ValueError(key)
+
+        last_id = ObjectId(last_id)
+        value = last_id if key == '_id' else datetime.strptime(value, DATETIME_FORMAT)
+
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError, InvalidId):
+        abort(http_utils.HTTP_400_BAD_REQUEST,
+              description="Invalid 'cursor'. Use one of {} or the cursor provided with the previous page".format(
+                      ', '.join(CURSOR_KEYS)))
+
+    return key, (value, last_id)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import json
+
+from flask import abort
+from storeutils import http_utils
+from werkzeug.datastructures import ImmutableMultiDict
+
+# The projection of each field set, by resource. The 'summary' leaves out the heavy fields (media, fetched from GridFS
+# and base64-encoded, and descriptors) while 'full' provides the whole document.
+FIELD_SETS = {
+    'vnsfs': {
+        'summary': {'descriptor': 0, 'descriptor_json': 0, 'manifest_file': 0, 'attestation_file': 0},
+        'full':    None,
+        },
+    'nss':   {
+        'summary': {'descriptor': 0, 'descriptor_json': 0, 'manifest_file': 0},
+        'full':    None,
+        },
+    }
+
+DEFAULT_FIELD_SET = 'summary'
+
+
+def apply_field_set(resource, request, lookup=None):
+    """
+    Sets the projection for reading the resource as per the field set requested through the 'fields' query
+    parameter, e.g. '?fields=full'. The 'summary' field set is used by default, for both lists and items. An explicit
+    'projection' query parameter takes precedence.
+
+    NOTE: the default isn't set as the datasource projection as Eve only lets clients narrow an exclusion datasource
+    projection, so there would be no way to request the 'full' field set.
+
+    :param resource: the resource requested.
+    :param request: the HTTP request data.
+    :param lookup: the item lookup, if any.
+    """
+
+    if resource not in FIELD_SETS or 'projection' in request.args:
+        return
+
+    field_set = request.args.get('fields', DEFAULT_FIELD_SET)
+    if field_set not in FIELD_SETS[resource]:
+        abort(http_utils.HTTP_400_BAD_REQUEST,
+              description="Unknown field set '{}'. Use one of: {}".format(field_set,
+                                                                          ', '.join(sorted(FIELD_SETS[resource]))))
+
+    projection = FIELD_SETS[resource][field_set]
+    if projection:
+        args = request.args.copy()
+        args['projection'] = json.dumps(projection)
+        request.args = ImmutableMultiDict(args)
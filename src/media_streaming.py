@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import logging
+import os
+
+from flask import Response, abort, request
+from storeutils import http_utils
+
+# The media fields served raw, by resource, along with the field each document is looked up by.
+MEDIA_FIELDS = {
+    'vnsfs': ('vnsf_id', ['attestation_file', 'manifest_file']),
+    'nss':   ('ns_id', ['manifest_file']),
+    }
+
+DEFAULT_CHUNK_SIZE = 255 * 1024
+
+
+class MediaStreaming(object):
+    """
+    Serves the media files (e.g. the vNSF attestation) as they're stored in GridFS, chunk by chunk, rather than
+    base64-encoded within the document. Partial downloads (HTTP Range) and conditional requests are supported through
+    a strong ETag taken from the file digest.
+    """
+
+    def __init__(self, app, media_fields=None, logger=None):
+        """
+        :param app: the Eve application.
+        :param media_fields: the lookup field and media fields to serve for each resource. Defaults to MEDIA_FIELDS.
+        """
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.app = app
+        self.media_fields = media_fields or MEDIA_FIELDS
+
+    def register(self):
+        """
+        Adds the endpoint of each media field, e.g. '/vnsfs/<vnsf_id>/attestation_file'.
+        """
+
+        for resource, (lookup_field, fields) in self.media_fields.items():
+            for field in fields:
+                url = '{}/{}/<document_id>/{}'.format(self.app.api_prefix, self.app.config['DOMAIN'][resource]['url'],
+                                                      field)
+                self.app.add_url_rule(url, '{}|{}'.format(resource, field), self.send_media, methods=['GET'],
+                                      defaults={'resource': resource, 'field': field})
+
+    def send_media(self, resource, field, document_id):
+        """
+        Streams a media file, in whole or the range requested.
+
+        :param resource: the resource the document belongs to.
+        :param field: the media field to serve.
+        :param document_id: the document identifier, as per the resource lookup field.
+        :return: the file contents.
+        """
+
+        media = self._media(resource, field, document_id)
+        length = media.length
+        etag = media.md5 or str(media._id)
+
+        response = Response(mimetype=media.content_type or 'application/octet-stream')
+        response.set_etag(etag)
+        response.last_modified = media.upload_date
+        response.headers['Accept-Ranges'] = 'bytes'
+        response.headers['Content-Disposition'] = 'attachment;filename={}'.format(
+            os.path.basename(media.filename or '') or document_id)
+
+        if request.if_none_match.contains(etag):
+            response.status_code = http_utils.HTTP_304_NOT_MODIFIED
+            return response
+
+        start, stop = 0, length
+        byte_range = self._requested_range(etag)
+        if byte_range is not None:
+            content_range = byte_range.make_content_range(length)
+            if content_range is None:
+                response.status_code = http_utils.HTTP_416_RANGE_NOT_SATISFIABLE
+                response.headers['Content-Range'] = 'bytes */{}'.format(length)
+                return response
+
+            start, stop = content_range.start, content_range.stop
+            response.status_code = http_utils.HTTP_206_PARTIAL_CONTENT
+            response.headers['Content-Range'] = content_range.to_header()
+
+        response.response = self._stream(media, start, stop)
+        response.direct_passthrough = True
+        response.headers['Content-Length'] = stop - start
+
+        return response
+
+    def _media(self, resource, field, document_id):
+        """
+        Fetches the media file of a document.
+
+        :param resource: the resource the document belongs to.
+        :param field: the media field to fetch.
+        :param document_id: the document identifier, as per the resource lookup field.
+        :return: the media file (as a GridOut).
+        """
+
+        lookup_field, _ = self.media_fields[resource]
+        source = self.app.config['DOMAIN'][resource]['datasource']['source']
+
+        document = self.app.data.driver.db[source].find_one({lookup_field: document_id}, projection={field: 1})
+        media = self.app.media.get(document[field], resource) if document and document.get(field) else None
+        if media is None:
+            abort(http_utils.HTTP_404_NOT_FOUND)
+
+        return media
+
+    @staticmethod
+    def _requested_range(etag):
+        """
+        Provides the range requested, if any, and only as long as it's meant for the file as it is now (If-Range).
+        Requests for many ranges, or in units other than bytes, are served the whole file.
+
+        :param etag: the file entity tag.
+        :return: the byte range requested or None for the whole file.
+        """
+
+        byte_range = request.range
+        if byte_range is None or byte_range.units != 'bytes' or len(byte_range.ranges) != 1:
+            return None
+
+        if_range = request.if_range
+        if (if_range.etag or if_range.date) and if_range.etag != etag:
+            return None
+
+        return byte_range
+
+    @staticmethod
+    def _stream(media, start, stop):
+        """
+        Reads a range of the media file, one chunk at a time.
+
+        :param media: the media file (as a GridOut).
+        :param start: the first byte to read.
+        :param stop: the byte to stop reading at (exclusive).
+        """
+
+        chunk_size = media.chunk_size or DEFAULT_CHUNK_SIZE
+
+        media.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            data = media.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+"""
+Converts the descriptors of the stored vNSFs and Network Services into structured sub-documents.
+
+Descriptors used to be stored as the string representation of the parsed YAML. This tool converts all such
+descriptors in bulk, optionally adding the canonical JSON string as well. Documents already converted are left
+untouched so it's safe to run it more than once.
+
+Usage: python migrate_descriptors.py [--canonical-json] [--batch-size N] [--dry-run]
+"""
+
+import argparse
+import logging
+
+import settings as cfg
+from pymongo import MongoClient, UpdateOne
+from storeutils import descriptors, log
+
+# Collections holding descriptors.
+COLLECTIONS = ['vnsfs', 'nss']
+
+
+def migrate(db, collection, canonical_json=False, batch_size=500, dry_run=False, logger=None):
+    """
+    Converts the string descriptors of a collection.
+
+    :param db: the database.
+    :param collection: the collection name.
+    :param canonical_json: whether to store the descriptors canonical JSON string as well.
+    :param batch_size: the number of documents updated per database round trip.
+    :param dry_run: whether to only report what would be converted.
+    :return: the number of documents converted and the identifiers of the ones which could not be converted.
+    """
+
+    logger = logger or logging.getLogger(__name__)
+
+    converted = 0
+    failed = list()
+    operations = list()
+
+    for doc in db[collection].find({'descriptor': {'$type': 'string'}}, {'descriptor': 1}):
+        try:
+            descriptor = descriptors.parse(doc['descriptor'])
+        except Exception as e:
+            logger.error("%s '%s': can not parse the descriptor. %s", collection, doc['_id'], e)
+            failed.append(doc['_id'])
+            continue
+
+        if not isinstance(descriptor, dict):
+            logger.error("%s '%s': the descriptor is not a dictionary", collection, doc['_id'])
+            failed.append(doc['_id'])
+            continue
+
+        changes = {'descriptor': descriptor}
+        if canonical_json:
+            changes['descriptor_json'] = descriptors.canonical_json(descriptor)
+
+        # The ETag no longer matches the document contents. Eve computes it again when the document is requested.
+        operations.append(UpdateOne({'_id': doc['_id'], 'descriptor': doc['descriptor']},
+                                    {'$set': changes, '$unset': {'_etag': ''}}))
+
+        if len(operations) >= batch_size:
+            converted += _apply(db, collection, operations, dry_run)
+            operations = list()
+
+    if operations:
+        converted += _apply(db, collection, operations, dry_run)
+
+    return converted, failed
+
+
+def _apply(db, collection, operations, dry_run):
+    if dry_run:
+        return len(operations)
+
+    return db[collection].bulk_write(operations, ordered=False).modified_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Converts the stored descriptors into structured sub-documents.')
+    parser.add_argument('--canonical-json', action='store_true', default=cfg.DESCRIPTOR_CANONICAL_JSON,
+                        help='store the descriptors canonical JSON string as well')
+    parser.add_argument('--batch-size', type=int, default=500, help='documents updated per database round trip')
+    parser.add_argument('--dry-run', action='store_true', help='only report what would be converted')
+    args = parser.parse_args()
+
+    log.setup_logging(config_file='src/logging.yaml')
+    logger = logging.getLogger(__name__)
+
+    client = MongoClient('mongodb://{}:{}@{}:{}/{}'.format(cfg.MONGO_USERNAME, cfg.MONGO_PASSWORD, cfg.MONGO_HOST,
+                                                           cfg.MONGO_PORT, cfg.MONGO_DBNAME))
+    db = client[cfg.MONGO_DBNAME]
+
+    for collection in COLLECTIONS:
+        converted, failed = migrate(db, collection, args.canonical_json, args.batch_size, args.dry_run, logger)
+        logger.info('%s: %d descriptors converted%s, %d failed', collection, converted,
+                    ' (dry run)' if args.dry_run else '', len(failed))
+
+
+if __name__ == '__main__':
+    main()
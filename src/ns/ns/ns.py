@@ -28,9 +28,8 @@
 import logging
 
 import os
-import yaml
 from shutil import rmtree
-from storeutils import tar_package
+from storeutils import integrity, package_spool, tar_package, yaml_utils
 from storeutils.error_utils import ExceptionMessage, IssueHandling, IssueElement
 from tempfile import gettempdir, mkdtemp
 from werkzeug.datastructures import FileStorage
@@ -53,34 +52,69 @@ class NsWrongManifestFormat(ExceptionMessage):
     """vNSF manifest doesn't follow the schema."""
 
 
+class NsTamperedPackage(ExceptionMessage):
+    """Network Service package has been tampered with and is not safe to use."""
+
+
+# The SHIELD manifest location within the package.
+MANIFEST_FILENAME = 'manifest.yaml'
+
+
 class NsHelper(object):
     errors = {
         'ONBOARD_NS': {
-            'MISSING_PACKAGE': {
+            'MISSING_PACKAGE':            {
                 IssueElement.ERROR.name:     ['No package file provided in POST'],
                 IssueElement.EXCEPTION.name: NsMissingPackage('No package provided')
                 },
-            'PKG_NOT_TARGZ':   {
+            'PKG_NOT_TARGZ':              {
                 IssueElement.ERROR.name:     ['Package is not a valid .tar.gz file'],
                 IssueElement.EXCEPTION.name: NsWrongPackageFormat('Package is not a valid .tar.gz file')
                 },
-            'PKG_NOT_SHIELD':  {
+            'PKG_NOT_SHIELD':             {
                 IssueElement.ERROR.name:     ["Missing 'manifest.yaml' from {}", 'Package contents: {}'],
                 IssueElement.EXCEPTION.name: NsPackageCompliance('Package does not comply with the SHIELD format')
                 },
-            'MANIFEST_NOT_NS': {
+            'PKG_MEMBER_REJECTED':        {
+                IssueElement.ERROR.name:     ['{}'],
+                IssueElement.EXCEPTION.name: NsPackageCompliance('Package does not comply with the SHIELD format')
+                },
+            'PKG_TAMPERED_NAME_MISMATCH': {
+                IssueElement.ERROR.name:     [
+                    "Package file name ({}) doesn't match the one defined in the manifest ({})."],
+                IssueElement.EXCEPTION.name: NsTamperedPackage('Package file name mismatch')
+                },
+            'PKG_TAMPERED_HASH_MISMATCH': {
+                IssueElement.ERROR.name:     ["Digest of '{}' doesn't match the one defined in the manifest."],
+                IssueElement.EXCEPTION.name: NsTamperedPackage('Package digest mismatch')
+                },
+            'PKG_HASH_UNSUPPORTED':       {
+                IssueElement.ERROR.name:     ['{}'],
+                IssueElement.EXCEPTION.name: NsPackageCompliance('Hashing algorithm not supported')
+                },
+            'MANIFEST_INCOMPLETE':        {
+                IssueElement.ERROR.name:     ['Manifest is missing {}'],
+                IssueElement.EXCEPTION.name: NsPackageCompliance('Package does not comply with the SHIELD format')
+                },
+            'MANIFEST_NOT_NS':            {
                 IssueElement.ERROR.name:     ['Manifest is not for a Network Service'],
                 IssueElement.EXCEPTION.name: NsWrongManifestFormat('Manifest is not for a Network Service')
                 },
             }
         }
 
-    def __init__(self, vnsfo, logger=None):
+    def __init__(self, vnsfo, logger=None, max_member_size=None, integrity_policy='enforce'):
         self.logger = logger or logging.getLogger(__name__)
         self.issue = IssueHandling(self.logger)
 
         self.vnsfo = vnsfo
 
+        # Largest file (in bytes) allowed to be extracted from a package.
+        self.max_member_size = max_member_size
+
+        # How to handle package digests not matching the manifest: 'enforce', 'warn' or 'off'.
+        self.integrity_policy = integrity_policy
+
     def onboard_ns(self, tenant_id, ns_package, validation_data):
         """
         Registers a Network Service into the Store and onboards it with the Orchestrator.
@@ -103,50 +137,56 @@ class NsHelper(object):
         # Ensure it's a SHIELD Network Service package.
         extracted_package_path, manifest_path = self._extract_package(ns_package)
 
-        # Get the SHIELD manifest data.
-        with open(manifest_path, 'r') as stream:
-            manifest = dict(yaml.safe_load(stream))
-            self.logger.debug('SHIELD manifest\n%s', manifest)
-
-        # Ensure it's a NS package.
-        if not 'manifest:ns' in manifest:
-            self.issue.raise_ex(IssueElement.ERROR,
-                                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['MANIFEST_NOT_NS']))
-
-        self.logger.debug('shield package: %s', os.listdir(extracted_package_path))
-        self.logger.debug('osm package: %s | path: %s', manifest['manifest:ns']['package'],
-                          os.path.join(extracted_package_path, manifest['manifest:ns'][
-                              'package']))
-
-        # Gather the information data format
-        data_format = manifest['manifest:ns']['type']
-
-        # Onboard the Network Service into the actual Orchestrator.
-        # NOTE: any exception raised by the vNSFO must be handled by the caller, hence no try/catch here.
-        onboarded_package = self.vnsfo.onboard_ns(tenant_id,
-                                                  os.path.join(extracted_package_path,
-                                                               manifest['manifest:ns']['package']),
-                                                  manifest['manifest:ns']['descriptor'],
-                                                  data_format,
-                                                  validation_data)
-
-        # Provide the manifest as a file stream.
-        stream = open(manifest_path, 'rb')
-        manifest_fs = FileStorage(stream)
-
-        # Build the Network Service package metadata.
-        package_data = dict()
-        package_data['state'] = 'sandboxed'
-        package_data['manifest'] = manifest
-        package_data['descriptor'] = onboarded_package['descriptor']
-        package_data['ns_id'] = onboarded_package['ns_id']
-        package_data['ns_name'] = onboarded_package['ns_name']
-        package_data['constituent_vnsfs'] = onboarded_package['constituent_vnsfs']
-
-        if os.path.isdir(extracted_package_path):
-            rmtree(extracted_package_path)
-
-        return manifest_fs, package_data
+        # The extracted package is removed whatever the outcome, e.g. when the package is rejected.
+        try:
+            # Get the SHIELD manifest data.
+            with open(manifest_path, 'r') as stream:
+                manifest = dict(yaml_utils.load(stream))
+                self.logger.debug('SHIELD manifest\n%s', manifest)
+
+            # Ensure it's a NS package.
+            if not 'manifest:ns' in manifest:
+                self.issue.raise_ex(IssueElement.ERROR,
+                                    self.issue.raise_ex(IssueElement.ERROR,
+                                                        self.errors['ONBOARD_NS']['MANIFEST_NOT_NS']))
+
+            # Ensure the package contents are the ones the manifest vouches for.
+            self._integrity_check(manifest, extracted_package_path)
+
+            self.logger.debug('shield package: %s', os.listdir(extracted_package_path))
+            self.logger.debug('osm package: %s | path: %s', manifest['manifest:ns']['package'],
+                              os.path.join(extracted_package_path, manifest['manifest:ns'][
+                                  'package']))
+
+            # Gather the information data format
+            data_format = manifest['manifest:ns']['type']
+
+            # Onboard the Network Service into the actual Orchestrator.
+            # NOTE: any exception raised by the vNSFO must be handled by the caller, hence no try/catch here.
+            onboarded_package = self.vnsfo.onboard_ns(tenant_id,
+                                                      os.path.join(extracted_package_path,
+                                                                   manifest['manifest:ns']['package']),
+                                                      manifest['manifest:ns']['descriptor'],
+                                                      data_format,
+                                                      validation_data)
+
+            # Provide the manifest as a file stream.
+            stream = open(manifest_path, 'rb')
+            manifest_fs = FileStorage(stream)
+
+            # Build the Network Service package metadata.
+            package_data = dict()
+            package_data['state'] = 'sandboxed'
+            package_data['manifest'] = manifest
+            package_data['descriptor'] = onboarded_package['descriptor']
+            package_data['ns_id'] = onboarded_package['ns_id']
+            package_data['ns_name'] = onboarded_package['ns_name']
+            package_data['constituent_vnsfs'] = onboarded_package['constituent_vnsfs']
+
+            return manifest_fs, package_data
+
+        finally:
+            rmtree(extracted_package_path, ignore_errors=True)
 
     def delete_ns(self, tenant_id, ns_id, data_format):
         """
@@ -177,28 +217,129 @@ class NsHelper(object):
         if package_file and package_file.filename == '':
             self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['MISSING_PACKAGE'])
 
-        filename = secure_filename(package_file.filename)
-        package_absolute_path = os.path.join(gettempdir(), filename)
-
-        try:
+        spool = package_file.stream
+        if isinstance(spool, package_spool.PackageSpool):
+            # The package was already spooled (and checked) while the request body arrived.
+            package_absolute_path = spool.name
+            is_tar_gz = spool.is_tar_gz()
+            self.logger.debug("Package digest (%s bytes): %s", spool.size, spool.hexdigest())
+
+        else:
+            spool = None
+            filename = secure_filename(package_file.filename)
+            package_absolute_path = os.path.join(gettempdir(), filename)
             package_file.save(package_absolute_path)
+            is_tar_gz = tar_package.is_tar_gz_file(package_absolute_path)
 
-            if not tar_package.is_tar_gz_file(package_absolute_path):
+        try:
+            if not is_tar_gz:
                 self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['PKG_NOT_TARGZ'])
 
             self.logger.debug("Package stored at '%s'", package_absolute_path)
 
+            # Get the SHIELD manifest data first so only the files it references are extracted.
+            manifest_data = tar_package.read_member(package_absolute_path, MANIFEST_FILENAME)
+            if manifest_data is None:
+                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['PKG_NOT_SHIELD'],
+                                    [[package_file.filename], [tar_package.list_members(package_absolute_path)]])
+
+            members = self._manifest_members(yaml_utils.load(manifest_data))
+
             extracted_package_path = mkdtemp()
 
-            tar_package.extract_package(package_absolute_path, extracted_package_path)
+            try:
+                tar_package.extract_package(package_absolute_path, extracted_package_path, members,
+                                            self.max_member_size)
 
-            # Get the SHIELD manifest data.
-            manifest_path = os.path.join(extracted_package_path, 'manifest.yaml')
-            if not os.path.isfile(manifest_path):
-                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['PKG_NOT_SHIELD'],
-                                    [[extracted_package_path], [os.listdir(extracted_package_path)]])
+            except tar_package.PackageUnsafeMember as e:
+                rmtree(extracted_package_path)
+                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['PKG_MEMBER_REJECTED'],
+                                    [[e.message]])
+
+            manifest_path = os.path.join(extracted_package_path, MANIFEST_FILENAME)
 
         finally:
-            os.remove(package_absolute_path)
+            if spool is not None:
+                spool.close()
+            elif os.path.isfile(package_absolute_path):
+                os.remove(package_absolute_path)
 
         return extracted_package_path, manifest_path
+
+    @staticmethod
+    def _manifest_members(manifest):
+        """
+        Provides the files the SHIELD manifest references, i.e. the ones required for onboarding the Network
+        Service package.
+
+        :param manifest: The SHIELD manifest data.
+
+        :return: the paths of the files within the package, including the manifest itself.
+        """
+
+        members = [MANIFEST_FILENAME]
+
+        ns = manifest.get('manifest:ns') if isinstance(manifest, dict) else None
+        if not isinstance(ns, dict):
+            return members
+
+        members.append(ns.get('package'))
+
+        return [member for member in members if isinstance(member, str)]
+
+    def _integrity_check(self, manifest, extracted_package_path):
+        """
+        Checks the Network Service package for tampering issues. The package is hashed with the algorithm the manifest
+        defines and its digest compared against the one in the manifest. Depending on the integrity policy a mismatch,
+        or a manifest lacking the digest, either fails the onboarding ('enforce') or is just logged ('warn'). No checks
+        take place when the policy is 'off'.
+
+        :param manifest: The Network Service manifest.
+        :param extracted_package_path: The path to where the Network Service package was extracted to.
+        :raise:  NsTamperedPackage: When the Network Service package has been tampered with and is not safe to use.
+        :raise:  NsPackageCompliance: When the manifest lacks the package or its digest.
+        """
+
+        if self.integrity_policy == 'off':
+            return
+
+        ns_manifest = manifest['manifest:ns']
+
+        # The manifest must define the package to check and its digest.
+        missing = [field for field in ('package', 'hash', 'hashing_algorithm') if not ns_manifest.get(field)]
+        if missing:
+            missing = ', '.join("'{}'".format(field) for field in missing)
+            if self.integrity_policy == 'enforce':
+                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['MANIFEST_INCOMPLETE'], [[missing]])
+
+            # Nothing to check the package against.
+            self.logger.warning('Manifest is missing %s, the package integrity is not checked', missing)
+            return
+
+        extracted_package_path = os.path.realpath(extracted_package_path)
+        ns_package_path = os.path.realpath(os.path.join(extracted_package_path, ns_manifest['package']))
+
+        # The package hashed must be the one the manifest names, within the SHIELD package.
+        if os.path.basename(ns_package_path) != os.path.basename(os.path.normpath(ns_manifest['package'])) or \
+                os.path.commonpath([extracted_package_path, ns_package_path]) != extracted_package_path:
+            self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['PKG_TAMPERED_NAME_MISMATCH'],
+                                [[os.path.relpath(ns_package_path, extracted_package_path), ns_manifest['package']]])
+
+        # Package hash must match the manifest. A missing package is reported further on.
+        expected_digests = dict()
+        if os.path.isfile(ns_package_path):
+            expected_digests[ns_package_path] = ns_manifest['hash']
+
+        try:
+            mismatches = integrity.verify_files(expected_digests, ns_manifest['hashing_algorithm'])
+
+        except integrity.HashAlgorithmNotSupported as e:
+            self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['PKG_HASH_UNSUPPORTED'], [[e.message]])
+
+        for path, (expected, computed) in mismatches.items():
+            self.logger.warning("'%s' digest doesn't match the manifest (expected: %s | computed: %s)",
+                                os.path.relpath(path, extracted_package_path), expected, computed)
+
+        if mismatches and self.integrity_policy == 'enforce':
+            self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['PKG_TAMPERED_HASH_MISMATCH'],
+                                [[', '.join(os.path.relpath(path, extracted_package_path) for path in mismatches)]])
@@ -27,12 +27,13 @@
 
 import logging
 
-import flask
 import settings as cfg
+import validation_records
 from eve.methods.post import post_internal
 from flask import abort, make_response, jsonify
-from ns.ns import NsHelper, NsMissingPackage, NsWrongPackageFormat, NsPackageCompliance, NsWrongManifestFormat
-from storeutils import http_utils
+from ns.ns import NsHelper, NsMissingPackage, NsWrongPackageFormat, NsPackageCompliance, NsWrongManifestFormat, \
+    NsTamperedPackage
+from storeutils import descriptors
 from storeutils.error_utils import IssueHandling, IssueElement
 from vnsfo.vnsfo import VnsfoFactory
 from vnsfo.vnsfo_adapter import VnsfoMissingNsDescriptor, VnsfOrchestratorOnboardingIssue, \
@@ -98,15 +99,60 @@ class NsHooks:
         file is provided it gets ignored.
         """
 
+        form_data = request.form.copy()
+        files = request.files.copy()
+
+        NsHooks.build_ns(form_data, files)
+
+        request.files = ImmutableMultiDict(files)
+
+        # Modify the request form to persist
+        request.form = ImmutableMultiDict(form_data)
+
+    @staticmethod
+    def onboard_ns_job(package_file):
+        """
+        Registers a Network Service into the Store and onboards it with the Orchestrator outside of the HTTP request
+        which submitted it, i.e. as a background onboarding job.
+
+        :param package_file: the Network Service package (as a FileStorage).
+        :return: the response data (including the validation reference) and HTTP status code for the Network Service
+        stored.
+        :raise: HTTPException: When the onboarding fails, holding the error response.
+        """
+
+        form_data = dict()
+        files = {'package': package_file}
+
+        NsHooks.build_ns(form_data, files)
+
+        form_data.update(files)
+        r, _, _, status, _ = post_internal('nss', form_data)
+
+        if 'validation' in form_data:
+            r['validation'] = str(form_data['validation'])
+
+        return r, status
+
+    @staticmethod
+    def build_ns(form_data, files):
+        """
+        Onboards the Network Service package with the Orchestrator and converts it into the document data to store.
+
+        :param form_data: the document data. It gets updated with the Network Service details.
+        :param files: the document files, holding the Network Service package. It gets updated with the files to
+        store.
+        :raise: HTTPException: When the onboarding fails, holding the error response.
+        """
+
         # Store validation data about the vnsf
         validation_data = dict()
 
         ex_response = None
-        form_data = request.form.copy()
 
         try:
             # It's assumed that only one NS package file is received.
-            if 'package' not in request.files:
+            if 'package' not in files:
                 ex_response = NsHooks.issue.build_ex(
                         IssueElement.ERROR,
                         NsHooks.errors['ONBOARD_NS']['PACKAGE_MISSING'],
@@ -117,17 +163,16 @@ class NsHooks:
             vnsfo = VnsfoFactory.get_orchestrator('OSM', cfg.VNSFO_PROTOCOL, cfg.VNSFO_HOST, cfg.VNSFO_PORT,
                                                   cfg.VNSFO_API)
 
-            ns = NsHelper(vnsfo)
-            manifest_fs, package_data = ns.onboard_ns(cfg.VNSFO_TENANT_ID, request.files['package'], validation_data)
+            ns = NsHelper(vnsfo, max_member_size=cfg.PACKAGE_MEMBER_MAX_SIZE,
+                          integrity_policy=cfg.PACKAGE_INTEGRITY_POLICY)
+            manifest_fs, package_data = ns.onboard_ns(cfg.VNSFO_TENANT_ID, files['package'], validation_data)
 
             # Ensure the SHIELD manifest is stored as a binary file.
             # NOTE: the file is closed by Eve once stored.
-            files = request.files.copy()
             files['manifest_file'] = manifest_fs
             # The package field is only required for onboarding schema validation but shouldn't be stored as document
             # data.
             files.pop('package')
-            request.files = ImmutableMultiDict(files)
 
             # Convert the Network Service package into the document data.
             # NOTE: there's no need to deep copy as the data won't be modified until it gets stored in the database.
@@ -135,6 +180,8 @@ class NsHooks:
             form_data['state'] = 'sandboxed'
             form_data['manifest'] = package_data['manifest']
             form_data['descriptor'] = package_data['descriptor']
+            if cfg.DESCRIPTOR_CANONICAL_JSON:
+                form_data['descriptor_json'] = descriptors.canonical_json(package_data['descriptor'])
             form_data['ns_id'] = package_data['ns_id']
             form_data['ns_name'] = package_data['ns_name']
             form_data['constituent_vnsfs'] = package_data['constituent_vnsfs']
@@ -144,7 +191,7 @@ class NsHooks:
                     IssueElement.ERROR, NsHooks.errors['ONBOARD_NS']['PACKAGE_ISSUE'], [[e.message]], e.message
                     )
 
-        except (NsPackageCompliance, VnsfoMissingNsDescriptor, NsWrongManifestFormat) as e:
+        except (NsPackageCompliance, VnsfoMissingNsDescriptor, NsWrongManifestFormat, NsTamperedPackage) as e:
             ex_response = NsHooks.issue.build_ex(
                     IssueElement.ERROR, NsHooks.errors['ONBOARD_NS']['PACKAGE_COMPLIANCE'], [[e.message]], e.message
                     )
@@ -160,14 +207,12 @@ class NsHooks:
                     )
 
         finally:
-            # Always persist the validation data, if existent
-            validation_ref = None
-            if validation_data:
-                app = flask.current_app
-                with app.test_request_context():
-                    r, _, _, status, _ = post_internal('validation', validation_data)
-                assert status == http_utils.HTTP_201_CREATED
-                validation_ref = r['_id']
+            # Always persist the validation data, if existent. The outcome of a former validation of the same
+            # descriptors is referred to as is.
+            validation_ref = validation_data.get('_id')
+            if validation_data and validation_ref is None:
+                # Failing to store it doesn't replace the onboarding outcome, there's just no validation to refer to.
+                validation_ref = validation_records.insert(validation_data)
 
             # Check if exceptions were raised during the onboard process
             if ex_response:
@@ -181,8 +226,6 @@ class NsHooks:
             # Onboard succeeded. Include the validation reference in the request form
             if validation_ref:
                 form_data['validation'] = validation_ref
-            # Modify the request form to persist
-            request.form = ImmutableMultiDict(form_data)
 
     @staticmethod
     def delete_ns(item):
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import json
+import logging
+import os
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import make_response, request
+from onboarding_jobs import onboard
+from storeutils import http_utils, package_spool, tar_package, yaml_utils
+from werkzeug.datastructures import FileStorage
+
+MANIFEST_FILENAME = 'manifest.yaml'
+
+# The resource each kind of SHIELD manifest is onboarded to. The order is the onboarding order as Network Services
+# depend on the vNSFs they're made of.
+MANIFEST_RESOURCES = [('manifest:vnsf', 'vnsfs'), ('manifest:ns', 'nss')]
+
+# The resources each batch endpoint onboards packages to. Network Service batches take vNSFs too so a Network Service
+# can be onboarded along with the vNSFs it's made of.
+BATCH_RESOURCES = {'vnsfs': ['vnsfs'], 'nss': ['vnsfs', 'nss']}
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class OnboardingBatch(object):
+    """
+    Onboards many packages in a single request. Packages are provided as many 'package' parts and/or as 'bundle'
+    parts, each a tarball of SHIELD packages. The packages are onboarded concurrently, all the vNSFs before the Network
+    Services, so a Network Service can rely on the vNSFs of the same batch.
+
+    vNSF batches only take vNSF packages whereas Network Service batches take both vNSF and Network Service packages.
+    """
+
+    def __init__(self, app, handlers, workers=4, max_member_size=None, spool_folder=None, orchestrator_health=None,
+                 logger=None):
+        """
+        :param app: the Eve application.
+        :param handlers: the onboarding function to use for each resource. Each function takes the package file and
+        returns the response data and HTTP status code for the document stored.
+        :param workers: the number of packages onboarded at the same time.
+        :param max_member_size: the largest package (in bytes) allowed in a bundle.
+        :param spool_folder: where to spool the packages to while they're onboarded.
+        :param orchestrator_health: the Orchestrator availability tracker, if batches are to be refused while the
+        Orchestrator is down.
+        """
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.app = app
+        self.handlers = handlers
+        self.workers = workers
+        self.max_member_size = max_member_size
+        self.spool_folder = spool_folder
+        self.orchestrator_health = orchestrator_health
+
+    def register(self):
+        """
+        Adds the batch endpoint to each resource with an onboarding handler, e.g. '/vnsfs/batch'.
+        """
+
+        for resource in self.handlers:
+            url = '{}/{}/batch'.format(self.app.api_prefix, self.app.config['DOMAIN'][resource]['url'])
+            self.app.add_url_rule(url, '{}|batch'.format(resource), self.onboard_batch, methods=['POST'],
+                                  defaults={'resource': resource})
+
+    def onboard_batch(self, resource):
+        """
+        Onboards all the packages in the request.
+
+        :param resource: the resource the batch is submitted to.
+        :return: the onboarding outcome for each package, in the order the packages were provided.
+        """
+
+        # Batch endpoints aren't Eve's so its pre-request hooks don't apply. Fail fast before any package is read.
+        if self.orchestrator_health is not None:
+            self.orchestrator_health.fail_fast(resource, request)
+
+        # Each entry holds either a package or the reason why it's not acceptable.
+        entries = []
+        try:
+            entries.extend((self._spooled(package_file), None) for package_file in request.files.getlist('package'))
+            for bundle in request.files.getlist('bundle'):
+                entries.extend(self._unbundle(bundle))
+
+            items = [item for _, item in entries]
+
+            # Sort the packages out by the resource to onboard them to.
+            batches = {package_resource: [] for _, package_resource in MANIFEST_RESOURCES}
+            for index, (package_file, _) in enumerate(entries):
+                if package_file is None:
+                    continue
+
+                package_resource = self._resource(package_file)
+                if package_resource is None:
+                    items[index] = self._error(package_file.filename, http_utils.HTTP_406_NOT_ACCEPTABLE,
+                                               'Not a SHIELD package')
+                elif package_resource not in BATCH_RESOURCES[resource]:
+                    items[index] = self._error(package_file.filename, http_utils.HTTP_406_NOT_ACCEPTABLE,
+                                               "Package not accepted in a '{}' batch".format(resource))
+                else:
+                    batches[package_resource].append((index, package_file))
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for _, package_resource in MANIFEST_RESOURCES:
+                    futures = [(index, package_file, executor.submit(self._onboard, package_resource, package_file))
+                               for index, package_file in batches[package_resource]]
+
+                    # Wait for the whole batch to finish before onboarding the next one. A package failing
+                    # unexpectedly only fails its own onboarding.
+                    for index, package_file, future in futures:
+                        try:
+                            items[index] = future.result()
+                        except Exception:
+                            self.logger.exception('Unable to onboard %s', package_file.filename)
+                            items[index] = self._error(package_file.filename, http_utils.HTTP_500_SERVER_ERROR,
+                                                       'Unable to onboard the package')
+
+        finally:
+            # The packages are spooled for the batch alone.
+            for package_file, _ in entries:
+                if package_file is not None:
+                    package_file.close()
+
+        items = [item for item in items if item is not None]
+        status = 'OK' if all(item['_status'] == 'OK' for item in items) else 'ERR'
+
+        # The outcomes hold database types (e.g. ObjectId) so they're encoded as Eve does.
+        response = make_response(json.dumps({'_status': status, '_items': items}, cls=self.app.data.json_encoder_class),
+                                 http_utils.HTTP_200_OK)
+        response.mimetype = 'application/json'
+
+        return response
+
+    def _onboard(self, resource, package_file):
+        """
+        Onboards a package of the batch.
+
+        :param resource: the resource to onboard the package to.
+        :param package_file: the package (as a FileStorage).
+        :return: the onboarding outcome for the package.
+        """
+
+        with self.app.test_request_context():
+            r, status = onboard(self.handlers[resource], package_file)
+
+        item = {'package': package_file.filename, 'resource': resource, 'status_code': status}
+        item.update(r)
+        item.setdefault('_status', 'OK' if status == http_utils.HTTP_201_CREATED else 'ERR')
+
+        return item
+
+    def _resource(self, package_file):
+        """
+        Finds out which resource the package is onboarded to through its SHIELD manifest.
+
+        :param package_file: the package (as a FileStorage).
+        :return: the resource to onboard the package to or None if it's not a SHIELD package.
+        """
+
+        try:
+            manifest_data = tar_package.read_member(package_file.stream.name, MANIFEST_FILENAME)
+            manifest = yaml_utils.load(manifest_data) if manifest_data else None
+        except (tarfile.TarError, EOFError, OSError, yaml_utils.YAMLError):
+            return None
+
+        if not isinstance(manifest, dict):
+            return None
+
+        for kind, resource in MANIFEST_RESOURCES:
+            if kind in manifest and resource in self.handlers:
+                return resource
+
+        return None
+
+    def _unbundle(self, bundle):
+        """
+        Spools the packages out of a bundle.
+
+        :param bundle: the tarball of SHIELD packages (as a FileStorage).
+        :return: for each package found, the package (as a FileStorage) or the onboarding outcome when it's not
+        acceptable.
+        """
+
+        entries = []
+
+        try:
+            with tarfile.open(fileobj=bundle.stream, mode='r|gz') as tar:
+                for member in tar:
+                    if not member.isfile():
+                        continue
+
+                    if self.max_member_size is not None and member.size > self.max_member_size:
+                        entries.append((None, self._error(member.name, http_utils.HTTP_412_PRECONDITION_FAILED,
+                                                          'Package larger than {} bytes'.format(self.max_member_size))))
+                        continue
+
+                    entries.append((self._spool(tar.extractfile(member), os.path.basename(member.name)), None))
+
+        except (tarfile.TarError, EOFError, OSError) as e:
+            self.logger.warning('Bundle %s not acceptable: %s', bundle.filename, e)
+            entries.append((None, self._error(bundle.filename, http_utils.HTTP_412_PRECONDITION_FAILED,
+                                              'Not a tarball of SHIELD packages')))
+
+        except Exception:
+            for package_file, _ in entries:
+                if package_file is not None:
+                    package_file.close()
+            raise
+
+        finally:
+            bundle.close()
+
+        return entries
+
+    def _spooled(self, package_file):
+        """
+        Ensures the package is spooled to a file, as packages are read (and checked) from the file system.
+
+        :param package_file: the package (as a FileStorage).
+        :return: the spooled package (as a FileStorage).
+        """
+
+        if isinstance(package_file.stream, package_spool.PackageSpool):
+            return package_file
+
+        return self._spool(package_file.stream, package_file.filename)
+
+    def _spool(self, fileobj, filename):
+        """
+        Spools a package out of a bundle so it can be onboarded.
+
+        :param fileobj: the package file contents.
+        :param filename: the package file name.
+        :return: the package (as a FileStorage).
+        """
+
+        spool = package_spool.PackageSpool(self.spool_folder)
+        while True:
+            data = fileobj.read(COPY_BUFFER_SIZE)
+            if not data:
+                break
+            spool.write(data)
+        spool.seek(0)
+
+        return FileStorage(stream=spool, filename=filename, name='package')
+
+    @staticmethod
+    def _error(package, code, message):
+        return {'package': package, 'status_code': code, '_status': 'ERR',
+                '_error': {'code': code, 'message': message}}
@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from flask import abort, jsonify, make_response
+from pymongo import ReturnDocument
+from storeutils import http_utils, package_spool
+from storeutils.circuit_breaker import OPEN
+from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import HTTPException
+
+JOBS_RESOURCE = 'jobs'
+
+# Job states.
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+# Job stages, where the job stands within its state.
+STAGE_QUEUED = 'queued'
+STAGE_SPOOLING = 'spooling'
+STAGE_ONBOARDING = 'onboarding'
+STAGE_DONE = 'done'
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def onboard(handler, package_file):
+    """
+    Onboards a package outside of the HTTP request which submitted it. Must be called within a request context.
+
+    :param handler: the onboarding function for the resource the package is submitted to.
+    :param package_file: the package (as a FileStorage).
+    :return: the response data and HTTP status code of the onboarding, be it successful or not.
+    """
+
+    try:
+        return handler(package_file)
+
+    except HTTPException as e:
+        response = e.get_response()
+        return json.loads(response.get_data(as_text=True)), response.status_code
+
+
+class OnboardingJobs(object):
+    """
+    Onboards packages in the background. Each package submitted becomes a job, queued in the database, which is later
+    picked up by a pool of workers. A worker takes a lease on the job while onboarding it so other workers (in this or
+    any other Store instance sharing the database) leave it alone. Should the worker die the lease expires and the job
+    is picked up again, up to a maximum number of attempts.
+
+    Jobs are held off while the Orchestrator is deemed unavailable, and those failing while it is are queued again
+    without counting the attempt.
+    """
+
+    def __init__(self, app, handlers, workers=2, lease=300, poll_interval=2, max_attempts=3, spool_folder=None,
+                 orchestrator=None, logger=None):
+        """
+        :param app: the Eve application.
+        :param handlers: the onboarding function to use for each resource. Each function takes the package file and
+        returns the response data and HTTP status code for the document stored.
+        :param workers: the number of worker threads to run.
+        :param lease: the time (in seconds) a worker holds on to a job before it's considered abandoned.
+        :param poll_interval: the time (in seconds) to wait for new jobs when the queue is empty.
+        :param max_attempts: the number of times a job is picked up before it's considered failed.
+        :param spool_folder: where to spool the packages to while they're onboarded.
+        :param orchestrator: the Orchestrator (adapter) the packages are onboarded to, if its availability is to be
+        taken into account.
+        """
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.app = app
+        self.handlers = handlers
+        self.workers = workers
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.spool_folder = spool_folder
+        self.orchestrator = orchestrator
+        self.owner = '{}:{}'.format(socket.gethostname(), os.getpid())
+
+        self._stop = threading.Event()
+        self._threads = []
+
+    @property
+    def collection(self):
+        return self.app.data.driver.db[JOBS_RESOURCE]
+
+    def start(self):
+        """
+        Starts the worker threads draining the jobs queue.
+        """
+
+        if self._threads:
+            return
+
+        for i in range(self.workers):
+            worker = threading.Thread(target=self._work, name='onboarding-worker-{}'.format(i), daemon=True)
+            worker.start()
+            self._threads.append(worker)
+
+        self.logger.info('%d onboarding workers started for %s', self.workers, self.owner)
+
+    def stop(self):
+        """
+        Signals the worker threads to stop once the job at hand is done.
+        """
+
+        self._stop.set()
+
+    def defer_onboarding(self, resource, request):
+        """
+        Queues the package for onboarding instead of onboarding it while the client waits, replying with '202
+        Accepted' and the link to the job. Only done for the resources with an onboarding handler and when the client
+        asks for it through the 'Prefer: respond-async' header or when configured to onboard everything in the
+        background.
+
+        :param resource: the resource the package is submitted to.
+        :param request: the HTTP request data, holding the package.
+        """
+
+        if resource not in self.handlers or 'package' not in request.files:
+            return
+
+        if not self.app.config.get('ONBOARDING_ASYNC') and \
+                'respond-async' not in request.headers.get('Prefer', '').lower():
+            return
+
+        package_file = request.files['package']
+        try:
+            job = self.enqueue(resource, package_file)
+        finally:
+            # The package is onboarded from its copy in the database so its spool is no longer needed.
+            package_file.close()
+
+        response = make_response(jsonify(**job), http_utils.HTTP_202_ACCEPTED)
+        response.headers['Location'] = '/{}/{}'.format(JOBS_RESOURCE, job['_id'])
+        abort(response)
+
+    def enqueue(self, resource, package_file):
+        """
+        Stores the package and queues the job to onboard it.
+
+        :param resource: the resource the package is submitted to.
+        :param package_file: the package (as a FileStorage).
+        :return: the job details to report back.
+        """
+
+        package_id = self.app.media.put(package_file.stream, filename=package_file.filename,
+                                        content_type=package_file.content_type, resource=JOBS_RESOURCE)
+
+        now = datetime.utcnow().replace(microsecond=0)
+        job = {
+            'resource':         resource,
+            'state':            QUEUED,
+            'stage':            STAGE_QUEUED,
+            'attempts':         0,
+            'package_file':     package_id,
+            'package_filename': package_file.filename,
+            '_created':         now,
+            '_updated':         now
+            }
+        job_id = self.collection.insert_one(job).inserted_id
+
+        self.logger.info('Queued %s onboarding job %s', resource, job_id)
+
+        return {
+            '_id':    str(job_id),
+            '_links': {'self': {'title': 'job', 'href': '{}/{}'.format(JOBS_RESOURCE, job_id)}},
+            'state':  QUEUED
+            }
+
+    def _work(self):
+        """
+        Drains the jobs queue until told to stop. The database is only reachable within the application context.
+        """
+
+        with self.app.app_context():
+            while not self._stop.is_set():
+                if self._orchestrator_unavailable():
+                    self._stop.wait(self.poll_interval)
+                    continue
+
+                try:
+                    job = self._acquire()
+                except Exception:
+                    self.logger.exception('Unable to fetch an onboarding job')
+                    job = None
+
+                if job is None:
+                    self._stop.wait(self.poll_interval)
+                    continue
+
+                self._run(job)
+
+    def _acquire(self):
+        """
+        Takes the lease on the oldest job waiting to be onboarded, be it a queued one or one whose worker gave up on
+        it. Jobs exhausting their attempts are marked as failed.
+
+        :return: the job to onboard or None if there's none.
+        """
+
+        while True:
+            now = datetime.utcnow().replace(microsecond=0)
+            job = self.collection.find_one_and_update(
+                {'$or': [{'state': QUEUED},
+                         {'state': RUNNING, 'lease_expires': {'$lt': now}}]},
+                {'$set':   {'state':         RUNNING,
+                            'stage':         STAGE_SPOOLING,
+                            'lease_owner':   '{}:{}'.format(self.owner, uuid.uuid4().hex),
+                            'lease_expires': now + timedelta(seconds=self.lease),
+                            '_updated':      now},
+                 '$inc':   {'attempts': 1},
+                 '$unset': {'_etag': ''}},
+                sort=[('_created', 1)],
+                return_document=ReturnDocument.AFTER)
+
+            if job is None or job['attempts'] <= self.max_attempts:
+                return job
+
+            self.logger.error('Onboarding job %s abandoned after %d attempts', job['_id'], job['attempts'] - 1)
+            self._finish(job, FAILED, None, http_utils.HTTP_500_SERVER_ERROR,
+                         {'_error': {'code': http_utils.HTTP_500_SERVER_ERROR,
+                                     'message': 'Onboarding abandoned after {} attempts'.format(self.max_attempts)}})
+
+    def _renew(self, job, done):
+        """
+        Keeps renewing the lease on the job while it's being onboarded.
+
+        :param job: the job being onboarded.
+        :param done: the event signaling the job is over.
+        """
+
+        with self.app.app_context():
+            while not done.wait(self.lease / 3):
+                now = datetime.utcnow().replace(microsecond=0)
+                try:
+                    self.collection.update_one({'_id': job['_id'], 'lease_owner': job['lease_owner']},
+                                               {'$set': {'lease_expires': now + timedelta(seconds=self.lease)}})
+                except Exception:
+                    self.logger.exception('Unable to renew the lease on onboarding job %s', job['_id'])
+
+    def _run(self, job):
+        """
+        Onboards the package of a job, recording the outcome.
+
+        :param job: the job to onboard.
+        """
+
+        self.logger.info('Onboarding %s job %s (attempt %d)', job['resource'], job['_id'], job['attempts'])
+
+        done = threading.Event()
+        threading.Thread(target=self._renew, args=(job, done), daemon=True).start()
+
+        package_file = None
+        try:
+            with self.app.test_request_context():
+                package_file = self._package_file(job)
+                self._advance(job, STAGE_ONBOARDING)
+
+                r, status = onboard(self.handlers[job['resource']], package_file)
+
+            if status != http_utils.HTTP_201_CREATED and self._orchestrator_unavailable():
+                # Not the package's fault, give it another go once the Orchestrator is back.
+                self._requeue(job)
+                return
+
+            state = SUCCEEDED if status == http_utils.HTTP_201_CREATED else FAILED
+            self._finish(job, state, r.get('_id'), status, r)
+
+        except Exception:
+            # Leave it to be picked up again once the lease expires.
+            self.logger.exception('Onboarding job %s interrupted', job['_id'])
+
+        finally:
+            done.set()
+            if package_file is not None:
+                package_file.close()
+
+    def _orchestrator_unavailable(self):
+        return self.orchestrator is not None and self.orchestrator.breaker.state == OPEN
+
+    def _requeue(self, job):
+        """
+        Gives up the lease on a job so it's picked up again, not counting the attempt.
+
+        :param job: the job to queue again.
+        """
+
+        requeued = self.collection.update_one({'_id': job['_id'], 'lease_owner': job['lease_owner']},
+                                              {'$set':   {'state':    QUEUED,
+                                                          'stage':    STAGE_QUEUED,
+                                                          '_updated': datetime.utcnow().replace(microsecond=0)},
+                                               '$inc':   {'attempts': -1},
+                                               '$unset': {'lease_owner': '', 'lease_expires': '', '_etag': ''}})
+        if requeued.modified_count:
+            self.logger.info('Onboarding job %s queued again, the Orchestrator is unavailable', job['_id'])
+
+    def _advance(self, job, stage):
+        """
+        Records the stage a job has reached, provided the worker still holds the lease on it.
+
+        :param job: the job being onboarded.
+        :param stage: the stage reached.
+        """
+
+        self.collection.update_one({'_id': job['_id'], 'lease_owner': job['lease_owner']},
+                                   {'$set':   {'stage': stage, '_updated': datetime.utcnow().replace(microsecond=0)},
+                                    '$unset': {'_etag': ''}})
+
+    def _package_file(self, job):
+        """
+        Spools the job package out of the database so it can be onboarded.
+
+        :param job: the job to onboard.
+        :return: the package (as a FileStorage).
+        """
+
+        package = self.app.media.get(job['package_file'], JOBS_RESOURCE)
+
+        spool = package_spool.PackageSpool(self.spool_folder)
+        while True:
+            data = package.read(COPY_BUFFER_SIZE)
+            if not data:
+                break
+            spool.write(data)
+        spool.seek(0)
+
+        return FileStorage(stream=spool, filename=job['package_filename'], name='package',
+                           content_type=package.content_type)
+
+    def _finish(self, job, state, document_id, status, result):
+        """
+        Records the outcome of a job, provided the worker still holds the lease on it, and disposes of the package.
+
+        :param job: the job onboarded.
+        :param state: the final state of the job.
+        :param document_id: the identifier of the document stored, if any.
+        :param status: the HTTP status code of the onboarding.
+        :param result: the response data of the onboarding.
+        """
+
+        outcome = {'state':       state,
+                   'stage':       STAGE_DONE,
+                   'status_code': status,
+                   'result':      result,
+                   '_updated':    datetime.utcnow().replace(microsecond=0)}
+        if document_id:
+            outcome['document'] = str(document_id)
+
+        finished = self.collection.update_one({'_id': job['_id'], 'lease_owner': job['lease_owner']},
+                                              {'$set':   outcome,
+                                               '$unset': {'lease_owner': '', 'lease_expires': '', '_etag': ''}})
+        if not finished.modified_count:
+            self.logger.warning('Lost the lease on onboarding job %s', job['_id'])
+            return
+
+        self.app.media.delete(job['package_file'], JOBS_RESOURCE)
+
+        self.logger.info('Onboarding job %s %s (%s)', job['_id'], state, status)
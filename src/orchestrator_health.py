@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import logging
+import threading
+
+from flask import abort, jsonify, make_response
+from pymongo.errors import PyMongoError
+from storeutils import http_utils
+from storeutils.circuit_breaker import OPEN
+from vnsfo.vnsfo_adapter import VnsfOrchestratorUnreacheable
+
+# The resources whose operations depend on the Orchestrator.
+ORCHESTRATED_RESOURCES = ['vnsfs', 'nss']
+
+
+class OrchestratorHealth(object):
+    """
+    Keeps the Orchestrator availability up to date by probing it in the background, so requests depending on it fail
+    fast while it's down, and reports the Store readiness.
+    """
+
+    def __init__(self, app, orchestrator, probe_interval=10, logger=None):
+        """
+        :param app: the Eve application.
+        :param orchestrator: the Orchestrator (adapter) to keep track of.
+        :param probe_interval: the time (in seconds) between probes. No probing is done when 0.
+        """
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.app = app
+        self.orchestrator = orchestrator
+        self.probe_interval = probe_interval
+
+        self._stop = threading.Event()
+        self._prober = None
+
+    def start(self):
+        """
+        Starts probing the Orchestrator.
+        """
+
+        if self._prober is not None or not self.probe_interval:
+            return
+
+        self._prober = threading.Thread(target=self._probe, name='vnsfo-prober', daemon=True)
+        self._prober.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def fail_fast(self, resource, request, *args):
+        """
+        Refuses the requests depending on the Orchestrator while it's deemed unavailable, before any package is even
+        read.
+
+        :param resource: the resource requested.
+        :param request: the HTTP request data.
+        """
+
+        if resource not in ORCHESTRATED_RESOURCES:
+            return
+
+        try:
+            self.orchestrator.ensure_available()
+
+        except VnsfOrchestratorUnreacheable as e:
+            response = make_response(jsonify(_status='ERR',
+                                             _error={'code':    http_utils.HTTP_503_SERVICE_UNAVAILABLE,
+                                                     'message': e.message}),
+                                     http_utils.HTTP_503_SERVICE_UNAVAILABLE)
+            response.headers['Retry-After'] = self.orchestrator.breaker.retry_after()
+            abort(response)
+
+    def ready(self):
+        """
+        Reports whether the Store is ready to serve requests, i.e. whether its datastore and Orchestrator are
+        available.
+
+        :return: the state of each dependency. '503 Service Unavailable' when any is down.
+        """
+
+        vnsfo = self.orchestrator.breaker.snapshot()
+
+        try:
+            self.app.data.driver.db.command('ping')
+            datastore = 'up'
+        except PyMongoError as e:
+            self.logger.warning('Datastore unavailable: %s', e)
+            datastore = 'down'
+
+        ready = datastore == 'up' and vnsfo['state'] != OPEN
+        status = http_utils.HTTP_200_OK if ready else http_utils.HTTP_503_SERVICE_UNAVAILABLE
+
+        return make_response(jsonify(_status='OK' if ready else 'ERR', datastore=datastore, vnsfo=vnsfo), status)
+
+    def _probe(self):
+        while not self._stop.wait(self.probe_interval):
+            if not self.orchestrator.probe():
+                self.logger.debug('Orchestrator probe failed: %s', self.orchestrator.breaker.snapshot())
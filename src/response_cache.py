@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import logging
+import threading
+
+from flask import g, request
+from storeutils import http_utils
+from storeutils.lru_cache import LruCache
+
+# The resources whose reads are cached, along with the cached resources each one shows up in (e.g. vNSFs are embedded
+# in the NSs).
+CACHED_RESOURCES = {
+    'vnsfs':      ['vnsfs', 'nss'],
+    'nss':        ['nss'],
+    'validation': ['validation'],
+    }
+
+# The endpoints serving the reads, i.e. '<resource>|<kind>'.
+READ_ENDPOINTS = ['resource', 'item_lookup', 'item_additional_lookup', 'search']
+
+# Response headers which depend on the request at hand rather than on the resource read.
+REQUEST_HEADERS_PREFIX = 'access-control-'
+
+
+def _sizeof(entry):
+    return len(entry[1])
+
+
+class ResponseCache(object):
+    """
+    Keeps the responses to reading the catalogue (vNSFs, NSs and validations) so polling it doesn't reach the
+    database. Responses are cached by URL (query included) and by the representation accepted, and are bounded both in
+    size, evicting the least recently used, and in age.
+
+    Writes (through the API or the internal calls the onboarding makes) invalidate the responses cached for the
+    resource written to. Each resource has a generation, bumped on every write, which versions the responses cached so
+    those from an earlier generation are never provided. Writes made by another Store instance are only noticed as the
+    responses cached expire.
+    """
+
+    def __init__(self, app, max_size, max_age=20, logger=None):
+        """
+        :param app: the Eve application.
+        :param max_size: the largest total size (in bytes) of the responses cached. Nothing is cached when 0.
+        :param max_age: the time (in seconds) a response is provided from the cache.
+        """
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.app = app
+        self.cache = LruCache(max_size, sizeof=_sizeof, max_age=max_age)
+
+        self._lock = threading.Lock()
+        self._generations = {resource: 0 for resource in CACHED_RESOURCES}
+
+    def register(self):
+        """
+        Serves the reads from the cache and invalidates it on writes.
+        """
+
+        if not self.cache.max_size:
+            return
+
+        self.app.before_request(self.send_cached)
+        self.app.after_request(self.keep)
+
+        self.app.on_inserted += self.invalidate
+        self.app.on_updated += self.invalidate
+        self.app.on_replaced += self.invalidate
+        self.app.on_deleted_item += self.invalidate
+        self.app.on_deleted_resource += self.invalidate
+
+    def invalidate(self, resource, *args):
+        """
+        Invalidates the responses cached showing the resource written to.
+
+        :param resource: the resource written to.
+        """
+
+        if resource not in CACHED_RESOURCES:
+            return
+
+        with self._lock:
+            for cached in CACHED_RESOURCES[resource]:
+                self._generations[cached] += 1
+
+    def send_cached(self):
+        """
+        Provides the cached response to the read, if there's one.
+
+        :return: the response cached or None to carry on reading the database.
+        """
+
+        resource = self._resource()
+        if resource is None:
+            return None
+
+        g.response_cache_key = key = self._key(resource)
+        g.response_cache_generation = generation = self._generations[resource]
+
+        entry = self.cache.get(key, generation)
+        if entry is None:
+            return None
+
+        g.response_cache_key = None
+
+        headers, data = entry
+        response = self.app.response_class(data, status=http_utils.HTTP_200_OK, headers=headers)
+
+        return response.make_conditional(request)
+
+    def keep(self, response):
+        """
+        Caches the response to the read, provided it was successful.
+
+        :param response: the response to the read.
+        :return: the response, as is.
+        """
+
+        key = g.get('response_cache_key')
+        if key is None or response.status_code != http_utils.HTTP_200_OK or response.is_streamed:
+            return response
+
+        headers = [(name, value) for name, value in response.headers
+                   if not name.lower().startswith(REQUEST_HEADERS_PREFIX)]
+        self.cache.put(key, (headers, response.get_data()), g.response_cache_generation)
+
+        return response
+
+    def stats(self):
+        return self.cache.stats()
+
+    @staticmethod
+    def _resource():
+        """
+        :return: the resource read by the request or None if it's not a cacheable read.
+        """
+
+        if request.method != 'GET' or not request.endpoint or '|' not in request.endpoint:
+            return None
+
+        resource, kind = request.endpoint.split('|', 1)
+        if resource not in CACHED_RESOURCES or kind not in READ_ENDPOINTS:
+            return None
+
+        return resource
+
+    @staticmethod
+    def _key(resource):
+        """
+        :param resource: the resource read.
+        :return: the key of the response to the read: the URL (query included, as is) and the representation accepted.
+        """
+
+        return resource, request.environ.get('PATH_INFO'), request.environ.get('QUERY_STRING'), \
+            request.headers.get('Accept')
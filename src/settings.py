@@ -28,6 +28,7 @@
 import os
 
 import store_endpoints
+from tempfile import gettempdir
 
 BACKENDAPI_PORT = int(os.environ.get('BACKENDAPI_PORT', 5000))
 
@@ -42,9 +43,73 @@ VNSFO_HOST = os.environ.get('VNSFO_HOST', '__missing_vnsfo_address__')
 VNSFO_PORT = os.environ.get('VNSFO_PORT', '')
 VNSFO_API = os.environ.get('VNSFO_API', '__missing_vnsfo_api_basepath__')
 
+# HTTP connections to the vNSFO. Timeouts in seconds; only idempotent calls (e.g. deletes) are retried once the request
+# reaches the vNSFO, waiting VNSFO_RETRY_BACKOFF * 2^retry seconds between retries.
+VNSFO_CONNECT_TIMEOUT = float(os.environ.get('VNSFO_CONNECT_TIMEOUT', 5))
+VNSFO_READ_TIMEOUT = float(os.environ.get('VNSFO_READ_TIMEOUT', 120))
+VNSFO_RETRIES = int(os.environ.get('VNSFO_RETRIES', 3))
+VNSFO_RETRY_BACKOFF = float(os.environ.get('VNSFO_RETRY_BACKOFF', 0.5))
+VNSFO_POOL_SIZE = int(os.environ.get('VNSFO_POOL_SIZE', 10))
+
+# vNSFO availability. After VNSFO_FAILURE_THRESHOLD consecutive failed calls (or probes) the vNSFO is deemed unavailable
+# for VNSFO_RESET_TIMEOUT seconds and the requests depending on it fail fast. The vNSFO is probed every
+# VNSFO_PROBE_INTERVAL seconds (0 disables probing).
+VNSFO_FAILURE_THRESHOLD = int(os.environ.get('VNSFO_FAILURE_THRESHOLD', 5))
+VNSFO_RESET_TIMEOUT = int(os.environ.get('VNSFO_RESET_TIMEOUT', 30))
+VNSFO_PROBE_INTERVAL = int(os.environ.get('VNSFO_PROBE_INTERVAL', 10))
+
 # NOTE: this shall be removed once AAA is in place.
 VNSFO_TENANT_ID = os.environ.get('VNSFO_TENANT_ID', '__no_tenant_set__')
 
+# Where uploaded packages are spooled to (once) while the request body arrives.
+PACKAGE_SPOOL_FOLDER = os.environ.get('PACKAGE_SPOOL_FOLDER', gettempdir())
+PACKAGE_DIGEST_ALGORITHM = os.environ.get('PACKAGE_DIGEST_ALGORITHM', 'sha256')
+
+# Largest file (in bytes) allowed to be extracted from a package. Defaults to 4GB.
+PACKAGE_MEMBER_MAX_SIZE = int(os.environ.get('PACKAGE_MEMBER_MAX_SIZE', 4 * 1024 ** 3))
+
+# How to handle package digests not matching the manifest: 'enforce' (reject the package), 'warn' (log it) or 'off'.
+PACKAGE_INTEGRITY_POLICY = os.environ.get('PACKAGE_INTEGRITY_POLICY', 'enforce')
+
+# Whether to store the descriptors canonical JSON string along with the descriptor itself.
+DESCRIPTOR_CANONICAL_JSON = os.environ.get('DESCRIPTOR_CANONICAL_JSON', 'false').lower() in ('1', 'true', 'yes')
+
+# Largest size (in bytes) of the vNSF descriptors (YAML) cached for onboarding NSs. Defaults to 64MB; 0 disables it.
+DESCRIPTOR_CACHE_SIZE = int(os.environ.get('DESCRIPTOR_CACHE_SIZE', 64 * 1024 ** 2))
+
+# Largest size (in bytes) of the responses to reading vNSFs, NSs and validations cached. Defaults to 32MB; 0 disables
+# it. Responses are provided from the cache for up to RESPONSE_CACHE_MAX_AGE seconds, unless written to meanwhile.
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 32 * 1024 ** 2))
+RESPONSE_CACHE_MAX_AGE = int(os.environ.get('RESPONSE_CACHE_MAX_AGE', 20))
+
+# Background onboarding. Packages are onboarded in the background when the client sends 'Prefer: respond-async' or
+# when ONBOARDING_ASYNC is set, replying with '202 Accepted' and a link to the onboarding job.
+ONBOARDING_ASYNC = os.environ.get('ONBOARDING_ASYNC', 'false').lower() in ('1', 'true', 'yes')
+ONBOARDING_WORKERS = int(os.environ.get('ONBOARDING_WORKERS', 2))
+# Time (in seconds) a worker holds on to a job before another worker may pick it up.
+ONBOARDING_LEASE = int(os.environ.get('ONBOARDING_LEASE', 300))
+ONBOARDING_POLL_INTERVAL = int(os.environ.get('ONBOARDING_POLL_INTERVAL', 2))
+ONBOARDING_MAX_ATTEMPTS = int(os.environ.get('ONBOARDING_MAX_ATTEMPTS', 3))
+# Number of packages onboarded at the same time through the batch endpoints.
+ONBOARDING_BATCH_WORKERS = int(os.environ.get('ONBOARDING_BATCH_WORKERS', 4))
+
+# Catalogue change feed: the size (in bytes) of the changes kept for consumers to resume from, the longest time (in
+# seconds) a long-poll waits for changes and the time between keep-alive comments on event streams.
+CHANGE_FEED_SIZE = int(os.environ.get('CHANGE_FEED_SIZE', 16 * 1024 ** 2))
+CHANGE_FEED_MAX_WAIT = int(os.environ.get('CHANGE_FEED_MAX_WAIT', 25))
+CHANGE_FEED_KEEPALIVE = int(os.environ.get('CHANGE_FEED_KEEPALIVE', 15))
+
+# Number of attestation files fetched at the same time while exporting many vNSFs.
+ATTESTATION_EXPORT_WORKERS = int(os.environ.get('ATTESTATION_EXPORT_WORKERS', 4))
+
+# Descriptors validation: the validator module ('nsfval'; empty disables validation) run in VALIDATION_WORKERS
+# processes. Each validation can take up to VALIDATION_TIMEOUT seconds and VALIDATION_CPU_LIMIT seconds of CPU time (0
+# for no limit), the descriptor being deemed invalid otherwise.
+DESCRIPTOR_VALIDATOR = os.environ.get('DESCRIPTOR_VALIDATOR', 'nsfval')
+VALIDATION_WORKERS = int(os.environ.get('VALIDATION_WORKERS', 2))
+VALIDATION_TIMEOUT = int(os.environ.get('VALIDATION_TIMEOUT', 60))
+VALIDATION_CPU_LIMIT = int(os.environ.get('VALIDATION_CPU_LIMIT', 30))
+
 X_DOMAINS = '*'  # CORS-related settings.
 X_HEADERS = ['Content-Type', 'If-Match']
 
@@ -68,4 +133,5 @@ DOMAIN = {
     'nss': store_endpoints.nss,
     'attestation': store_endpoints.vnsf_attestation,
     'validation': store_endpoints.validation,
+    'jobs': store_endpoints.jobs,
     }
@@ -29,15 +29,28 @@ import json
 import logging
 
 import base64
+import attestation_export
+import change_feed
+import cursor_pagination
+import field_sets
+import media_streaming
+import response_cache
 import settings as cfg
 import store_docs
+import store_indexes
+import vnsf_search
 from eve import Eve
 from eve_swagger import swagger, add_documentation
 from ns_hooks import NsHooks
-from storeutils import log
+from onboarding_batch import OnboardingBatch
+from onboarding_jobs import OnboardingJobs
+from orchestrator_health import OrchestratorHealth
+from storeutils import descriptors, http_utils, log, package_spool
+from storeutils.validation_engine import ValidationEngine
 from vnsf_hooks import VnsfHooks
+from vnsfo.vnsfo import VnsfoFactory
 from flask_cors import CORS
-from flask import jsonify, make_response
+from flask import jsonify, make_response, url_for
 from werkzeug.exceptions import default_exceptions
 
 
@@ -52,11 +65,13 @@ def send_attestation(request, response):
 
     payload_json = json.loads(response.get_data(as_text=True))
 
-    # Check if multiple vNSF were requested (e.g. endpoint '/attestation/vnsfs')
+    # Check if multiple vNSF were requested (e.g. endpoint '/attestation/vnsfs'). These are exported as an archive.
     if '_items' in payload_json:
-        print("MULTIPLE attestations were request. Not implemented")
-        # TODO handle multiple vNSFs (should this be allowed?)
-        pass
+        response.status_code = http_utils.HTTP_400_BAD_REQUEST
+        response.set_data(json.dumps({'_status': 'ERR',
+                                      '_error':  {'code':    http_utils.HTTP_400_BAD_REQUEST,
+                                                  'message': "Attestations of many vNSFs are exported through "
+                                                             "'{}'".format(url_for('attestation|export'))}}))
 
     else:
         # Retrive vnsf_id and attestation_file
@@ -67,20 +82,120 @@ def send_attestation(request, response):
         response.set_data(attestation_file)
 
 
+def send_stats():
+    """
+    Send the Store caches usage figures.
+
+    :return: The usage figures for each cache.
+    """
+
+    return jsonify(descriptor_cache=descriptors.cache.stats(), response_cache=responses.stats())
+
+
+# Descriptors validation workers, forked before any thread (e.g. the database client ones) is started.
+validation = None
+if cfg.DESCRIPTOR_VALIDATOR:
+    validation = ValidationEngine(cfg.DESCRIPTOR_VALIDATOR,
+                                  workers=cfg.VALIDATION_WORKERS,
+                                  timeout=cfg.VALIDATION_TIMEOUT,
+                                  cpu_limit=cfg.VALIDATION_CPU_LIMIT or None)
+    validation.start()
+    if not validation.enabled:
+        validation = None
+
 app = Eve()
 CORS(app)
 
+# Spool uploaded packages once, digesting and checking them as they arrive.
+app.request_class = package_spool.spooling_request(cfg.PACKAGE_SPOOL_FOLDER, cfg.PACKAGE_DIGEST_ALGORITHM)
+
+# Caches.
+descriptors.cache.max_size = cfg.DESCRIPTOR_CACHE_SIZE
+responses = response_cache.ResponseCache(app, cfg.RESPONSE_CACHE_SIZE, max_age=cfg.RESPONSE_CACHE_MAX_AGE)
+responses.register()
+app.add_url_rule('{}/stats'.format(app.api_prefix), 'stats', send_stats, methods=['GET'])
+
+# Orchestrator connections, shared by all the requests.
+VnsfoFactory.configure(connect_timeout=cfg.VNSFO_CONNECT_TIMEOUT,
+                       read_timeout=cfg.VNSFO_READ_TIMEOUT,
+                       retries=cfg.VNSFO_RETRIES,
+                       backoff_factor=cfg.VNSFO_RETRY_BACKOFF,
+                       pool_size=cfg.VNSFO_POOL_SIZE,
+                       failure_threshold=cfg.VNSFO_FAILURE_THRESHOLD,
+                       reset_timeout=cfg.VNSFO_RESET_TIMEOUT,
+                       validator=validation)
+
+# Orchestrator availability. Failing fast takes place before any other hook reads the package.
+orchestrator_health = OrchestratorHealth(app,
+                                         VnsfoFactory.get_orchestrator('OSM', cfg.VNSFO_PROTOCOL, cfg.VNSFO_HOST,
+                                                                       cfg.VNSFO_PORT, cfg.VNSFO_API),
+                                         probe_interval=cfg.VNSFO_PROBE_INTERVAL)
+app.on_pre_POST += orchestrator_health.fail_fast
+app.on_pre_DELETE += orchestrator_health.fail_fast
+app.before_first_request(orchestrator_health.start)
+app.add_url_rule('{}/ready'.format(app.api_prefix), 'ready', orchestrator_health.ready, methods=['GET'])
+
+# Field sets ('summary' by default) for reading vNSFs and NSs.
+app.on_pre_GET += field_sets.apply_field_set
+
+# Cursor-based paging (e.g. '?cursor=_updated') for reading vNSFs, NSs and validations.
+app.on_pre_GET += cursor_pagination.apply_cursor
+app.on_fetched_resource += cursor_pagination.link_next_page
+
 # vNSF hooks.
 app.on_pre_POST_vnsfs += VnsfHooks.onboard_vnsf
 app.on_fetched_item_vnsfs += VnsfHooks.send_minimal_vnsf_data
 app.on_fetched_item_attestation += VnsfHooks.send_vnsf_attestation
 app.on_delete_item_vnsfs += VnsfHooks.delete_vnsf
+app.on_deleted_item_vnsfs += VnsfHooks.forget_vnsf
 app.on_post_GET_attestation += send_attestation
 
+# Media files streamed straight from GridFS, e.g. '/vnsfs/<vnsf_id>/attestation_file'.
+media_streaming.MediaStreaming(app).register()
+
+# vNSFs search, i.e. '/vnsfs/search'.
+vnsf_search.VnsfSearch(app).register()
+
+# Attestation files of many vNSFs at once, i.e. '/attestation/vnsfs/export'.
+attestation_export.AttestationExport(app, workers=cfg.ATTESTATION_EXPORT_WORKERS).register()
+
 # Network Services hooks.
 app.on_pre_POST_nss += NsHooks.onboard_ns
 app.on_delete_item_nss += NsHooks.delete_ns
 
+# Catalogue change feed, i.e. '/changes'. Started ahead of the onboarding workers as these publish changes too.
+changes = change_feed.ChangeFeed(app,
+                                 size=cfg.CHANGE_FEED_SIZE,
+                                 max_wait=cfg.CHANGE_FEED_MAX_WAIT,
+                                 keepalive=cfg.CHANGE_FEED_KEEPALIVE)
+changes.register()
+app.before_first_request(changes.start)
+
+onboarding_handlers = {'vnsfs': VnsfHooks.onboard_vnsf_job, 'nss': NsHooks.onboard_ns_job}
+
+# Background onboarding. Deferring takes place before the resource-specific onboarding hooks are called.
+onboarding_jobs = OnboardingJobs(app,
+                                 onboarding_handlers,
+                                 workers=cfg.ONBOARDING_WORKERS,
+                                 lease=cfg.ONBOARDING_LEASE,
+                                 poll_interval=cfg.ONBOARDING_POLL_INTERVAL,
+                                 max_attempts=cfg.ONBOARDING_MAX_ATTEMPTS,
+                                 spool_folder=cfg.PACKAGE_SPOOL_FOLDER,
+                                 orchestrator=orchestrator_health.orchestrator)
+app.on_pre_POST += onboarding_jobs.defer_onboarding
+app.before_first_request(onboarding_jobs.start)
+
+# Batch onboarding, e.g. '/vnsfs/batch'.
+OnboardingBatch(app,
+                onboarding_handlers,
+                workers=cfg.ONBOARDING_BATCH_WORKERS,
+                max_member_size=cfg.PACKAGE_MEMBER_MAX_SIZE,
+                spool_folder=cfg.PACKAGE_SPOOL_FOLDER,
+                orchestrator_health=orchestrator_health).register()
+
+# Indexes backing the uniqueness checks and the lookups.
+store_indexes.ensure_indexes(app)
+
 app.register_blueprint(swagger)
 
 app.config['SWAGGER_INFO'] = store_docs.swagger_info
@@ -93,4 +208,5 @@ if __name__ == '__main__':
 
     # use '0.0.0.0' to ensure your REST API is reachable from all your
     # network (and not only your computer).
-    app.run(host='0.0.0.0', port=cfg.BACKENDAPI_PORT, debug=True)
+    # Threaded as long-polls and event streams (change feed) hold on to their request.
+    app.run(host='0.0.0.0', port=cfg.BACKENDAPI_PORT, debug=True, threaded=True)
@@ -74,14 +74,21 @@ paths = {
             },
         'get': {
             'summary': 'Lists all the vNSFs',
-            'description': 'Provides a list of all the onboarded vNSFs along with a brief description for each one.',
+            'description': "Provides a list of all the onboarded vNSFs along with a brief description for each one. "
+                           "The descriptor and binaries are left out unless the `full` field set is requested "
+                           "(`?fields=full`).\n\nLong listings are better paged through a cursor, which costs the same "
+                           "however deep the page: request the first page with the key to order by (`?cursor=_id` or "
+                           "`?cursor=_updated`) and each following one with the `_meta.cursor` of the previous page "
+                           "(also linked as `_links.next`). The cursor is `null` on the last page. NSs and validations "
+                           "can be paged through the same way.",
             'responses': http_utils.responses_read
             }
         },
     '/vnsfs/{vnsfsId}': {
         'get': {
             'summary': 'Provides the details on a vNSF',
-            'description': 'Provides all the information on the onboarded vNSF.',
+            'description': "Provides the information on the onboarded vNSF. The descriptor is left out unless the "
+                           "`full` field set is requested (`?fields=full`).",
             'responses': http_utils.responses_read
             },
         'delete': {
@@ -91,5 +98,137 @@ paths = {
                            "operation for a later date.",
             'responses': http_utils.responses_deleted
             }
+        },
+    '/vnsfs/{vnsf_id}/attestation_file': {
+        'get': {
+            'summary': 'Downloads the vNSF attestation file',
+            'description': "Streams the Trust Monitor attestation file as onboarded. Partial downloads are supported "
+                           "through the `Range` header and the strong `ETag` (the file digest) can be used for "
+                           "conditional requests (`If-None-Match`, `If-Range`).",
+            'produces': ['application/octet-stream'],
+            'responses': http_utils.responses_read
+            }
+        },
+    '/vnsfs/{vnsf_id}/manifest_file': {
+        'get': {
+            'summary': 'Downloads the vNSF manifest file',
+            'description': "Streams the vNSF manifest file as onboarded. Partial downloads are supported through the "
+                           "`Range` header and the strong `ETag` (the file digest) can be used for conditional "
+                           "requests (`If-None-Match`, `If-Range`).",
+            'produces': ['application/octet-stream'],
+            'responses': http_utils.responses_read
+            }
+        },
+    '/nss/{ns_id}/manifest_file': {
+        'get': {
+            'summary': 'Downloads the NS manifest file',
+            'description': "Streams the NS manifest file as onboarded. Partial downloads are supported through the "
+                           "`Range` header and the strong `ETag` (the file digest) can be used for conditional "
+                           "requests (`If-None-Match`, `If-Range`).",
+            'produces': ['application/octet-stream'],
+            'responses': http_utils.responses_read
+            }
+        },
+    '/attestation/vnsfs/export': {
+        'get': {
+            'summary': 'Exports the attestation files of many vNSFs',
+            'description': "Streams a tarball holding the Trust Monitor attestation file of each vNSF selected, as "
+                           "`<vnsf_id>/<filename>`, along with `index.json` listing the size and digests (MD5 and "
+                           "SHA-256) of every file exported and the vNSFs with no attestation file. vNSFs are selected "
+                           "through a comma-separated list of identifiers (`?vnsf_id=a,b`) and/or a filter "
+                           "(`?where={...}`); all vNSFs are exported otherwise.",
+            'produces': ['application/x-tar'],
+            'responses': http_utils.responses_read
+            },
+        'post': {
+            'summary': 'Exports the attestation files of many vNSFs',
+            'description': "Same as the `GET` but the selection is provided as a JSON object, e.g. "
+                           "`{\"vnsf_id\": [\"a\", \"b\"], \"where\": {...}}`, suiting long lists of vNSFs.",
+            'consumes': ['application/json'],
+            'produces': ['application/x-tar'],
+            'responses': http_utils.responses_read
+            }
+        },
+    '/vnsfs/search': {
+        'get': {
+            'summary': 'Searches the vNSFs',
+            'description': "Finds the vNSFs matching the text provided (`q`) in their capabilities, vendor, name and "
+                           "descriptor (name, description and vendor), ranked by relevance (`_score`), and/or matching "
+                           "the exact values provided for `capability`, `vendor`, `type` and `state` (comma-separated "
+                           "for any of many). Along with the matches (`_items`, paged through `page` and "
+                           "`max_results`) the number of matches for each vendor, type and state is provided "
+                           "(`_facets`).",
+            'responses': http_utils.responses_read
+            }
+        },
+    '/vnsfs/batch': {
+        'post': {
+            'summary': 'Onboards many vNSFs at once',
+            'description': "Onboards all the vNSF packages provided, be it as many `package` parts or as `bundle` "
+                           "parts, each a tarball of SHIELD packages. Packages are onboarded concurrently and NS "
+                           "packages are not accepted (onboard these through `/nss/batch`). The outcome of each "
+                           "package is reported, including the validation reference.",
+            'consumes': ['multipart/form-data'],
+            'responses': http_utils.responses_read
+            }
+        },
+    '/nss/batch': {
+        'post': {
+            'summary': 'Onboards many NSs and vNSFs at once',
+            'description': "Onboards all the packages provided, be it as many `package` parts or as `bundle` parts, "
+                           "each a tarball of SHIELD packages. Packages are onboarded concurrently, vNSFs ahead of the "
+                           "NSs, so an NS can be onboarded along with the vNSFs it's made of. The outcome of each "
+                           "package is reported, including the validation reference.",
+            'consumes': ['multipart/form-data'],
+            'responses': http_utils.responses_read
+            }
+        },
+    '/jobs': {
+        'get': {
+            'summary': 'Lists all the onboarding jobs',
+            'description': "Provides a list of the vNSF and NS packages submitted for background onboarding (sending "
+                           "the `Prefer: respond-async` header when onboarding) along with the stage they're at.",
+            'responses': http_utils.responses_read
+            }
+        },
+    '/jobs/{jobsId}': {
+        'get': {
+            'summary': 'Provides the progress of an onboarding job',
+            'description': "Provides the state of the onboarding job. Once `succeeded` the `document` holds the "
+                           "identifier of the vNSF or NS onboarded; once `failed` the `result` holds the reason why "
+                           "the package was not onboarded.",
+            'responses': http_utils.responses_read
+            }
+        },
+    '/changes': {
+        'get': {
+            'summary': 'Follows the changes to the vNSFs and NSs',
+            'description': "Provides the vNSFs and NSs `inserted`, `deleted` or changing `state`, in sequence (`seq`), "
+                           "so the catalogue can be followed rather than polled. Long-polls wait up to `wait` seconds "
+                           "for changes following the resume token (`since`) and reply with the changes and the token "
+                           "to resume from (`_meta.cursor`). Clients accepting `text/event-stream` get the changes as "
+                           "Server-Sent Events instead, resuming through `Last-Event-ID`. With no resume token only "
+                           "the changes from then on are provided. Once the changes following the resume token are no "
+                           "longer kept `410 Gone` is replied and the catalogue must be read again.",
+            'produces': ['application/json', 'text/event-stream'],
+            'responses': http_utils.responses_read
+            }
+        },
+    '/ready': {
+        'get': {
+            'summary': 'Reports whether the Store is ready',
+            'description': "Provides the availability of the datastore and of the vNSF Orchestrator, as seen by the "
+                           "circuit breaker guarding the Orchestrator calls. While the Orchestrator circuit is `open` "
+                           "onboarding and deleting requests are refused with `503 Service Unavailable`.",
+            'responses': http_utils.responses_read
+            }
+        },
+    '/stats': {
+        'get': {
+            'summary': 'Provides the Store caches usage',
+            'description': "Provides the hits, misses, evictions and size of each cache kept by the Store: the vNSF "
+                           "descriptors cache and the responses cache (reading vNSFs, NSs and validations).",
+            'responses': http_utils.responses_read
+            }
         }
     }
@@ -69,3 +69,17 @@ validation = {
     'resource_methods': ['POST', 'GET'],
     'item_methods': ['GET', 'DELETE'],
 }
+
+jobs = {
+    'item_title': 'job',
+    'schema': store_model.job_model,
+    # The worker lease and the package stored while the job is pending are internal to the onboarding workers.
+    'datasource': {
+        'projection': {'lease_owner': 0, 'lease_expires': 0, 'package_file': 0},
+        },
+    'resource_methods': ['GET'],
+    'item_methods': ['GET'],
+    # Jobs progress quickly so there's no point in letting clients cache them.
+    'cache_control': 'no-cache',
+    'cache_expires': 0,
+}
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import logging
+
+from pymongo.errors import PyMongoError
+
+# The indexes each resource relies on, in the Eve 'mongo_indexes' format: {name: [(field, direction)]} or {name:
+# ([(field, direction)], options)}. Unique indexes back the 'unique' schema rules so these don't scan the collection.
+indexes = {
+    'vnsfs': {
+        'vnsf_id_unique': ([('vnsf_id', 1)], {'unique': True}),
+        'vnsf_name':      [('vnsf_name', 1)],
+        'state':          [('state', 1)],
+        'manifest_type':  [('manifest.manifest:vnsf.type', 1)],
+
+        # Searching (see vnsf_search). Capabilities are multikey as these are a list.
+        'capabilities':   [('manifest.manifest:vnsf.properties.capabilities', 1)],
+        'vendor':         [('manifest.manifest:vnsf.properties.vendor', 1)],
+
+        # Paging through a cursor (see cursor_pagination).
+        'updated':        [('_updated', 1), ('_id', 1)],
+        'search':         ([('vnsf_name', 'text'),
+                            ('manifest.manifest:vnsf.properties.capabilities', 'text'),
+                            ('manifest.manifest:vnsf.properties.vendor', 'text'),
+                            ('descriptor.vnfd:vnfd-catalog.vnfd.name', 'text'),
+                            ('descriptor.vnfd:vnfd-catalog.vnfd.short-name', 'text'),
+                            ('descriptor.vnfd:vnfd-catalog.vnfd.description', 'text'),
+                            ('descriptor.vnfd:vnfd-catalog.vnfd.vendor', 'text'),
+                            ('descriptor.vnfd-catalog.vnfd.name', 'text'),
+                            ('descriptor.vnfd-catalog.vnfd.short-name', 'text'),
+                            ('descriptor.vnfd-catalog.vnfd.description', 'text'),
+                            ('descriptor.vnfd-catalog.vnfd.vendor', 'text')],
+                           # Identifiers rather than prose, hence no stemming nor stop words.
+                           {'default_language': 'none',
+                            'weights':          {'vnsf_name':                                       10,
+                                                 'manifest.manifest:vnsf.properties.capabilities': 10,
+                                                 'manifest.manifest:vnsf.properties.vendor':       5}}),
+        },
+
+    'nss': {
+        'ns_id_unique':      ([('ns_id', 1)], {'unique': True}),
+        'ns_name_unique':    ([('ns_name', 1)], {'unique': True}),
+        'state':             [('state', 1)],
+        'constituent_vnsfs': [('constituent_vnsfs', 1)],
+        'updated':           [('_updated', 1), ('_id', 1)],
+        },
+
+    'validation': {
+        'updated': [('_updated', 1), ('_id', 1)],
+
+        # Reusing the validation outcome of the same descriptors.
+        'digest':  [('digest', 1)],
+        },
+
+    # Workers pick the oldest job waiting to be onboarded.
+    'jobs': {
+        'queue': [('state', 1), ('_created', 1)],
+        },
+    }
+
+
+def ensure_indexes(app, logger=None):
+    """
+    Creates the indexes missing and reports the ones which couldn't be created (e.g. duplicates preventing a unique
+    index). Failing to create an index doesn't prevent the Store from running, it only makes it slower.
+
+    :param app: the Eve application.
+    :return: the indexes missing, by resource.
+    """
+
+    logger = logger or logging.getLogger(__name__)
+
+    missing = dict()
+
+    with app.app_context():
+        for resource, resource_indexes in indexes.items():
+            try:
+                collection = app.data.driver.db[app.config['SOURCES'][resource]['source']]
+                existing = collection.index_information()
+            except PyMongoError as e:
+                logger.error("Can not check the '%s' indexes: %s", resource, e)
+                missing[resource] = sorted(resource_indexes)
+                continue
+
+            for name, value in resource_indexes.items():
+                keys, options = value if isinstance(value, tuple) else (value, {})
+
+                # Creating an existing index is a no-op, unless its definition changed in which case it fails.
+                try:
+                    collection.create_index(keys, name=name, **options)
+                    if name not in existing:
+                        logger.info("Index '%s' created for '%s'", name, resource)
+                except PyMongoError as e:
+                    logger.error("Index '%s' missing for '%s': %s", name, resource, e)
+                    missing.setdefault(resource, []).append(name)
+
+    if missing:
+        logger.warning('Indexes missing: %s', missing)
+    else:
+        logger.info('All indexes in place')
+
+    return missing
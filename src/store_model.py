@@ -184,8 +184,11 @@ vnsf_model = {
             }
         },
 
-    # Actual vNSF Descriptor.
-    'descriptor':       {'type': 'string', 'required': True},
+    # Actual vNSF Descriptor, stored as a sub-document so its fields can be queried.
+    'descriptor':       {'type': 'dict', 'required': True},
+
+    # vNSF Descriptor canonical JSON string (sorted keys, no whitespace), if enabled.
+    'descriptor_json':  {'type': 'string'},
 
     # Actual manifest binary.
     'manifest_file':    {'type': 'media'},
@@ -301,8 +304,11 @@ ns_model = {
             }
         },
 
-    # Actual NS Descriptor.
-    'descriptor':        {'type': 'string', 'required': True},
+    # Actual NS Descriptor, stored as a sub-document so its fields can be queried.
+    'descriptor':        {'type': 'dict', 'required': True},
+
+    # NS Descriptor canonical JSON string (sorted keys, no whitespace), if enabled.
+    'descriptor_json':   {'type': 'string'},
 
     # Actual manifest binary.
     'manifest_file':     {'type': 'media'},
@@ -352,6 +358,49 @@ validation_model = {
         'type':     'string',
         'empty':    True,
         'required': True,
-        }
+        },
+
+    # The descriptors validated (normalised), validator version and validation profile digest. Validations with the
+    # same digest have the same outcome, hence the outcome is reused rather than validating the descriptors again.
+    'digest':   {
+        'type':     'string',
+        'empty':    False,
+        },
+
+    }
+
+job_model = {
+
+    # The resource the package is onboarded to, either 'vnsfs' or 'nss'.
+    'resource':    {
+        'type':     'string',
+        'readonly': True,
+        'allowed':  ["vnsfs", "nss"],
+        },
+
+    # Where the job stands.
+    'state':       {
+        'type':     'string',
+        'readonly': True,
+        'allowed':  ["queued", "running", "succeeded", "failed"],
+        },
+
+    # The onboarding step in progress: waiting for a worker, fetching the package from the database, onboarding it
+    # (validation, Orchestrator and storage) or over.
+    'stage':       {
+        'type':     'string',
+        'readonly': True,
+        'allowed':  ["queued", "spooling", "onboarding", "done"],
+        },
+
+    # The name of the package file submitted.
+    'package_filename': {'type': 'string', 'readonly': True},
+
+    # Times the job was picked up by a worker.
+    'attempts':    {'type': 'integer', 'readonly': True},
 
+    # Outcome of the onboarding: the HTTP status code, the response data and the identifier of the document stored.
+    'status_code': {'type': 'integer', 'readonly': True},
+    'result':      {'type': 'dict', 'readonly': True},
+    'document':    {'type': 'string', 'readonly': True},
     }
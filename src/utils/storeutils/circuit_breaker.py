@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import logging
+import threading
+import time
+
+# Breaker states.
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker(object):
+    """
+    Keeps track of the failures talking to a remote service so callers can fail fast while the service is down instead
+    of doing (heavy) work which is bound to fail.
+
+    The circuit opens after a number of consecutive failures. Once open, calls are refused until the reset timeout
+    elapses; then calls are let through again (half-open) and the first outcome either closes the circuit or opens it
+    again.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30, logger=None):
+        """
+        :param name: the name of the service, for logging purposes.
+        :param failure_threshold: the number of consecutive failures which open the circuit.
+        :param reset_timeout: the time (in seconds) the circuit stays open before letting calls through again.
+        """
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._changed_at = time.time()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def retry_after(self):
+        """
+        :return: the time (in seconds) until a call may go through again. 0 when calls may go through.
+        """
+
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0
+
+            return max(0, int(round(self._opened_at + self.reset_timeout - time.time())))
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self.logger.info("Circuit for '%s' closed", self.name)
+                self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            state = self._current_state()
+
+            if state == HALF_OPEN or (state == CLOSED and self._failures >= self.failure_threshold):
+                self.logger.warning("Circuit for '%s' opened after %d failures", self.name, self._failures)
+                self._opened_at = time.time()
+                self._set_state(OPEN)
+
+            elif state == OPEN:
+                # Keep it open for another reset period.
+                self._opened_at = time.time()
+
+    def snapshot(self):
+        """
+        :return: the breaker details, for reporting purposes.
+        """
+
+        with self._lock:
+            return {
+                'name':     self.name,
+                'state':    self._current_state(),
+                'failures': self._failures,
+                'since':    time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(self._changed_at)),
+                }
+
+    def _current_state(self):
+        if self._state == OPEN and time.time() >= self._opened_at + self.reset_timeout:
+            self._set_state(HALF_OPEN)
+
+        return self._state
+
+    def _set_state(self, state):
+        self._state = state
+        self._changed_at = time.time()
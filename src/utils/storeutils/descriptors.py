@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import ast
+import json
+
+from . import yaml_utils
+from .lru_cache import LruCache
+
+# Descriptors serialized to YAML, by stored document '_id' and versioned by the document ETag. The process-wide cache
+# spares re-serializing the same (vNSF) descriptor for every NS using it. Bounded to 64MB of YAML (UTF-8 encoded) by
+# default.
+cache = LruCache(64 * 1024 * 1024, sizeof=lambda descriptor_yaml: len(descriptor_yaml.encode('utf-8')))
+
+
+def canonical_json(descriptor):
+    """
+    Serializes a descriptor into its canonical JSON form (sorted keys, no whitespace) so equal descriptors always
+    produce the same string.
+
+    :param descriptor: the (parsed) descriptor.
+    :return: the descriptor canonical JSON string.
+    """
+
+    return json.dumps(descriptor, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def parse(descriptor):
+    """
+    Provides a stored descriptor as a dictionary. Descriptors used to be stored as the string representation of the
+    parsed YAML, hence those are converted as well.
+
+    :param descriptor: the stored descriptor.
+    :return: the descriptor dictionary.
+    """
+
+    if not isinstance(descriptor, str):
+        return descriptor
+
+    try:
+        return ast.literal_eval(descriptor)
+    except (ValueError, SyntaxError):
+        return yaml_utils.load(descriptor)
+
+
+def to_yaml(document_id, version, descriptor):
+    """
+    Serializes a stored descriptor into YAML, going through the descriptors cache.
+
+    :param document_id: the '_id' of the document holding the descriptor.
+    :param version: the document version, e.g. its ETag.
+    :param descriptor: the stored descriptor.
+    :return: the descriptor YAML.
+    """
+
+    descriptor_yaml = cache.get(document_id, version)
+    if descriptor_yaml is None:
+        descriptor_yaml = yaml_utils.dump(parse(descriptor))
+        cache.put(document_id, descriptor_yaml, version)
+
+    return descriptor_yaml
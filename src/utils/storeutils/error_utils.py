@@ -82,9 +82,9 @@ class IssueHandling(object):
         else:
             self.logger.log(level.value[0], error_data[level.name][0])
 
-    def raise_ex(self, level, error_data, params=None):
+    def raise_ex(self, level, error_data, params=None, message=None):
         self.log(level, error_data, params)
-        raise type(error_data[IssueElement.EXCEPTION.name])(str(error_data[IssueElement.EXCEPTION.name]))
+        raise type(error_data[IssueElement.EXCEPTION.name])(message or str(error_data[IssueElement.EXCEPTION.name]))
 
     def build_ex(self, level, error_data, params=None, message=None):
         self.log(level, error_data, params)
@@ -94,14 +94,19 @@ def tailor_response(initial, changes, remove):
 HTTP_200_OK = 200
 HTTP_201_CREATED = 201
 HTTP_202_ACCEPTED = 202
+HTTP_206_PARTIAL_CONTENT = 206
+HTTP_304_NOT_MODIFIED = 304
 HTTP_400_BAD_REQUEST = 400
 HTTP_401_UNAUTHORIZED = 401
 HTTP_404_NOT_FOUND = 404
 HTTP_406_NOT_ACCEPTABLE = 406
+HTTP_410_GONE = 410
 HTTP_412_PRECONDITION_FAILED = 412
+HTTP_416_RANGE_NOT_SATISFIABLE = 416
 HTTP_500_SERVER_ERROR = 500
 HTTP_501_NOT_IMPLEMENTED = 501
 HTTP_502_BAD_GATEWAY = 502
+HTTP_503_SERVICE_UNAVAILABLE = 503
 HTTP_504_TIMEOUT = 504
 
 responses_full = {
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import base64
+import binascii
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from .error_utils import ExceptionMessage
+
+# Files are hashed in large chunks so multi-GB packages don't hold much memory nor spend time in tiny reads.
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# Largest number of files hashed simultaneously.
+MAX_WORKERS = 4
+
+
+class HashAlgorithmNotSupported(ExceptionMessage):
+    """Hashing algorithm not available."""
+
+
+def hashlib_name(algorithm):
+    """
+    Converts the hashing algorithm name used by the SHIELD manifest (e.g. 'SHA_256') into the hashlib one.
+
+    :param algorithm: the hashing algorithm name.
+
+    :return: the hashlib algorithm name.
+    :raise: HashAlgorithmNotSupported: When the algorithm is not available.
+    """
+
+    # E.g. 'SHA_256' is 'sha256' whereas 'SHA3_256' and 'SHA512_256' keep the underscore.
+    name = str(algorithm).lower().replace('-', '_')
+    for candidate in (name, name.replace('sha_', 'sha', 1)):
+        if candidate in hashlib.algorithms_available:
+            return candidate
+
+    raise HashAlgorithmNotSupported("Hashing algorithm '{}' not supported".format(algorithm))
+
+
+def file_digest(file_path, algorithm, chunk_size=CHUNK_SIZE):
+    """
+    Hashes a file incrementally so its contents never need to be fully loaded into memory.
+
+    :param file_path: the file system path to the file to hash.
+    :param algorithm: the hashing algorithm name, either the SHIELD manifest or the hashlib one.
+    :param chunk_size: the size (in bytes) of each read.
+
+    :return: the file digest.
+    """
+
+    digest = hashlib.new(hashlib_name(algorithm))
+
+    with open(file_path, 'rb') as stream:
+        for chunk in iter(lambda: stream.read(chunk_size), b''):
+            digest.update(chunk)
+
+    return digest.digest()
+
+
+def digest_matches(digest, expected):
+    """
+    Compares a digest with the one expected. The expected digest may either be hex or base64-encoded.
+
+    :param digest: the digest computed.
+    :param expected: the encoded digest expected.
+
+    :return: whether the digests match.
+    """
+
+    expected = str(expected).strip()
+
+    if expected.lower() == binascii.hexlify(digest).decode():
+        return True
+
+    try:
+        return base64.b64decode(expected, validate=True) == digest
+    except (binascii.Error, ValueError):
+        return False
+
+
+def verify_files(expected_digests, algorithm, max_workers=MAX_WORKERS):
+    """
+    Hashes files and compares them with the digests expected. Independent files are hashed in parallel as hashlib
+    releases the GIL while digesting large chunks.
+
+    :param expected_digests: the encoded digest expected for each file, keyed by the file system path to the file.
+    :param algorithm: the hashing algorithm name, either the SHIELD manifest or the hashlib one.
+    :param max_workers: the largest number of files hashed simultaneously.
+
+    :return: the files whose digest doesn't match, keyed by file system path and holding the (expected,
+    computed hex) digests.
+    :raise: HashAlgorithmNotSupported: When the algorithm is not available.
+    """
+
+    algorithm = hashlib_name(algorithm)
+    paths = list(expected_digests.keys())
+
+    if len(paths) == 0:
+        return dict()
+
+    with ThreadPoolExecutor(max_workers=min(len(paths), max_workers)) as executor:
+        digests = executor.map(lambda path: file_digest(path, algorithm), paths)
+
+        mismatches = dict()
+        for path, digest in zip(paths, digests):
+            if not digest_matches(digest, expected_digests[path]):
+                mismatches[path] = (expected_digests[path], binascii.hexlify(digest).decode())
+
+    return mismatches
@@ -28,7 +28,8 @@
 import logging.config
 
 import os
-import yaml
+
+from . import yaml_utils
 
 
 def setup_logging(config_file='logging.yaml', default_level=logging.INFO, env_key='LOG_CFG'):
@@ -45,7 +46,7 @@ def setup_logging(config_file='logging.yaml', default_level=logging.INFO, env_ke
 
     if os.path.exists(path):
         with open(path, 'rt') as f:
-            config = yaml.safe_load(f.read())
+            config = yaml_utils.load(f)
         logging.config.dictConfig(config)
     else:
         logging.basicConfig(level=default_level)
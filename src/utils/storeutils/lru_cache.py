@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LruCache(object):
+    """
+    Thread-safe, size-bounded, least-recently-used cache.
+
+    Each entry carries a version (e.g. the document ETag) so a stale entry is never provided: looking up a key with a
+    version other than the cached one is a miss. Entries may also be bounded in age, past which they're a miss too.
+    """
+
+    def __init__(self, max_size, sizeof=len, max_age=None):
+        """
+        :param max_size: the largest total size of the values cached. Nothing is cached when 0.
+        :param sizeof: the function providing the size of a value.
+        :param max_age: the time (in seconds) an entry is provided for. Unbounded when None.
+        """
+
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key, version=None):
+        """
+        :param key: the entry key.
+        :param version: the entry version.
+        :return: the cached value or None if there's no such entry (with the version provided).
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.max_age is not None and time.monotonic() - entry[3] > self.max_age:
+                self._remove(key)
+                entry = None
+
+            if entry is None or entry[0] != version:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+            return entry[1]
+
+    def put(self, key, value, version=None):
+        """
+        Caches a value, replacing any other version of it, and evicts the least recently used entries while the cache
+        is over its size. Values larger than the cache itself are not cached.
+
+        :param key: the entry key.
+        :param value: the value to cache.
+        :param version: the entry version.
+        """
+
+        size = self.sizeof(value)
+
+        with self._lock:
+            self._remove(key)
+
+            if size > self.max_size:
+                return
+
+            self._entries[key] = (version, value, size, time.monotonic())
+            self._size += size
+
+            while self._size > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """
+        :return: the cache usage figures.
+        """
+
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries':   len(self._entries),
+                'size':      self._size,
+                'max_size':  self.max_size,
+                'hits':      self._hits,
+                'misses':    self._misses,
+                'hit_rate':  round(self._hits / lookups, 4) if lookups else 0,
+                'evictions': self._evictions,
+                }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[2]
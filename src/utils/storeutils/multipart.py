@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import os
+import uuid
+
+# Packages are sent in fixed-size chunks so the memory held while uploading doesn't grow with the package size.
+CHUNK_SIZE = 64 * 1024
+
+
+def quote_param(value):
+    """
+    Quotes a header parameter value (e.g. a file name), escaping backslashes and double quotes. Line breaks are
+    dropped as these would end the header.
+
+    :param value: the parameter value.
+    :return: the quoted value.
+    """
+
+    value = value.replace('\r', '').replace('\n', '')
+
+    return '"{}"'.format(value.replace('\\', '\\\\').replace('"', '\\"'))
+
+
+class MultipartFileEncoder(object):
+    """
+    Streams a file as a 'multipart/form-data' body. Being an iterable the requests library sends it reading the file
+    one chunk at a time instead of building the whole body in memory. As its length is known up front, the body is
+    sent with a 'Content-Length' rather than chunked, so the session timeouts and retries apply as for any other call.
+
+    The file is closed once the body is sent or, at the latest, when leaving the 'with' block.
+    """
+
+    def __init__(self, field_name, file_path, filename=None, content_type='application/octet-stream',
+                 chunk_size=CHUNK_SIZE):
+        """
+        :param field_name: the form field name for the file.
+        :param file_path: the file system path of the file to send.
+        :param filename: the file name to report. Defaults to the file base name.
+        :param content_type: the file content type.
+        :param chunk_size: the size (in bytes) of the chunks read from the file.
+        """
+
+        self.field_name = field_name
+        self.filename = filename or os.path.basename(file_path)
+        self.file_content_type = content_type
+        self.chunk_size = chunk_size
+        self.boundary = uuid.uuid4().hex
+
+        self._file = open(file_path, 'rb')
+
+        self._head = ('--{}\r\n'
+                      'Content-Disposition: form-data; name={}; filename={}\r\n'
+                      'Content-Type: {}\r\n'
+                      '\r\n').format(self.boundary, quote_param(self.field_name), quote_param(self.filename),
+                                     self.file_content_type).encode('utf-8')
+        self._tail = '\r\n--{}--\r\n'.format(self.boundary).encode('utf-8')
+        self._length = len(self._head) + os.fstat(self._file.fileno()).st_size + len(self._tail)
+
+    @property
+    def content_type(self):
+        """
+        :return: the body content type, to send as the 'Content-Type' header.
+        """
+
+        return 'multipart/form-data; boundary={}'.format(self.boundary)
+
+    def __len__(self):
+        """
+        :return: the exact size (in bytes) of the body, to send as the 'Content-Length' header.
+        """
+
+        return self._length
+
+    def __iter__(self):
+        yield self._head
+
+        try:
+            while True:
+                chunk = self._file.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            self.close()
+
+        yield self._tail
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+"""
+Validates what a Network Service adds on top of its (already validated) vNSFs: the virtual links between the vNSFs
+connection points and the forwarding graphs through them. The vNSFs themselves aren't validated again, so this takes
+as long as the Network Service is big rather than as its vNSFs are.
+"""
+
+ERROR = 'error'
+WARNING = 'warning'
+
+
+def _unprefixed(data):
+    """
+    Strips the namespace prefix off the keys (e.g. 'nsd:vnfd-id-ref' is 'vnfd-id-ref'), as descriptors may or may not
+    qualify these.
+
+    :param data: the descriptor data.
+    :return: the descriptor data with unqualified keys.
+    """
+
+    if isinstance(data, dict):
+        return {(key.rsplit(':', 1)[-1] if isinstance(key, str) else key): _unprefixed(value)
+                for key, value in data.items()}
+
+    if isinstance(data, list):
+        return [_unprefixed(item) for item in data]
+
+    return data
+
+
+def validate(nsd, vnfds):
+    """
+    Validates the Network Service links and forwarding graphs.
+
+    :param nsd: the Network Service descriptor (the 'nsd' entry).
+    :param vnfds: the descriptors (the 'vnfd' entry) of the constituent vNSFs, by vNSF ID.
+    :return: the validation outcome ('result', 'topology', 'fwgraph' and 'log'), as the descriptors validator provides.
+    """
+
+    nsd = _unprefixed(nsd)
+    vnfds = {vnsf_id: _unprefixed(vnfd) for vnsf_id, vnfd in vnfds.items()}
+
+    issues = list()
+
+    def issue(level, message, *args):
+        issues.append({'level': level, 'message': message.format(*args)})
+
+    # The constituent vNSFs by member index, along with their connection points.
+    members = dict()
+    for constituent in nsd.get('constituent-vnfd', []):
+        index = str(constituent.get('member-vnf-index'))
+        if index in members:
+            issue(ERROR, "Member index '{}' is used by more than one constituent vNSF", index)
+        members[index] = constituent.get('vnfd-id-ref')
+
+    connection_points = {vnsf_id: {cp.get('name') for cp in vnfd.get('connection-point', [])}
+                         for vnsf_id, vnfd in vnfds.items()}
+
+    def check_reference(where, ref, cp_fields=('vnfd-connection-point-ref',)):
+        """
+        Checks a reference to a constituent vNSF (and to its connection points).
+
+        :return: the member index referred to or None if there's no such member.
+        """
+
+        index = str(ref.get('member-vnf-index-ref'))
+        if index not in members:
+            issue(ERROR, "{} refers to member index '{}' which isn't a constituent vNSF", where, index)
+            return None
+
+        vnsf_id = members[index]
+        if 'vnfd-id-ref' in ref and ref['vnfd-id-ref'] != vnsf_id:
+            issue(ERROR, "{} refers to vNSF '{}' as member index '{}', which is vNSF '{}'", where, ref['vnfd-id-ref'],
+                  index, vnsf_id)
+
+        for cp_field in cp_fields:
+            cp = ref.get(cp_field)
+            if cp is not None and cp not in connection_points.get(vnsf_id, ()):
+                issue(ERROR, "{} refers to connection point '{}' which vNSF '{}' doesn't have", where, cp, vnsf_id)
+
+        return index
+
+    # Virtual links.
+    links = list()
+    linked = set()
+    for vld in nsd.get('vld', []):
+        where = "Virtual link '{}'".format(vld.get('id'))
+
+        ends = list()
+        for ref in vld.get('vnfd-connection-point-ref', []):
+            index = check_reference(where, ref)
+            if index is not None:
+                ends.append({'member-vnf-index': index, 'connection-point': ref.get('vnfd-connection-point-ref')})
+                linked.add((index, ref.get('vnfd-connection-point-ref')))
+
+        if not ends:
+            issue(WARNING, '{} connects no vNSF', where)
+
+        links.append({'id': vld.get('id'), 'type': vld.get('type'), 'ends': ends})
+
+    for index, vnsf_id in sorted(members.items()):
+        for cp in sorted(connection_points.get(vnsf_id, ()), key=str):
+            if (index, cp) not in linked:
+                issue(WARNING, "Connection point '{}' of member index '{}' ('{}') isn't linked", cp, index, vnsf_id)
+
+    # Forwarding graphs: the paths (rendered service paths) through the vNSFs and the traffic classified into these.
+    fwgraph = dict()
+    for vnffgd in nsd.get('vnffgd', []):
+        paths = dict()
+        for rsp in vnffgd.get('rsp', []):
+            where = "Forwarding path '{}'".format(rsp.get('id'))
+
+            hops = list()
+            for ref in sorted(rsp.get('vnfd-connection-point-ref', []), key=lambda hop: hop.get('order', 0)):
+                index = check_reference(where, ref, ('vnfd-ingress-connection-point-ref',
+                                                     'vnfd-egress-connection-point-ref'))
+                if index is not None:
+                    hops.append(index)
+
+            if not hops:
+                issue(ERROR, '{} goes through no vNSF', where)
+
+            paths[str(rsp.get('id'))] = hops
+
+        for classifier in vnffgd.get('classifier', []):
+            where = "Classifier '{}'".format(classifier.get('id'))
+            check_reference(where, classifier)
+
+            if str(classifier.get('rsp-id-ref')) not in paths:
+                issue(ERROR, "{} refers to forwarding path '{}' which isn't defined", where,
+                      classifier.get('rsp-id-ref'))
+
+        fwgraph[str(vnffgd.get('id'))] = paths
+
+    errors = sum(1 for i in issues if i['level'] == ERROR)
+    warnings = len(issues) - errors
+
+    return {
+        'result':   {'error_count': errors, 'warning_count': warnings, 'issues': issues},
+        'topology': {'vnfs':  [{'member-vnf-index': index, 'vnsf_id': vnsf_id}
+                               for index, vnsf_id in sorted(members.items())],
+                     'links': links},
+        'fwgraph':  fwgraph,
+        'log':      "Network Service '{}' links validated: {} errors, {} warnings".format(nsd.get('id'), errors,
+                                                                                       warnings),
+        }
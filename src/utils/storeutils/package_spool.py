@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import hashlib
+import os
+import tarfile
+import zlib
+
+from flask import Request
+from tempfile import NamedTemporaryFile
+from werkzeug.utils import cached_property
+
+# Magic number identifying a gzip stream.
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class PackageSpool(object):
+    """
+    Disk spool for an uploaded package. The multipart body is written once to its final location and, while the bytes
+    arrive, the package digest is computed and the .tar.gz sanity checks are performed. This spares the callers from
+    re-reading the package just to find out whether it is usable.
+
+    The spool file is removed once the spool is closed.
+    """
+
+    def __init__(self, spool_folder=None, digest_algorithm='sha256'):
+        self._file = NamedTemporaryFile(mode='w+b', prefix='store-', suffix='.pkg', dir=spool_folder, delete=False)
+        self.name = self._file.name
+        self.size = 0
+
+        self._digest = hashlib.new(digest_algorithm)
+
+        # Only the first tar header is decompressed, enough to tell whether it's a .tar.gz without inflating it all.
+        self._gzip_stream = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        self._gzip_head = b''
+        self._tar_header = b''
+        self._tar_gz = None
+
+    def write(self, data):
+        self._digest.update(data)
+        self.size += len(data)
+
+        if self._tar_gz is None:
+            self._inspect(data)
+
+        return self._file.write(data)
+
+    def read(self, *args):
+        return self._file.read(*args)
+
+    def readline(self, *args):
+        return self._file.readline(*args)
+
+    def seek(self, *args):
+        return self._file.seek(*args)
+
+    def tell(self):
+        return self._file.tell()
+
+    def flush(self):
+        return self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+        if os.path.isfile(self.name):
+            os.remove(self.name)
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def __iter__(self):
+        return iter(self._file)
+
+    def hexdigest(self):
+        """
+        :return: the digest of the bytes spooled so far.
+        """
+        return self._digest.hexdigest()
+
+    def is_tar_gz(self):
+        """
+        Tells whether the spooled data is an actual .tar.gz file and can be used as such. It is the streaming
+        equivalent of tar_package.is_tar_gz_file().
+
+        :return: whether it is a .tar.gz.
+        """
+        self._file.flush()
+
+        return bool(self._tar_gz)
+
+    def _inspect(self, data):
+        """
+        Checks the package format as its bytes arrive. Once the first tar header is available the verdict is set and
+        no further inspection takes place.
+
+        :param data: the package chunk just received.
+        """
+
+        if len(self._gzip_head) < len(GZIP_MAGIC):
+            self._gzip_head += data[:len(GZIP_MAGIC) - len(self._gzip_head)]
+            if not GZIP_MAGIC.startswith(self._gzip_head):
+                self._tar_gz = False
+                return
+
+        try:
+            self._tar_header += self._gzip_stream.decompress(data, tarfile.BLOCKSIZE - len(self._tar_header))
+        except zlib.error:
+            self._tar_gz = False
+            return
+
+        if len(self._tar_header) < tarfile.BLOCKSIZE:
+            return
+
+        try:
+            tarfile.TarInfo.frombuf(self._tar_header, tarfile.ENCODING, 'surrogateescape')
+            self._tar_gz = True
+        except tarfile.HeaderError:
+            self._tar_gz = False
+
+        # Release the decompressor as it's no longer needed.
+        self._gzip_stream = None
+
+
+class SpoolingRequest(Request):
+    """
+    Request which spools uploaded files straight into a PackageSpool instead of the werkzeug default temporary file.
+
+    The spools are removed once the request is over (Flask closes the request on teardown) whatever the way out, even
+    if these were taken out of the request files.
+    """
+
+    spool_folder = None
+    digest_algorithm = 'sha256'
+
+    @cached_property
+    def spools(self):
+        """
+        :return: the spools created for the request uploaded files.
+        """
+        return []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        spool = PackageSpool(self.spool_folder, self.digest_algorithm)
+        self.spools.append(spool)
+
+        return spool
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            for spool in self.__dict__.get('spools', ()):
+                spool.close()
+
+
+def spooling_request(spool_folder=None, digest_algorithm='sha256'):
+    """
+    Builds the request class to use for spooling uploaded packages.
+
+    :param spool_folder: the file system folder where to spool packages to. Defaults to the system temporary folder.
+    :param digest_algorithm: the hashlib algorithm used to digest the packages.
+
+    :return: the request class to assign to the Flask application.
+    """
+
+    return type('SpoolingRequest', (SpoolingRequest,), {
+        'spool_folder':     spool_folder,
+        'digest_algorithm': digest_algorithm
+        })
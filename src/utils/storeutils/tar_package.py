@@ -27,12 +27,100 @@
 
 import os
 import tarfile
+from shutil import copyfileobj
 
+from .error_utils import ExceptionMessage
 
-def extract_package(tar_gz_file_path, extract_path):
-    package = tarfile.open(tar_gz_file_path)
-    package.extractall(extract_path)
-    package.close()
+# Buffer size used when copying members to disk.
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class PackageUnsafeMember(ExceptionMessage):
+    """Package member can not be safely extracted."""
+
+
+def extract_package(tar_gz_file_path, extract_path, members=None, max_member_size=None):
+    """
+    Extracts a .tar.gz file.
+
+    By default the whole package is extracted. When the members to extract are provided only those are written to
+    disk and everything else in the package is skipped. In this selective mode the members are checked so they can't
+    be placed outside the extraction folder, must be regular files and can't exceed the maximum size allowed.
+
+    :param tar_gz_file_path: the file system path to where the .tar.gz file is.
+    :param extract_path: the file system path where to extract the package to.
+    :param members: (optional) the paths of the members (within the package) to extract.
+    :param max_member_size: (optional) the maximum size (in bytes) allowed for each member extracted selectively.
+
+    :return: the paths of the members extracted when extracting selectively.
+    :raise: PackageUnsafeMember: When a member to extract selectively isn't safe to write to disk.
+    """
+
+    if members is None:
+        package = tarfile.open(tar_gz_file_path)
+        package.extractall(extract_path)
+        package.close()
+        return None
+
+    wanted = set()
+    for name in members:
+        wanted.add(_safe_member_name(name))
+
+    extracted = list()
+    with tarfile.open(tar_gz_file_path, 'r|gz') as package:
+        for member in package:
+            name = os.path.normpath(member.name)
+            if name not in wanted or name in extracted:
+                continue
+
+            if not member.isfile():
+                raise PackageUnsafeMember("Member '{}' is not a regular file".format(member.name))
+
+            if max_member_size is not None and member.size > max_member_size:
+                raise PackageUnsafeMember("Member '{}' exceeds the maximum size allowed ({} > {} bytes)".format(
+                        member.name, member.size, max_member_size))
+
+            member_path = os.path.join(extract_path, name)
+            os.makedirs(os.path.dirname(member_path), exist_ok=True)
+
+            with package.extractfile(member) as src, open(member_path, 'wb') as dst:
+                copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+            extracted.append(name)
+            if len(extracted) == len(wanted):
+                break
+
+    return extracted
+
+
+def list_members(tar_gz_file_path):
+    """
+    Lists the members of a .tar.gz file without extracting it.
+
+    :param tar_gz_file_path: the file system path to where the .tar.gz file is.
+
+    :return: the paths of the package members.
+    """
+
+    with tarfile.open(tar_gz_file_path, 'r|gz') as package:
+        return [member.name for member in package]
+
+
+def _safe_member_name(member_name):
+    """
+    Ensures a member path stays within the package once extracted.
+
+    :param member_name: the path of the member within the package.
+
+    :return: the normalised member path.
+    :raise: PackageUnsafeMember: When the path points outside the package.
+    """
+
+    name = os.path.normpath(member_name)
+    if os.path.isabs(name) or name == os.pardir or name.startswith(os.pardir + os.sep):
+        raise PackageUnsafeMember("Member '{}' points outside the package".format(member_name))
+
+    return name
 
 
 def is_tar_gz_file(file_path):
@@ -60,6 +148,49 @@ def is_tar_gz_file(file_path):
     return True
 
 
+def read_member(tar_gz_file_path, member_name):
+    """
+    Reads a single member from a .tar.gz file without extracting the package. The package is decompressed as a stream
+    and only up to the member in question so nothing gets written to disk.
+
+    :param tar_gz_file_path: the file system path to where the .tar.gz file is.
+    :param member_name: the path of the member (within the package) to read.
+
+    :return: the member contents or None if the package doesn't hold such a member.
+    :raise: tarfile.TarError: When the file is not a valid .tar.gz file.
+    """
+
+    member_name = os.path.normpath(member_name)
+
+    with tarfile.open(tar_gz_file_path, 'r|gz') as package:
+        for member in package:
+            if member.isfile() and os.path.normpath(member.name) == member_name:
+                return package.extractfile(member).read()
+
+    return None
+
+
+def has_folder(tar_gz_file_path, folder_name):
+    """
+    Checks whether a .tar.gz file holds a given folder.
+
+    :param tar_gz_file_path: the file system path to where the .tar.gz file is.
+    :param folder_name: the path of the folder (within the package) to look for.
+
+    :return: whether the folder is present in the package.
+    """
+
+    folder_name = os.path.normpath(folder_name)
+
+    with tarfile.open(tar_gz_file_path, 'r|gz') as package:
+        for member in package:
+            name = os.path.normpath(member.name)
+            if name == folder_name or name.startswith(folder_name + os.sep):
+                return True
+
+    return False
+
+
 def get_tar_gz_basename(file_path):
     """
     Extracts the .tar.gz file name from a file path. It assumes the file path ends with '.tar.gz' and doesn't enforce
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import hashlib
+import importlib
+import logging
+import os
+import resource
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import pkg_resources
+
+from . import descriptors
+
+# The validator format for each descriptor data format. Other formats are validated as the latest one.
+VALIDATION_FORMATS = {'OSM-R2': 'osm-r2', 'OSM-R4': 'osm-r4'}
+DEFAULT_VALIDATION_FORMAT = 'osm-r4'
+
+# Validation level: syntax, integrity and topology.
+VALIDATION_LEVEL = 'sit'
+
+# Validation level checking the syntax alone.
+SYNTAX_LEVEL = 's'
+
+# The validator module, imported before forking the workers so these inherit it rather than each importing it.
+_validator = None
+
+
+def _pid():
+    return os.getpid()
+
+
+def _validate(function_name, cpu_limit, *args, **kwargs):
+    """
+    Runs a validation within a worker process, bounding the CPU time it can take. Past the limit the worker gets killed
+    (SIGXCPU).
+
+    :param function_name: the validator function to run.
+    :param cpu_limit: the CPU time (in seconds) the validation can take. Unbounded when None.
+    :return: the validator outcome.
+    """
+
+    if cpu_limit:
+        # The limit applies to the whole process lifetime, hence it's set from the CPU time used so far.
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = int(usage.ru_utime + usage.ru_stime) + cpu_limit
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+    return getattr(_validator, function_name)(*args, **kwargs)
+
+
+class AbortedValidation(dict):
+    """
+    The validation outcome for a descriptor which couldn't be validated (e.g. taking too long). Deemed invalid, though
+    it's not the descriptor outcome so it's not to be reused.
+    """
+
+
+def failed_validation(message):
+    """
+    :param message: the reason the validation failed.
+    :return: the validation outcome for a descriptor which couldn't be validated.
+    """
+
+    return AbortedValidation({
+        'result':   {'error_count': 1, 'warning_count': 0, 'issues': [{'level': 'error', 'message': message}]},
+        'topology': {},
+        'fwgraph':  {},
+        'log':      message,
+        })
+
+
+class ValidationEngine(object):
+    """
+    Validates the vNSF and NS descriptors (with NSFVal by default) in a pool of worker processes, so CPU-heavy
+    topology checks don't hold up the API threads. Each validation is bounded in time and in CPU time; when over, the
+    workers are replaced and the descriptor deemed invalid.
+
+    The workers are forked when the engine starts, inheriting the validator imported by then, along with a spare set
+    of workers to replace these. Forking from a process running other threads may leave the workers with locks held by
+    those threads, so workers are only forked later on if the spare ones were already used.
+    """
+
+    def __init__(self, validator='nsfval', workers=2, timeout=60, cpu_limit=None, logger=None):
+        """
+        :param validator: the name of the validator module, providing 'validate_vnf' and 'validate_ns' as NSFVal does.
+        :param workers: the number of worker processes.
+        :param timeout: the time (in seconds) to wait for a validation.
+        :param cpu_limit: the CPU time (in seconds) a validation can take. Unbounded when None.
+        """
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.validator = validator
+        self.workers = workers
+        self.timeout = timeout
+        self.cpu_limit = cpu_limit
+
+        self.version = None
+
+        self._lock = threading.Lock()
+        self._pool = None
+        self._spare_pool = None
+
+    @property
+    def enabled(self):
+        return self._pool is not None
+
+    def start(self):
+        """
+        Imports the validator and forks the worker processes. Should be done before any other thread is started.
+        Descriptors aren't validated if the validator can't be imported.
+        """
+
+        global _validator
+
+        if self._pool is not None:
+            return
+
+        try:
+            _validator = importlib.import_module(self.validator)
+        except ImportError as e:
+            self.logger.error("Descriptors won't be validated. Validator '%s' not available: %s", self.validator, e)
+            return
+
+        self.version = self._validator_version(_validator)
+        self._pool = self._new_pool()
+        self._spare_pool = self._new_pool()
+
+        self.logger.info("Validating descriptors with '%s' %s in %d worker processes", self.validator, self.version,
+                         self.workers)
+
+    def stop(self):
+        with self._lock:
+            for pool in (self._pool, self._spare_pool):
+                if pool is not None:
+                    pool.shutdown(wait=False)
+            self._pool = self._spare_pool = None
+
+    def digest(self, data_format, *validated):
+        """
+        Provides the key the validation outcome of some descriptors is kept by: the digest of the descriptors
+        (normalised), the validator version and the validation profile. Descriptors with the same digest are bound to
+        have the same validation outcome.
+
+        :param data_format: the descriptors data format, e.g. 'OSM-R4'.
+        :param validated: the (parsed) descriptors validated together, or what identifies these (e.g. their
+        version), in a stable order.
+        :return: the digest (hex).
+        """
+
+        digest = hashlib.sha256()
+        for part in (self.validator, self.version, VALIDATION_FORMATS.get(data_format, DEFAULT_VALIDATION_FORMAT),
+                     VALIDATION_LEVEL):
+            digest.update('{}\0'.format(part).encode('utf-8'))
+        for descriptor in validated:
+            digest.update(descriptors.canonical_json(descriptor).encode('utf-8'))
+            digest.update(b'\0')
+
+        return digest.hexdigest()
+
+    def validate_vnf(self, data_format, vnfd_path):
+        """
+        Validates a vNSF descriptor.
+
+        :param data_format: the descriptor data format, e.g. 'OSM-R4'.
+        :param vnfd_path: the file system path to the descriptor.
+        :return: the validation outcome ('result', 'topology', 'fwgraph' and 'log').
+        """
+
+        return self._run('validate_vnf', VALIDATION_FORMATS.get(data_format, DEFAULT_VALIDATION_FORMAT),
+                         VALIDATION_LEVEL, vnfd_path)
+
+    def validate_ns(self, data_format, nsd_path, vnfd_paths, level=VALIDATION_LEVEL):
+        """
+        Validates a Network Service descriptor along with the descriptors of its vNSFs.
+
+        :param data_format: the descriptor data format, e.g. 'OSM-R4'.
+        :param nsd_path: the file system path to the Network Service descriptor.
+        :param vnfd_paths: the file system paths to the vNSF descriptors.
+        :param level: the validation level, e.g. 's' for the syntax alone.
+        :return: the validation outcome ('result', 'topology', 'fwgraph' and 'log').
+        """
+
+        return self._run('validate_ns', VALIDATION_FORMATS.get(data_format, DEFAULT_VALIDATION_FORMAT),
+                         level, nsd_path, addt_files=vnfd_paths)
+
+    def _run(self, function_name, *args, **kwargs):
+        """
+        Runs a validation in the worker processes.
+
+        :param function_name: the validator function to run.
+        :return: the validation outcome.
+        """
+
+        for attempt in range(2):
+            pool = self._pool
+            future = pool.submit(_validate, function_name, self.cpu_limit, *args, **kwargs)
+
+            try:
+                return future.result(timeout=self.timeout)
+
+            except TimeoutError:
+                self.logger.warning('Validation timed out after %s seconds', self.timeout)
+                self._recycle(pool)
+                return failed_validation('Validation timed out after {} seconds'.format(self.timeout))
+
+            except BrokenProcessPool:
+                # Either this validation was killed (e.g. over its CPU time) or another one had the workers replaced.
+                if self._pool is pool:
+                    self.logger.warning('Validation worker died, most likely over its CPU time')
+                    self._recycle(pool)
+                    return failed_validation('Validation aborted. CPU time over {} seconds'.format(self.cpu_limit))
+
+        return failed_validation('Validation aborted. The validation workers were restarted')
+
+    @staticmethod
+    def _validator_version(validator):
+        """
+        :param validator: the validator module.
+        :return: the validator version, as per the module or else the distribution providing it.
+        """
+
+        version = getattr(validator, '__version__', None)
+        if version is None:
+            try:
+                version = pkg_resources.get_distribution(validator.__name__.split('.')[0]).version
+            except pkg_resources.DistributionNotFound:
+                version = 'unknown'
+
+        return str(version)
+
+    def _new_pool(self):
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        # All the workers are forked on the first submission.
+        pool.submit(_pid)
+
+        return pool
+
+    def _recycle(self, pool):
+        """
+        Replaces the worker processes, as a stuck validation can't be cancelled once running.
+
+        :param pool: the workers to replace.
+        """
+
+        with self._lock:
+            if self._pool is not pool:
+                return
+
+            for process in list(pool._processes.values()):
+                process.terminate()
+            pool.shutdown(wait=False)
+
+            if self._spare_pool is not None:
+                self._pool, self._spare_pool = self._spare_pool, None
+            else:
+                self.logger.warning('No spare validation workers left, forking new ones')
+                self._pool = self._new_pool()
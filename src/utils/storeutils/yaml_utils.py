@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import yaml
+
+# Use the libyaml-based (C) loader and dumper when PyYAML was built with them, falling back to the pure-Python ones.
+# Both are the safe variants: only standard YAML tags are allowed so packages can't instantiate arbitrary objects.
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+
+    LIBYAML = True
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+    LIBYAML = False
+
+YAMLError = yaml.YAMLError
+
+
+def load(stream, loader=SafeLoader):
+    """
+    Parses a YAML document.
+
+    :param stream: the YAML document (string, bytes or file).
+    :param loader: the loader to use. Defaults to the fastest safe loader available.
+    :return: the document data.
+    """
+
+    return yaml.load(stream, Loader=loader)
+
+
+def dump(data, stream=None, dumper=SafeDumper, **kwargs):
+    """
+    Serializes data into a YAML document, in block style unless stated otherwise.
+
+    :param data: the data to serialize.
+    :param stream: the file to write to. When not provided the YAML document is returned.
+    :param dumper: the dumper to use. Defaults to the fastest safe dumper available.
+    :param kwargs: further PyYAML dump options.
+    :return: the YAML document when no stream is provided.
+    """
+
+    kwargs.setdefault('default_flow_style', False)
+
+    return yaml.dump(data, stream, Dumper=dumper, **kwargs)
+
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import logging
+from datetime import datetime
+
+import flask
+from eve.methods.common import resolve_document_etag
+
+VALIDATION_RESOURCE = 'validation'
+
+logger = logging.getLogger(__name__)
+
+
+def insert(validation_data):
+    """
+    Stores the outcome of validating descriptors straight into the database. The document is produced by the Store
+    itself, hence it isn't validated against the schema nor goes through an emulated request as the API writes do; only
+    the metadata the API provides (creation and update dates and ETag) is set.
+
+    Storing the validation must not get in the way of the onboarding outcome so failing to store it is logged rather
+    than raised.
+
+    :param validation_data: the validation document. It gets updated with the metadata and '_id'.
+    :return: the '_id' of the document stored or None if it couldn't be stored.
+    """
+
+    try:
+        app = flask.current_app
+
+        now = datetime.utcnow().replace(microsecond=0)
+        validation_data[app.config['DATE_CREATED']] = validation_data[app.config['LAST_UPDATED']] = now
+        resolve_document_etag(validation_data, VALIDATION_RESOURCE)
+
+        source = app.config['DOMAIN'][VALIDATION_RESOURCE]['datasource']['source']
+        validation_id = app.data.driver.db[source].insert_one(validation_data).inserted_id
+
+    except Exception:
+        # Not only database errors, documents which can't be encoded (BSON) as well.
+        logger.exception('Unable to store the validation')
+        return None
+
+    # Let those following the API writes (e.g. the responses cache) know about it.
+    try:
+        getattr(app, 'on_inserted')(VALIDATION_RESOURCE, [validation_data])
+        getattr(app, 'on_inserted_{}'.format(VALIDATION_RESOURCE))([validation_data])
+    except Exception:
+        logger.exception('Unable to notify the validation %s stored', validation_id)
+
+    return validation_id
@@ -28,9 +28,8 @@
 import logging
 
 import os
-import yaml
 from shutil import rmtree
-from storeutils import tar_package
+from storeutils import integrity, package_spool, tar_package, yaml_utils
 from storeutils.error_utils import ExceptionMessage, IssueHandling, IssueElement
 from tempfile import gettempdir, mkdtemp
 from werkzeug.datastructures import FileStorage
@@ -57,6 +56,10 @@ class VnsfWrongManifestFormat(ExceptionMessage):
     """vNSF manifest doesn't follow the schema."""
 
 
+# The SHIELD manifest location within the package.
+MANIFEST_FILENAME = 'manifest.yaml'
+
+
 class VnsfHelper(object):
     errors = {
         'ONBOARD_VNSF': {
@@ -72,11 +75,27 @@ class VnsfHelper(object):
                 IssueElement.ERROR.name:     ["Missing 'manifest.yaml' from {}", 'Package contents: {}'],
                 IssueElement.EXCEPTION.name: VnsfPackageCompliance('Package does not comply with the SHIELD format')
                 },
+            'PKG_MEMBER_REJECTED':        {
+                IssueElement.ERROR.name:     ['{}'],
+                IssueElement.EXCEPTION.name: VnsfPackageCompliance('Package does not comply with the SHIELD format')
+                },
             'PKG_TAMPERED_NAME_MISMATCH': {
                 IssueElement.ERROR.name:     [
                     "Package file name ({}) doesn't match the one defined in the manifest ({})."],
                 IssueElement.EXCEPTION.name: VnsfTamperedPackage('Package file name mismatch')
                 },
+            'PKG_TAMPERED_HASH_MISMATCH': {
+                IssueElement.ERROR.name:     ["Digest of '{}' doesn't match the one defined in the manifest."],
+                IssueElement.EXCEPTION.name: VnsfTamperedPackage('Package digest mismatch')
+                },
+            'PKG_HASH_UNSUPPORTED':       {
+                IssueElement.ERROR.name:     ['{}'],
+                IssueElement.EXCEPTION.name: VnsfPackageCompliance('Hashing algorithm not supported')
+                },
+            'MANIFEST_INCOMPLETE':        {
+                IssueElement.ERROR.name:     ['Manifest is missing {}'],
+                IssueElement.EXCEPTION.name: VnsfPackageCompliance('Package does not comply with the SHIELD format')
+                },
             'MANIFEST_NOT_VNSF':          {
                 IssueElement.ERROR.name:     ['Manifest is not for a vNSF'],
                 IssueElement.EXCEPTION.name: VnsfWrongManifestFormat('Manifest is not for a vNSF')
@@ -84,12 +103,18 @@ class VnsfHelper(object):
             }
         }
 
-    def __init__(self, vnsfo, logger=None):
+    def __init__(self, vnsfo, logger=None, max_member_size=None, integrity_policy='enforce'):
         self.logger = logger or logging.getLogger(__name__)
         self.issue = IssueHandling(self.logger)
 
         self.vnsfo = vnsfo
 
+        # Largest file (in bytes) allowed to be extracted from a package.
+        self.max_member_size = max_member_size
+
+        # How to handle package digests not matching the manifest: 'enforce', 'warn' or 'off'.
+        self.integrity_policy = integrity_policy
+
     def onboard_vnsf(self, tenant_id, vnsf_package, validation_data):
         """
         Registers a vNSF into the Store and onboards it with the Orchestrator.
@@ -112,62 +137,67 @@ class VnsfHelper(object):
         # Ensure it's a SHIELD vNSF package.
         extracted_package_path, manifest_path = self._extract_package(vnsf_package)
 
-        # Get the SHIELD manifest data.
-        with open(manifest_path, 'r') as stream:
-            manifest = dict(yaml.safe_load(stream))
-            self.logger.debug('SHIELD manifest\n%s', manifest)
-
-        # Ensure it's a vNSF package.
-        if not 'manifest:vnsf' in manifest:
-            self.issue.raise_ex(IssueElement.ERROR,
-                                self.issue.raise_ex(IssueElement.ERROR,
-                                                    self.errors['ONBOARD_VNSF']['MANIFEST_NOT_VNSF']))
-
-        vnsf_package_path = os.path.join(extracted_package_path,
-                                         manifest['manifest:vnsf']['package'])
-
-        self.logger.debug('shield package: %s', os.listdir(extracted_package_path))
-        self.logger.debug('%s package: %s | path: %s',
-                          manifest['manifest:vnsf']['type'],
-                          manifest['manifest:vnsf']['package'],
-                          os.path.join(extracted_package_path, manifest['manifest:vnsf'][
-                              'package']))
-
-        # Gather the information data format
-        data_format = manifest['manifest:vnsf']['type']
-
-        # Onboard the VNF into the actual Orchestrator.
-        # NOTE: any exception raised by the vNSFO must be handled by the caller, hence no try/catch here.
-        onboarded_package = self.vnsfo.onboard_vnsf(tenant_id,
-                                                    vnsf_package_path,
-                                                    manifest['manifest:vnsf']['descriptor'],
-                                                    data_format,
-                                                    validation_data)
-
-        # Provide the manifest as a file stream.
-        stream = open(manifest_path, 'rb')
-        manifest_fs = FileStorage(stream)
-
-        # Provide the Trust Monitor file streams.
-        self.logger.debug("Adding attestation file '{0}'"
-                          .format(manifest['manifest:vnsf']['security_info']['attestation_filename']))
-        attestation_filename = os.path.join(extracted_package_path,
-                                            manifest['manifest:vnsf']['security_info']['attestation_filename'])
-        stream = open(attestation_filename, 'rb')
-        attestation_fs = FileStorage(stream)
-
-        # Build vNSF package metadata.
-        package_data = dict()
-        package_data['state'] = 'sandboxed'
-        package_data['manifest'] = manifest
-        package_data['vnsf_id'] = onboarded_package['vnsf_id']
-        package_data['vnsf_name'] = onboarded_package['vnsf_name']
-        package_data['descriptor'] = onboarded_package['descriptor']
-
-        if os.path.isdir(extracted_package_path):
-            rmtree(extracted_package_path)
-
-        return manifest_fs, attestation_fs, package_data
+        # The extracted package is removed whatever the outcome, e.g. when the package is rejected.
+        try:
+            # Get the SHIELD manifest data.
+            with open(manifest_path, 'r') as stream:
+                manifest = dict(yaml_utils.load(stream))
+                self.logger.debug('SHIELD manifest\n%s', manifest)
+
+            # Ensure it's a vNSF package.
+            if not 'manifest:vnsf' in manifest:
+                self.issue.raise_ex(IssueElement.ERROR,
+                                    self.issue.raise_ex(IssueElement.ERROR,
+                                                        self.errors['ONBOARD_VNSF']['MANIFEST_NOT_VNSF']))
+
+            # Ensure the package contents are the ones the manifest vouches for.
+            self._integrity_check(manifest, extracted_package_path)
+
+            vnsf_package_path = os.path.join(extracted_package_path,
+                                             manifest['manifest:vnsf']['package'])
+
+            self.logger.debug('shield package: %s', os.listdir(extracted_package_path))
+            self.logger.debug('%s package: %s | path: %s',
+                              manifest['manifest:vnsf']['type'],
+                              manifest['manifest:vnsf']['package'],
+                              os.path.join(extracted_package_path, manifest['manifest:vnsf'][
+                                  'package']))
+
+            # Gather the information data format
+            data_format = manifest['manifest:vnsf']['type']
+
+            # Onboard the VNF into the actual Orchestrator.
+            # NOTE: any exception raised by the vNSFO must be handled by the caller, hence no try/catch here.
+            onboarded_package = self.vnsfo.onboard_vnsf(tenant_id,
+                                                        vnsf_package_path,
+                                                        manifest['manifest:vnsf']['descriptor'],
+                                                        data_format,
+                                                        validation_data)
+
+            # Provide the manifest as a file stream.
+            stream = open(manifest_path, 'rb')
+            manifest_fs = FileStorage(stream)
+
+            # Provide the Trust Monitor file streams.
+            self.logger.debug("Adding attestation file '{0}'"
+                              .format(manifest['manifest:vnsf']['security_info']['attestation_filename']))
+            attestation_filename = os.path.join(extracted_package_path,
+                                                manifest['manifest:vnsf']['security_info']['attestation_filename'])
+            stream = open(attestation_filename, 'rb')
+            attestation_fs = FileStorage(stream)
+
+            # Build vNSF package metadata.
+            package_data = dict()
+            package_data['state'] = 'sandboxed'
+            package_data['manifest'] = manifest
+            package_data['vnsf_id'] = onboarded_package['vnsf_id']
+            package_data['vnsf_name'] = onboarded_package['vnsf_name']
+            package_data['descriptor'] = onboarded_package['descriptor']
+
+            return manifest_fs, attestation_fs, package_data
+
+        finally:
+            rmtree(extracted_package_path, ignore_errors=True)
 
     def delete_vnsf(self, tenant_id, vnsf_id, data_format):
         """
@@ -195,47 +225,148 @@ class VnsfHelper(object):
         if package_file and package_file.filename == '':
             self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['MISSING_PACKAGE'])
 
-        filename = secure_filename(package_file.filename)
-        package_absolute_path = os.path.join(gettempdir(), filename)
-
-        try:
+        spool = package_file.stream
+        if isinstance(spool, package_spool.PackageSpool):
+            # The package was already spooled (and checked) while the request body arrived.
+            package_absolute_path = spool.name
+            is_tar_gz = spool.is_tar_gz()
+            self.logger.debug("Package digest (%s bytes): %s", spool.size, spool.hexdigest())
+
+        else:
+            spool = None
+            filename = secure_filename(package_file.filename)
+            package_absolute_path = os.path.join(gettempdir(), filename)
             package_file.save(package_absolute_path)
+            is_tar_gz = tar_package.is_tar_gz_file(package_absolute_path)
 
-            if not tar_package.is_tar_gz_file(package_absolute_path):
+        try:
+            if not is_tar_gz:
                 self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['PKG_NOT_TARGZ'])
 
             self.logger.debug("Package stored at '%s'", package_absolute_path)
 
+            # Get the SHIELD manifest data first so only the files it references are extracted.
+            manifest_data = tar_package.read_member(package_absolute_path, MANIFEST_FILENAME)
+            if manifest_data is None:
+                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['PKG_NOT_SHIELD'],
+                                    [[package_file.filename], [tar_package.list_members(package_absolute_path)]])
+
+            members = self._manifest_members(yaml_utils.load(manifest_data))
+
             extracted_package_path = mkdtemp()
 
-            tar_package.extract_package(package_absolute_path, extracted_package_path)
+            try:
+                tar_package.extract_package(package_absolute_path, extracted_package_path, members,
+                                            self.max_member_size)
 
-            # Get the SHIELD manifest data.
-            manifest_path = os.path.join(extracted_package_path, 'manifest.yaml')
-            if not os.path.isfile(manifest_path):
-                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['PKG_NOT_SHIELD'],
-                                    [[extracted_package_path], [os.listdir(extracted_package_path)]])
+            except tar_package.PackageUnsafeMember as e:
+                rmtree(extracted_package_path)
+                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['PKG_MEMBER_REJECTED'],
+                                    [[e.message]])
+
+            manifest_path = os.path.join(extracted_package_path, MANIFEST_FILENAME)
 
         finally:
-            os.remove(package_absolute_path)
+            if spool is not None:
+                spool.close()
+            elif os.path.isfile(package_absolute_path):
+                os.remove(package_absolute_path)
 
         return extracted_package_path, manifest_path
 
-    def _integrity_check(self, manifest, vnsf_package_path):
+    @staticmethod
+    def _manifest_members(manifest):
+        """
+        Provides the files the SHIELD manifest references, i.e. the ones required for onboarding the vNSF package.
+
+        :param manifest: The SHIELD manifest data.
+
+        :return: the paths of the files within the package, including the manifest itself.
+        """
+
+        members = [MANIFEST_FILENAME]
+
+        vnsf = manifest.get('manifest:vnsf') if isinstance(manifest, dict) else None
+        if not isinstance(vnsf, dict):
+            return members
+
+        members.append(vnsf.get('package'))
+        if isinstance(vnsf.get('security_info'), dict):
+            members.append(vnsf['security_info'].get('attestation_filename'))
+
+        return [member for member in members if isinstance(member, str)]
+
+    def _integrity_check(self, manifest, extracted_package_path):
         """
         Checks the vNSF package for tampering issues and ensures everything is as supposed to be.
 
+        The package and the attestation file are hashed (in parallel) with the algorithm the manifest defines and their
+        digests compared against the ones in the manifest. Depending on the integrity policy a mismatch, or a manifest
+        lacking the digests, either fails the onboarding ('enforce') or is just logged ('warn'). No checks take place
+        when the policy is 'off'.
+
         :param manifest: The vNSF manifest.
-        :param vnsf_package_path: The path to the actual vNSF package.
+        :param extracted_package_path: The path to where the vNSF package was extracted to.
         :raise:  VnsfTamperedPackage: When the vNSF package has been tampered with and is not safe to use.
+        :raise:  VnsfPackageCompliance: When the manifest lacks the files to check or their digests.
         """
 
-        # Package name must match the manifest.
-        if not os.path.basename(vnsf_package_path) == manifest['manifest:vnsf']['package']:
+        if self.integrity_policy == 'off':
+            return
+
+        vnsf_manifest = manifest['manifest:vnsf']
+        security_info = vnsf_manifest.get('security_info')
+        if not isinstance(security_info, dict):
+            security_info = dict()
+
+        # The manifest must define the files to check and their digests.
+        missing = [field for field, value in (('package', vnsf_manifest.get('package')),
+                                              ('hash', vnsf_manifest.get('hash')),
+                                              ('hashing_algorithm', vnsf_manifest.get('hashing_algorithm')),
+                                              ('security_info.attestation_filename',
+                                               security_info.get('attestation_filename')),
+                                              ('security_info.hash', security_info.get('hash')))
+                   if not value]
+        if missing:
+            missing = ', '.join("'{}'".format(field) for field in missing)
+            if self.integrity_policy == 'enforce':
+                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['MANIFEST_INCOMPLETE'], [[missing]])
+
+            # Nothing to check the package against.
+            self.logger.warning('Manifest is missing %s, the package integrity is not checked', missing)
+            return
+
+        extracted_package_path = os.path.realpath(extracted_package_path)
+        vnsf_package_path = os.path.realpath(os.path.join(extracted_package_path, vnsf_manifest['package']))
+        attestation_path = os.path.join(extracted_package_path, security_info['attestation_filename'])
+
+        # The package hashed must be the one the manifest names, within the SHIELD package.
+        if os.path.basename(vnsf_package_path) != os.path.basename(os.path.normpath(vnsf_manifest['package'])) or \
+                os.path.commonpath([extracted_package_path, vnsf_package_path]) != extracted_package_path:
             self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['PKG_TAMPERED_NAME_MISMATCH'],
-                                [[vnsf_package_path], [manifest['manifest:vnsf']['package']]])
+                                [[os.path.relpath(vnsf_package_path, extracted_package_path),
+                                  vnsf_manifest['package']]])
+
+        # Package and attestation file hashes must match the manifest. Missing files are reported further on.
+        expected_digests = dict()
+        for path, expected in ((vnsf_package_path, vnsf_manifest['hash']),
+                               (attestation_path, security_info['hash'])):
+            if os.path.isfile(path):
+                expected_digests[path] = expected
+
+        try:
+            mismatches = integrity.verify_files(expected_digests, vnsf_manifest['hashing_algorithm'])
+
+        except integrity.HashAlgorithmNotSupported as e:
+            self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['PKG_HASH_UNSUPPORTED'],
+                                [[e.message]])
+
+        for path, (expected, computed) in mismatches.items():
+            self.logger.warning("'%s' digest doesn't match the manifest (expected: %s | computed: %s)",
+                                os.path.relpath(path, extracted_package_path), expected, computed)
 
-        # Package hash must match the manifest.
-        manifest['manifest:vnsf']['hash']
+        if mismatches and self.integrity_policy == 'enforce':
+            self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['PKG_TAMPERED_HASH_MISMATCH'],
+                                [[', '.join(os.path.relpath(path, extracted_package_path) for path in mismatches)]])
 
         # VDU(s) image hash must match the manifest.
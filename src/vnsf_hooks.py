@@ -26,14 +26,14 @@
 
 import logging
 
-import flask
 import settings as cfg
+import validation_records
 from eve.methods.post import post_internal
 from flask import abort, make_response, jsonify
-from storeutils import http_utils
+from storeutils import descriptors
 from storeutils.error_utils import IssueHandling, IssueElement
 from vnsf.vnsf import VnsfHelper, VnsfMissingPackage, VnsfWrongPackageFormat, VnsfPackageCompliance, \
-    VnsfWrongManifestFormat
+    VnsfWrongManifestFormat, VnsfTamperedPackage
 from vnsfo.vnsfo import VnsfoFactory
 from vnsfo.vnsfo_adapter import VnsfoMissingVnfDescriptor, VnsfOrchestratorOnboardingIssue, VnsfValidationIssue, \
     VnsfoVnsfWrongPackageFormat, VnsfOrchestratorUnreacheable, VnsfInvalidFormat, VnsfOrchestratorDeletingIssue
@@ -97,15 +97,58 @@ class VnsfHooks:
         it gets ignored.
         """
 
+        form_data = request.form.copy()
+        files = request.files.copy()
+
+        VnsfHooks.build_vnsf(form_data, files)
+
+        request.files = ImmutableMultiDict(files)
+
+        # Modify the request form to persist
+        request.form = ImmutableMultiDict(form_data)
+
+    @staticmethod
+    def onboard_vnsf_job(package_file):
+        """
+        Registers a vNSF into the Store and onboards it with the Orchestrator outside of the HTTP request which
+        submitted it, i.e. as a background onboarding job.
+
+        :param package_file: the vNSF package (as a FileStorage).
+        :return: the response data (including the validation reference) and HTTP status code for the vNSF stored.
+        :raise: HTTPException: When the onboarding fails, holding the error response.
+        """
+
+        form_data = dict()
+        files = {'package': package_file}
+
+        VnsfHooks.build_vnsf(form_data, files)
+
+        form_data.update(files)
+        r, _, _, status, _ = post_internal('vnsfs', form_data)
+
+        if 'validation' in form_data:
+            r['validation'] = str(form_data['validation'])
+
+        return r, status
+
+    @staticmethod
+    def build_vnsf(form_data, files):
+        """
+        Onboards the vNSF package with the Orchestrator and converts it into the document data to store.
+
+        :param form_data: the document data. It gets updated with the vNSF details.
+        :param files: the document files, holding the vNSF package. It gets updated with the files to store.
+        :raise: HTTPException: When the onboarding fails, holding the error response.
+        """
+
         # Store validation data about the vnsf
         validation_data = dict()
 
         ex_response = None
-        form_data = request.form.copy()
 
         try:
             # It's assumed that only one vNSF package file is received.
-            if 'package' not in request.files:
+            if 'package' not in files:
                 ex_response = VnsfHooks.issue.build_ex(
                         IssueElement.ERROR,
                         VnsfHooks.errors['ONBOARD_VNSF']['PACKAGE_MISSING'],
@@ -116,15 +159,15 @@ class VnsfHooks:
             vnsfo = VnsfoFactory.get_orchestrator('OSM', cfg.VNSFO_PROTOCOL, cfg.VNSFO_HOST, cfg.VNSFO_PORT,
                                                   cfg.VNSFO_API)
 
-            vnsf = VnsfHelper(vnsfo)
+            vnsf = VnsfHelper(vnsfo, max_member_size=cfg.PACKAGE_MEMBER_MAX_SIZE,
+                              integrity_policy=cfg.PACKAGE_INTEGRITY_POLICY)
 
             manifest_fs, attestation_fs, package_data = vnsf.onboard_vnsf(cfg.VNSFO_TENANT_ID,
-                                                                          request.files['package'],
+                                                                          files['package'],
                                                                           validation_data)
 
             # Ensure the SHIELD manifest is stored as a binary file.
             # NOTE: the file is closed by Eve once stored.
-            files = request.files.copy()
             files['manifest_file'] = manifest_fs
 
             # Ensure the Trust Monitor attestation file is stored as binary.
@@ -133,7 +176,6 @@ class VnsfHooks:
             # The package field is only required for onboarding schema validation but shouldn't be stored as document
             # data.
             files.pop('package')
-            request.files = ImmutableMultiDict(files)
 
             # Convert the vNSF package into the document data.
             # NOTE: there's no need to deep copy as the data won't be modified until it gets stored in the database.
@@ -142,6 +184,8 @@ class VnsfHooks:
             form_data['vnsf_id'] = package_data['vnsf_id']
             form_data['vnsf_name'] = package_data['vnsf_name']
             form_data['descriptor'] = package_data['descriptor']
+            if cfg.DESCRIPTOR_CANONICAL_JSON:
+                form_data['descriptor_json'] = descriptors.canonical_json(package_data['descriptor'])
 
         except (VnsfMissingPackage, VnsfWrongPackageFormat, VnsfoVnsfWrongPackageFormat) as e:
 
@@ -150,7 +194,7 @@ class VnsfHooks:
 
                     )
 
-        except (VnsfPackageCompliance, VnsfoMissingVnfDescriptor, VnsfWrongManifestFormat) as e:
+        except (VnsfPackageCompliance, VnsfoMissingVnfDescriptor, VnsfWrongManifestFormat, VnsfTamperedPackage) as e:
             ex_response = VnsfHooks.issue.build_ex(
                     IssueElement.ERROR, VnsfHooks.errors['ONBOARD_VNSF']['PACKAGE_COMPLIANCE'], [[e.message]], e.message
                     )
@@ -167,14 +211,12 @@ class VnsfHooks:
                     )
 
         finally:
-            # Always persist the validation data, if existent
-            validation_ref = None
-            if validation_data:
-                app = flask.current_app
-                with app.test_request_context():
-                    r, _, _, status, _ = post_internal('validation', validation_data)
-                assert status == http_utils.HTTP_201_CREATED
-                validation_ref = r['_id']
+            # Always persist the validation data, if existent. The outcome of a former validation of the same
+            # descriptors is referred to as is.
+            validation_ref = validation_data.get('_id')
+            if validation_data and validation_ref is None:
+                # Failing to store it doesn't replace the onboarding outcome, there's just no validation to refer to.
+                validation_ref = validation_records.insert(validation_data)
 
             # Check if exceptions were raised during the onboard process
             if ex_response:
@@ -189,9 +231,6 @@ class VnsfHooks:
             if validation_ref:
                 form_data['validation'] = validation_ref
 
-            # Modify the request form to persist
-            request.form = ImmutableMultiDict(form_data)
-
     @staticmethod
     def delete_vnsf(item):
         print("Solicited delete ", item['vnsf_id'])
@@ -210,6 +249,16 @@ class VnsfHooks:
             # Abort the request and reply with a meaningful error
             abort(make_response(jsonify(**ex_response), ex_response['_error']['code']))
 
+    @staticmethod
+    def forget_vnsf(item):
+        """
+        Drops the deleted vNSF from the descriptors cache.
+
+        :param item: the vNSF deleted.
+        """
+
+        descriptors.cache.invalidate(item['_id'])
+
     @staticmethod
     def send_minimal_vnsf_data(response):
         """
@@ -218,8 +267,9 @@ class VnsfHooks:
         :param response: the response from the DB
         :return: The vNSF with the "public" properties only.
         """
-        del response['manifest_file']
-        del response['attestation_file']
+        # Media may already be left out by the field set requested.
+        response.pop('manifest_file', None)
+        response.pop('attestation_file', None)
         del response['state']
 
     @staticmethod
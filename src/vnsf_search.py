@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+import json
+import logging
+
+from flask import abort, make_response, request
+from storeutils import http_utils
+
+VNSFS_RESOURCE = 'vnsfs'
+
+# The fields each filter (query parameter) matches, exactly. These are also the facets counted.
+FILTERS = {
+    'capability': 'manifest.manifest:vnsf.properties.capabilities',
+    'vendor':     'manifest.manifest:vnsf.properties.vendor',
+    'type':       'manifest.manifest:vnsf.type',
+    'state':      'state',
+    }
+
+FACETS = ['vendor', 'type', 'state']
+
+# The fields provided for each match.
+MATCH_PROJECTION = {
+    'vnsf_id':      1,
+    'vnsf_name':    1,
+    'state':        1,
+    'type':         '$manifest.manifest:vnsf.type',
+    'vendor':       '$manifest.manifest:vnsf.properties.vendor',
+    'capabilities': '$manifest.manifest:vnsf.properties.capabilities',
+    '_updated':     1,
+    }
+
+DEFAULT_MAX_RESULTS = 25
+MAX_RESULTS = 100
+
+
+class VnsfSearch(object):
+    """
+    Searches the vNSFs by capability, vendor, name and descriptor keywords (through the 'search' text index) and/or
+    by exact field values, providing the matches ranked by relevance along with how many there are for each vendor,
+    type and state.
+    """
+
+    def __init__(self, app, logger=None):
+        """
+        :param app: the Eve application.
+        """
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.app = app
+
+    def register(self):
+        """
+        Adds the search endpoint, i.e. '/vnsfs/search'.
+        """
+
+        url = '{}/{}/search'.format(self.app.api_prefix, self.app.config['DOMAIN'][VNSFS_RESOURCE]['url'])
+        self.app.add_url_rule(url, '{}|search'.format(VNSFS_RESOURCE), self.search, methods=['GET'])
+
+    def search(self):
+        """
+        Searches the vNSFs as per the query parameters: 'q' for the text to search for and 'capability', 'vendor',
+        'type' and 'state' (comma-separated values) for the values to match. Paged through 'page' and 'max_results'.
+
+        :return: the matches, ranked, and the facets counts.
+        """
+
+        text = request.args.get('q', '').strip()
+        page = self._positive_int('page', 1)
+        max_results = min(self._positive_int('max_results', DEFAULT_MAX_RESULTS), MAX_RESULTS)
+
+        match = {}
+        if text:
+            match['$text'] = {'$search': text}
+        for name, field in FILTERS.items():
+            values = [value.strip() for value in request.args.get(name, '').split(',') if value.strip()]
+            if values:
+                match[field] = {'$in': values}
+
+        pipeline = [{'$match': match}]
+        if text:
+            pipeline.append({'$addFields': {'_score': {'$meta': 'textScore'}}})
+            sort = {'_score': -1, 'vnsf_id': 1}
+        else:
+            sort = {'vnsf_id': 1}
+
+        projection = dict(MATCH_PROJECTION, **({'_score': 1} if text else {}))
+
+        facets = {'_items': [{'$sort': sort},
+                             {'$skip': (page - 1) * max_results},
+                             {'$limit': max_results},
+                             {'$project': projection}],
+                  '_total': [{'$count': 'total'}]}
+        for facet in FACETS:
+            facets[facet] = [{'$sortByCount': '$' + FILTERS[facet]}]
+        pipeline.append({'$facet': facets})
+
+        source = self.app.config['DOMAIN'][VNSFS_RESOURCE]['datasource']['source']
+        outcome = next(self.app.data.driver.db[source].aggregate(pipeline))
+
+        r = {
+            '_items':  outcome['_items'],
+            '_facets': {facet: {count['_id']: count['count'] for count in outcome[facet] if count['_id'] is not None}
+                        for facet in FACETS},
+            '_meta':   {'page':        page,
+                        'max_results': max_results,
+                        'total':       outcome['_total'][0]['total'] if outcome['_total'] else 0},
+            }
+
+        # The matches hold database types (e.g. ObjectId) so they're encoded as Eve does.
+        response = make_response(json.dumps(r, cls=self.app.data.json_encoder_class), http_utils.HTTP_200_OK)
+        response.mimetype = 'application/json'
+
+        return response
+
+    @staticmethod
+    def _positive_int(name, default):
+        try:
+            value = int(request.args.get(name, default))
+        except ValueError:
+            value = 0
+
+        if value < 1:
+            abort(http_utils.HTTP_400_BAD_REQUEST, description="'{}' must be a positive integer".format(name))
+
+        return value
@@ -30,11 +30,11 @@ import logging
 import flask
 import os
 import requests
-import yaml
-from eve.methods.get import get_internal
+import tarfile
 from shutil import rmtree
-from storeutils import http_utils, tar_package
+from storeutils import descriptors, http_utils, multipart, ns_links, tar_package, yaml_utils
 from storeutils.error_utils import IssueHandling, IssueElement
+from storeutils.validation_engine import SYNTAX_LEVEL, AbortedValidation
 from tempfile import mkdtemp
 
 from .vnsfo_adapter import VnsfOrchestratorAdapter
@@ -45,8 +45,8 @@ class OsmVnsfoAdapter(VnsfOrchestratorAdapter):
     Open Source Mano Orchestrator adapter.
     """
 
-    def __init__(self, protocol, server, port, api_basepath, logger=None):
-        super().__init__(protocol, server, port, api_basepath, logger)
+    def __init__(self, protocol, server, port, api_basepath, logger=None, **session_settings):
+        super().__init__(protocol, server, port, api_basepath, logger, **session_settings)
         self.logger = logger or logging.getLogger(__name__)
         self.issue = IssueHandling(self.logger)
 
@@ -73,7 +73,7 @@ class OsmVnsfoAdapter(VnsfOrchestratorAdapter):
         self.logger.debug("Send policy data to '%s'", url)
 
         try:
-            r = requests.post(url, headers=headers, json=sec_policy, verify=False)
+            r = self._request('POST', url, headers=headers, json=sec_policy)
 
             if len(r.text) > 0:
                 self.logger.debug(r.text)
@@ -82,7 +82,7 @@ class OsmVnsfoAdapter(VnsfOrchestratorAdapter):
                 self.issue.raise_ex(IssueElement.ERROR, self.errors['POLICY']['POLICY_ISSUE'],
                                     [[url, r.status_code]])
 
-        except requests.exceptions.ConnectionError:
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
             self.issue.raise_ex(IssueElement.ERROR, self.errors['POLICY']['VNSFO_UNREACHABLE'],
                                 [[url]])
 
@@ -109,24 +109,23 @@ class OsmVnsfoAdapter(VnsfOrchestratorAdapter):
 
         url = '{}/package/{}/onboard'.format(self.basepath, self._get_osm_version(data_format))
 
-        # 'Content-Type': 'multipart/form-data' is set by the requests library.
-        files = {'package': (os.path.split(vnsf_package_path)[1], open(vnsf_package_path, 'rb'))}
-
         self.logger.debug("Onboard vNSF package '%s' to '%s'", vnsf_package_path, url)
 
-        try:
-            r = requests.post(url, files=files, verify=False)
+        # The package is streamed in chunks as the multipart body, instead of being loaded in memory.
+        with multipart.MultipartFileEncoder('package', vnsf_package_path) as body:
+            try:
+                r = self._request('POST', url, data=body, headers={'Content-Type': body.content_type})
 
-            if len(r.text) > 0:
-                self.logger.debug(r.text)
+                if len(r.text) > 0:
+                    self.logger.debug(r.text)
 
-            if not r.status_code == http_utils.HTTP_202_ACCEPTED:
-                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['ONBOARDING_ISSUE'],
-                                    [[url, r.reason, r.status_code]])
+                if not r.status_code == http_utils.HTTP_202_ACCEPTED:
+                    self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['ONBOARDING_ISSUE'],
+                                        [[url, r.reason, r.status_code]])
 
-        except requests.exceptions.ConnectionError:
-            self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['VNSFO_UNREACHABLE'],
-                                [[url]])
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['VNSFO_UNREACHABLE'],
+                                    [[url]])
 
         return package_data
 
@@ -141,11 +140,11 @@ class OsmVnsfoAdapter(VnsfOrchestratorAdapter):
         headers = {'Content-Type': 'application/json'}
         self.logger.debug("Delete vNSF '{}' from Orchestrator".format(vnsf_id))
         try:
-            r = requests.delete(url, headers=headers, verify=False)
+            r = self._request('DELETE', url, headers=headers)
             if not (r.status_code == http_utils.HTTP_200_OK or r.status_code == http_utils.HTTP_202_ACCEPTED):
                 self.issue.raise_ex(IssueElement.ERROR, self.errors['DELETE_VNSF']['DELETING_ISSUE'],
                                     [[url, r.reason, r.status_code]])
-        except requests.exceptions.ConnectionError:
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
             self.issue.raise_ex(IssueElement.ERROR, self.errors['DELETE_VNSF']['VNSFO_UNREACHABLE'], [[url]])
 
     def _parse_vnsf_package(self, vnf_package_path, vnfd_file, data_format, validation_data):
@@ -159,60 +158,63 @@ class OsmVnsfoAdapter(VnsfOrchestratorAdapter):
         :return: The vNSF package data relevant to the onboarding operation.
         """
 
-        # The vNSF package must be in '.tar.gz' format.
-        if not tar_package.is_tar_gz_file(vnf_package_path):
-            self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['VNSFPKG_NOT_VNSFO'])
-
-        extracted_package_path = mkdtemp()
-
-        tar_package.extract_package(vnf_package_path, extracted_package_path)
-
-        self.logger.debug('extracted package path: %s', extracted_package_path)
-        self.logger.debug('extracted contents: %s', os.listdir(extracted_package_path))
         self.logger.debug('package data format: %s', data_format)
+        self.logger.debug('VNFD path: %s', vnfd_file)
+
+        # The vNSF Descriptor is read straight from the package so there's no need to extract it.
+        vnsfd_data = self._read_package_member(vnf_package_path, vnfd_file,
+                                               self.errors['ONBOARD_VNSF']['VNSFPKG_NOT_VNSFO'])
 
         # The vNF package folder must exist. The folder name is the same as the VNF package one with .tar.gz removed.
-        vnf_folder_abs_path = os.path.join(extracted_package_path, tar_package.get_tar_gz_basename(vnf_package_path))
-        if not os.path.isdir(vnf_folder_abs_path):
+        vnf_folder = tar_package.get_tar_gz_basename(vnf_package_path)
+        if not self._package_has_folder(vnf_package_path, vnf_folder, vnfd_file if vnsfd_data is not None else None):
             self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['PKG_MISSING_VNFD_FOLDER'],
-                                [[vnf_folder_abs_path]])
-
-        self.logger.debug('vNSFO package: %s', os.listdir(vnf_folder_abs_path))
-        self.logger.debug('VNFD path: %s', vnfd_file)
+                                [[vnf_folder]])
 
         # The vNSF Descriptor must be in the expected location so it's contents can be retrieved.
-        vnfd_file_abs_path = os.path.join(extracted_package_path, vnfd_file)
-        if not os.path.isfile(vnfd_file_abs_path):
+        if vnsfd_data is None:
             self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['PKG_MISSING_VNFD'],
                                 [[vnfd_file]])
 
         vnsfd = None
-        with open(vnfd_file_abs_path, 'r') as stream:
-            try:
-                vnsfd = yaml.load(stream)
+        try:
+            vnsfd = yaml_utils.load(vnsfd_data)
 
-            except yaml.YAMLError:
-                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['VNFD_FORMAT_INVALID'],
-                                    [[vnfd_file]])
+        except yaml_utils.YAMLError:
+            self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['VNFD_FORMAT_INVALID'],
+                                [[vnfd_file]])
 
         self.logger.debug('VNFD\n%s', vnsfd)
 
-        # # Validate vNSF Descriptor using NSFVal
-        # if data_format == "OSM-R2":
-        #     val_result = nsfval.validate_vnf('osm-r2', 'sit', vnfd_file_abs_path)
-        # elif data_format == 'OSM-R4':
-        #     val_result = nsfval.validate_vnf('osm-r4', 'sit', vnfd_file_abs_path)
-        # else:
-        #     val_result = nsfval.validate_vnf('osm-r4', 'sit', vnfd_file_abs_path)
-        #
-        # # Build the validation data structure
-        # validation_data.update(val_result)
-        # validation_data['type'] = 'vNSF'
-        #
-        # # Raise exception if validation errors were found.
-        # if validation_data['result']['error_count'] != 0:
-        #     self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['VALIDATION_ERROR'], [[vnfd_file]])
-        # self.logger.debug("vNSF descriptor '%s' validation PASS", vnfd_file)
+        # Validate the vNSF Descriptor, out of process as the validator expects it in a file. The outcome of validating
+        # the same descriptor (e.g. resubmitted after failing to onboard) is reused.
+        if self.validator is not None:
+            digest = self.validator.digest(data_format, vnsfd)
+            val_result = self._find_validation(digest)
+
+            if val_result is None:
+                descriptors_path = mkdtemp()
+                try:
+                    vnsfd_file_abs_path = os.path.join(descriptors_path, os.path.basename(vnfd_file))
+                    with open(vnsfd_file_abs_path, 'wb') as _f:
+                        _f.write(vnsfd_data)
+
+                    val_result = self.validator.validate_vnf(data_format, vnsfd_file_abs_path)
+                finally:
+                    rmtree(descriptors_path, ignore_errors=True)
+
+                if not isinstance(val_result, AbortedValidation):
+                    val_result['digest'] = digest
+
+            # Build the validation data structure
+            validation_data.update(val_result)
+            validation_data['type'] = 'vNSF'
+
+            # Raise exception if validation errors were found.
+            if validation_data['result']['error_count'] != 0:
+                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_VNSF']['VALIDATION_ERROR'],
+                                    [[vnfd_file]])
+            self.logger.debug("vNSF descriptor '%s' validation PASS", vnfd_file)
 
         # Retrieve VNF ID
         vnsf_id = vnsfd[list(vnsfd.keys())[0]]['vnfd'][0]['id']
@@ -222,11 +224,9 @@ class OsmVnsfoAdapter(VnsfOrchestratorAdapter):
         package_data = {
             'vnsf_id':    str(vnsf_id),  # assuming the descriptor only carries one VNFD
             'vnsf_name':  str(vnsf_name),
-            'descriptor': str(vnsfd)
+            'descriptor': vnsfd
             }
 
-        rmtree(extracted_package_path)
-
         return package_data
 
     def onboard_ns(self, tenant_id, ns_package_path, nsd_file, data_format, validation_data):
@@ -247,23 +247,23 @@ class OsmVnsfoAdapter(VnsfOrchestratorAdapter):
 
         url = '{}/package/{}/onboard'.format(self.basepath, self._get_osm_version(data_format))
 
-        files = {'package': (os.path.split(ns_package_path)[1], open(ns_package_path, 'rb'))}
-
         self.logger.debug("Onboard Network Service package '%s' to '%s'", ns_package_path, url)
 
-        try:
-            r = requests.post(url, files=files, verify=False)
+        # The package is streamed in chunks as the multipart body, instead of being loaded in memory.
+        with multipart.MultipartFileEncoder('package', ns_package_path) as body:
+            try:
+                r = self._request('POST', url, data=body, headers={'Content-Type': body.content_type})
 
-            if len(r.text) > 0:
-                self.logger.debug(r.text)
+                if len(r.text) > 0:
+                    self.logger.debug(r.text)
 
-            if not r.status_code == http_utils.HTTP_202_ACCEPTED:
-                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['ONBOARDING_ISSUE'],
-                                    [[url, r.reason, r.status_code]])
+                if not r.status_code == http_utils.HTTP_202_ACCEPTED:
+                    self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['ONBOARDING_ISSUE'],
+                                        [[url, r.reason, r.status_code]])
 
-        except requests.exceptions.ConnectionError:
-            self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['VNSFO_UNREACHABLE'],
-                                [[url]])
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['VNSFO_UNREACHABLE'],
+                                    [[url]])
 
         return package_data
 
@@ -278,12 +278,12 @@ class OsmVnsfoAdapter(VnsfOrchestratorAdapter):
         headers = {'Content-Type': 'application/json'}
         self.logger.debug("Delete Network Service '{}' from Orchestrator".format(ns_id))
         try:
-            r = requests.delete(url, headers=headers, verify=False)
+            r = self._request('DELETE', url, headers=headers)
             if not (r.status_code == http_utils.HTTP_200_OK or r.status_code == http_utils.HTTP_202_ACCEPTED):
                 self.logger.debug("vNSFO replied: [{}] {}".format(r.status_code, r.text))
                 self.issue.raise_ex(IssueElement.ERROR, self.errors['DELETE_NS']['DELETING_ISSUE'],
                                     [[url, r.reason, r.status_code]])
-        except requests.exceptions.ConnectionError:
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
             self.issue.raise_ex(IssueElement.ERROR, self.errors['DELETE_NS']['VNSFO_UNREACHABLE'], [[url]])
 
     def _parse_ns_package(self, ns_package_path, nsd_file, data_format, validation_data):
@@ -298,42 +298,31 @@ class OsmVnsfoAdapter(VnsfOrchestratorAdapter):
         :return: The Network Service package data relevant to the onboarding operation.
         """
 
-        # The Network Service package must be in '.tar.gz' format.
-        if not tar_package.is_tar_gz_file(ns_package_path):
-            self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['NSPKG_NOT_VNSFO'])
-
-        extracted_package_path = mkdtemp()
-
-        tar_package.extract_package(ns_package_path, extracted_package_path)
-
-        self.logger.debug('extracted package path: %s', extracted_package_path)
-        self.logger.debug('extracted contents: %s', os.listdir(extracted_package_path))
         self.logger.debug('package data format: %s', data_format)
+        self.logger.debug('NSD path: %s', nsd_file)
+
+        # The Network Service Descriptor is read straight from the package so there's no need to extract it.
+        nsd_data = self._read_package_member(ns_package_path, nsd_file, self.errors['ONBOARD_NS']['NSPKG_NOT_VNSFO'])
 
         # The Network Service package folder must exist. The folder name is the same as the Network Service package
         # one with .tar.gz removed.
-        ns_folder_abs_path = os.path.join(extracted_package_path, tar_package.get_tar_gz_basename(ns_package_path))
-        if not os.path.isdir(ns_folder_abs_path):
+        ns_folder = tar_package.get_tar_gz_basename(ns_package_path)
+        if not self._package_has_folder(ns_package_path, ns_folder, nsd_file if nsd_data is not None else None):
             self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['PKG_MISSING_NS_FOLDER'],
-                                [[ns_folder_abs_path]])
-
-        self.logger.debug('vNSFO package: %s', os.listdir(ns_folder_abs_path))
-        self.logger.debug('NSD path: %s', nsd_file)
+                                [[ns_folder]])
 
         # The Network Service Descriptor must be in the expected location so it's contents can be retrieved.
-        nsd_file_abs_path = os.path.join(extracted_package_path, nsd_file)
-        if not os.path.isfile(nsd_file_abs_path):
+        if nsd_data is None:
             self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['PKG_MISSING_NSD'],
                                 [[nsd_file]])
 
         nsd = None
-        with open(nsd_file_abs_path, 'r') as stream:
-            try:
-                nsd = yaml.load(stream)
+        try:
+            nsd = yaml_utils.load(nsd_data)
 
-            except yaml.YAMLError:
-                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['NSD_FORMAT_INVALID'],
-                                    [[nsd_file]])
+        except yaml_utils.YAMLError:
+            self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['NSD_FORMAT_INVALID'],
+                                [[nsd_file]])
 
         self.logger.debug('NSD\n%s', nsd)
 
@@ -354,66 +343,231 @@ class OsmVnsfoAdapter(VnsfOrchestratorAdapter):
 
             vnsf_ids.append(c_vnfd['vnfd-id-ref'])
 
-        # Get stored vnsfs
-        vnsfds = dict()
-        constituent_vnsfs = list()
-        app = flask.current_app
-        for vnsf_id in vnsf_ids:
-            payload = get_internal('vnsfs', vnsf_id=vnsf_id)[0]['_items']
-
-            # Raise exception if couldn't get the dependent vNSF
-            if not payload:
-                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['MISSING_VNSF_DEPENDENCY'],
-                                    [[vnsf_id, ns_id]])
-
-            payload = payload[0]
-            vnsfds[vnsf_id] = payload['descriptor']
-
-            # Associate this NS with its constituent vNSFs
-            constituent_vnsfs.append(payload['_id'])
-
-        # Persist vNSF descriptors to files
-        vnsfd_files = list()
-        for vnsf_id, vnsfd in vnsfds.items():
-
-            # Load the string content as dict
-            vnsfd_content = yaml.load(vnsfd)
-
-            # Write the content to file
-            filename = os.path.join(extracted_package_path, str(vnsf_id) + '.yaml')
-            with open(filename, 'w') as _f:
-                yaml.dump(vnsfd_content, _f, default_flow_style=False)
-
-            vnsfd_files.append(filename)
-
-        # # Validate NS Descriptor using NSFVal
-        # if data_format == 'OSM-R2':
-        #     val_result = nsfval.validate_ns('osm-r2', 'sit', nsd_file_abs_path, addt_files=vnsfd_files)
-        # elif data_format == 'OSM-R4':
-        #     val_result = nsfval.validate_ns('osm-r4', 'sit', nsd_file_abs_path, addt_files=vnsfd_files)
-        # else:
-        #     val_result = nsfval.validate_ns('osm-r4', 'sit', nsd_file_abs_path, addt_files=vnsfd_files)
-        #
-        # # Build the validation data structure
-        # validation_data.update(val_result)
-        # validation_data['type'] = 'NS'
-        #
-        # # Raise exception if validation errors were found.
-        # if validation_data['result']['error_count'] != 0:
-        #     self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['VALIDATION_ERROR'], [[nsd_file]])
-        # self.logger.debug("NS descriptor '%s' validation PASS", nsd_file)
+        # Get the stored vNSFs all at once.
+        stored_vnsfs = self._find_vnsfs(set(vnsf_ids))
+
+        # Raise exception if couldn't get all the dependent vNSFs
+        missing = sorted(set(vnsf_ids) - set(stored_vnsfs))
+        if missing:
+            missing = ', '.join("'{}'".format(vnsf_id) for vnsf_id in missing)
+            self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['MISSING_VNSF_DEPENDENCY'],
+                                [[missing, ns_id]], 'Missing vNSF dependencies: {}'.format(missing))
+
+        # Associate this NS with its constituent vNSFs
+        constituent_vnsfs = [stored_vnsfs[vnsf_id]['_id'] for vnsf_id in vnsf_ids]
+
+        # Validate the NS Descriptor. The outcome of validating the same descriptors (e.g. resubmitted after failing to
+        # onboard) is reused. Otherwise, when all the vNSFs passed validation, only the NS syntax and links are
+        # validated.
+        if self.validator is not None:
+            # The vNSFs are accounted for by their version, sparing going through their descriptors.
+            vnsf_versions = [[str(stored_vnsfs[vnsf_id]['_id']),
+                              stored_vnsfs[vnsf_id].get('_etag') or stored_vnsfs[vnsf_id].get('_updated')]
+                             for vnsf_id in sorted(stored_vnsfs)]
+            digest = self.validator.digest(data_format, nsd, vnsf_versions)
+            val_result = self._find_validation(digest)
+
+            if val_result is None:
+                val_result = self._validate_ns_links(data_format, nsd_file, nsd_data, nsd_inner, stored_vnsfs)
+
+            if val_result is None:
+                val_result = self._validate_ns_files(data_format, nsd_file, nsd_data, stored_vnsfs)
+
+            if '_id' not in val_result and not isinstance(val_result, AbortedValidation):
+                val_result['digest'] = digest
+
+            # Build the validation data structure
+            validation_data.update(val_result)
+            validation_data['type'] = 'NS'
+
+            # Raise exception if validation errors were found.
+            if validation_data['result']['error_count'] != 0:
+                self.issue.raise_ex(IssueElement.ERROR, self.errors['ONBOARD_NS']['VALIDATION_ERROR'], [[nsd_file]])
+            self.logger.debug("NS descriptor '%s' validation PASS", nsd_file)
 
         # Set the vNSF package data useful for the onboarding operation.
         package_data = {
             'ns_id':             str(ns_id),  # assuming the descriptor only carries one NSD
             'ns_name':           str(ns_name),
-            'descriptor':        str(nsd),
+            'descriptor':        nsd,
             'constituent_vnsfs': constituent_vnsfs
             }
 
-        rmtree(extracted_package_path)
         return package_data
 
+    def _validate_ns_links(self, data_format, nsd_file, nsd_data, nsd, stored_vnsfs):
+        """
+        Validates the Network Service descriptor syntax (with the validator) and then its links and forwarding graphs,
+        reusing the validation of its vNSFs.
+
+        :param data_format: the descriptors data format.
+        :param nsd_file: the path to the Network Service Descriptor file within the package.
+        :param nsd_data: the Network Service Descriptor file contents.
+        :param nsd: the Network Service descriptor (the 'nsd' entry).
+        :param stored_vnsfs: the constituent vNSFs, by vNSF ID.
+        :return: the validation outcome or None if some vNSF wasn't validated or didn't pass validation.
+        """
+
+        validations = self._find_validations([vnsf.get('validation') for vnsf in stored_vnsfs.values()])
+        if any(validations.get(vnsf.get('validation'), 1) != 0 for vnsf in stored_vnsfs.values()):
+            return None
+
+        descriptors_path = mkdtemp()
+        try:
+            nsd_file_abs_path = os.path.join(descriptors_path, os.path.basename(nsd_file))
+            with open(nsd_file_abs_path, 'wb') as _f:
+                _f.write(nsd_data)
+
+            syntax_result = self.validator.validate_ns(data_format, nsd_file_abs_path, [], level=SYNTAX_LEVEL)
+        finally:
+            rmtree(descriptors_path, ignore_errors=True)
+
+        # The links can't be made sense of in a descriptor which isn't well-formed.
+        if isinstance(syntax_result, AbortedValidation) or syntax_result['result']['error_count'] != 0:
+            return syntax_result
+
+        vnfds = dict()
+        for vnsf_id, vnsf in stored_vnsfs.items():
+            vnsfd = descriptors.parse(vnsf['descriptor'])
+            vnfds[vnsf_id] = vnsfd[list(vnsfd.keys())[0]]['vnfd'][0]
+
+        val_result = ns_links.validate(nsd, vnfds)
+
+        # The syntax warnings, if any, are accounted for along with the links ones.
+        val_result['result']['warning_count'] += syntax_result['result'].get('warning_count', 0)
+        val_result['result']['issues'] = syntax_result['result'].get('issues', []) + val_result['result']['issues']
+
+        # Refer to the vNSFs validation rather than copying it.
+        for vnf in val_result['topology']['vnfs']:
+            vnf['validation'] = str(stored_vnsfs[vnf['vnsf_id']]['validation'])
+
+        return val_result
+
+    def _validate_ns_files(self, data_format, nsd_file, nsd_data, stored_vnsfs):
+        """
+        Validates the Network Service descriptor along with the descriptors of its vNSFs, out of process as the
+        validator expects these in files.
+
+        :param data_format: the descriptors data format.
+        :param nsd_file: the path to the Network Service Descriptor file within the package.
+        :param nsd_data: the Network Service Descriptor file contents.
+        :param stored_vnsfs: the constituent vNSFs, by vNSF ID.
+        :return: the validation outcome.
+        """
+
+        descriptors_path = mkdtemp()
+        try:
+            nsd_file_abs_path = os.path.join(descriptors_path, os.path.basename(nsd_file))
+            with open(nsd_file_abs_path, 'wb') as _f:
+                _f.write(nsd_data)
+
+            # Persist vNSF descriptors to files
+            vnsfd_files = list()
+            for vnsf_id, vnsf in stored_vnsfs.items():
+
+                # The same vNSF is usually part of many NSs so its descriptor YAML is cached while the vNSF is
+                # unchanged.
+                vnsfd_yaml = descriptors.to_yaml(vnsf['_id'], vnsf.get('_etag') or vnsf.get('_updated'),
+                                                 vnsf['descriptor'])
+
+                # Write the content to file
+                filename = os.path.join(descriptors_path, str(vnsf_id) + '.yaml')
+                with open(filename, 'w') as _f:
+                    _f.write(vnsfd_yaml)
+
+                vnsfd_files.append(filename)
+
+            return self.validator.validate_ns(data_format, nsd_file_abs_path, vnsfd_files)
+
+        finally:
+            rmtree(descriptors_path, ignore_errors=True)
+
+    @staticmethod
+    def _find_vnsfs(vnsf_ids):
+        """
+        Looks up the stored vNSFs in a single database query.
+
+        :param vnsf_ids: the vNSF IDs to look up.
+        :return: the vNSFs found (only their '_id', version, 'descriptor' and 'validation') by vNSF ID.
+        """
+
+        app = flask.current_app
+        source = app.config['DOMAIN']['vnsfs']['datasource']['source']
+        vnsfs = app.data.driver.db[source].find({'vnsf_id': {'$in': list(vnsf_ids)}},
+                                                {'_id': 1, 'vnsf_id': 1, '_etag': 1, '_updated': 1, 'descriptor': 1,
+                                                 'validation': 1})
+
+        return {vnsf['vnsf_id']: vnsf for vnsf in vnsfs}
+
+    @staticmethod
+    def _find_validations(validation_ids):
+        """
+        Looks up the outcome of the given validations in a single database query.
+
+        :param validation_ids: the '_id' of the validations to look up. None values are ignored.
+        :return: the errors count of the validations found, by '_id'.
+        """
+
+        validation_ids = [validation_id for validation_id in validation_ids if validation_id is not None]
+        if not validation_ids:
+            return dict()
+
+        app = flask.current_app
+        source = app.config['DOMAIN']['validation']['datasource']['source']
+        validations = app.data.driver.db[source].find({'_id': {'$in': validation_ids}}, {'result.error_count': 1})
+
+        return {validation['_id']: validation['result']['error_count'] for validation in validations}
+
+    @staticmethod
+    def _find_validation(digest):
+        """
+        Looks up the outcome of a former validation of the same descriptors.
+
+        :param digest: the digest of the descriptors validated, as per the validator.
+        :return: the validation kept (its '_id' and outcome) or None if there's none.
+        """
+
+        app = flask.current_app
+        source = app.config['DOMAIN']['validation']['datasource']['source']
+
+        return app.data.driver.db[source].find_one({'digest': digest},
+                                                   {'_id': 1, 'result': 1, 'topology': 1, 'fwgraph': 1, 'log': 1,
+                                                    'digest': 1})
+
+    def _read_package_member(self, package_path, member_name, not_vnsfo_error):
+        """
+        Reads a file from an Orchestrator package (.tar.gz) without extracting it.
+
+        :param package_path: The file system path to the package (.tar.gz) file.
+        :param member_name: The path to the file within the package.
+        :param not_vnsfo_error: The error to raise when the package is not in the '.tar.gz' format.
+
+        :return: The file contents or None if the package doesn't hold it.
+        """
+
+        try:
+            return tar_package.read_member(package_path, member_name)
+
+        except (tarfile.TarError, EOFError, OSError):
+            self.issue.raise_ex(IssueElement.ERROR, not_vnsfo_error)
+
+    def _package_has_folder(self, package_path, folder_name, found_member=None):
+        """
+        Checks whether an Orchestrator package holds the expected folder.
+
+        :param package_path: The file system path to the package (.tar.gz) file.
+        :param folder_name: The folder name within the package.
+        :param found_member: (optional) The path of a file already found in the package. When it lies within the
+        folder there's no need to scan the package again.
+
+        :return: Whether the folder is present in the package.
+        """
+
+        if found_member is not None and os.path.normpath(found_member).startswith(folder_name + os.sep):
+            return True
+
+        return tar_package.has_folder(package_path, folder_name)
+
     def _get_osm_version(self, data_format):
         """Check data format to compose onboard endpoint url. If no match defaults to OSM-R2"""
         data_format = data_format.upper()
@@ -25,6 +25,8 @@
 # of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
 
 
+import threading
+
 from storeutils import error_utils
 
 from .osm_vnsfo import OsmVnsfoAdapter
@@ -37,12 +39,37 @@ class VnsfoNotSupported(error_utils.ExceptionMessage):
 class VnsfoFactory(object):
     """
     Orchestrator factory for vNSF.
+
+    The Orchestrator instances are shared process-wide, one per Orchestrator location, so the HTTP connections to the
+    Orchestrator are kept alive and reused between calls.
     """
 
-    @staticmethod
-    def get_orchestrator(kind, protocol, server, port, api_basepath, logger=None):
+    # Currently supported Orchestrator.
+    supported = {
+        'OSM': OsmVnsfoAdapter,
+        }
+
+    # HTTP session settings for the Orchestrator instances, as in VnsfOrchestratorAdapter.
+    session_settings = dict()
+
+    _orchestrators = dict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, **session_settings):
+        """
+        Sets the HTTP session settings for the Orchestrator instances, e.g. timeouts and retries. Applies to the
+        instances yet to be created.
+
+        :param session_settings: the settings, as in VnsfOrchestratorAdapter.
         """
-        Instantiates the vNSFO Orchestrator following the type provided.
+
+        cls.session_settings = session_settings
+
+    @classmethod
+    def get_orchestrator(cls, kind, protocol, server, port, api_basepath, logger=None):
+        """
+        Provides the vNSFO Orchestrator following the type provided.
 
         :param kind: the Orchestrator to instantiate.
         :param protocol: HTTP or HTTPS.
@@ -52,13 +79,16 @@ class VnsfoFactory(object):
         :return: the proper vNSF Orchestrator instance.
         """
 
-        # Currently supported Orchestrator.
-        supported = {
-            'OSM': OsmVnsfoAdapter,
-            }
-
-        orchestrator = supported.get(kind)(protocol, server, port, api_basepath, logger)
-        if orchestrator is None:
+        if kind not in cls.supported:
             raise VnsfoNotSupported("Requested orchestrator isn't supported.")
 
+        key = (kind, protocol, server, port, api_basepath)
+
+        with cls._lock:
+            orchestrator = cls._orchestrators.get(key)
+            if orchestrator is None:
+                orchestrator = cls.supported[kind](protocol, server, port, api_basepath, logger,
+                                                   **cls.session_settings)
+                cls._orchestrators[key] = orchestrator
+
         return orchestrator
@@ -27,8 +27,12 @@
 
 import logging
 
+import requests
 from abc import abstractmethod, ABCMeta
+from requests.adapters import HTTPAdapter
 from storeutils import http_utils
+from storeutils.circuit_breaker import CircuitBreaker, OPEN
+from urllib3.util.retry import Retry
 from storeutils.error_utils import ExceptionMessage, IssueHandling, IssueElement
 
 
@@ -160,7 +164,7 @@ class VnsfOrchestratorAdapter(object, metaclass=ABCMeta):
                 IssueElement.EXCEPTION.name: NsInvalidFormat('Can not read NS descriptor')
             },
             'MISSING_VNSF_DEPENDENCY': {
-                IssueElement.ERROR.name: ["Missing vNSF dependency '{}' in NS '{}'"],
+                IssueElement.ERROR.name: ["Missing vNSF dependencies {} in NS '{}'"],
                 IssueElement.EXCEPTION.name: NsMissingDependency('NS Dependency not available')
             },
             'VALIDATION_ERROR': {
@@ -181,6 +185,13 @@ class VnsfOrchestratorAdapter(object, metaclass=ABCMeta):
                 },
             },
 
+        'AVAILABILITY': {
+            'VNSFO_UNAVAILABLE': {
+                IssueElement.ERROR.name: ['Orchestrator at {} deemed unavailable. Retry in {} seconds'],
+                IssueElement.EXCEPTION.name: VnsfOrchestratorUnreacheable('Orchestrator unavailable')
+                },
+            },
+
         'POLICY': {
             'POLICY_ISSUE': {
                 IssueElement.ERROR.name: ['vNFSO policy at {}. Status: {}'],
@@ -193,14 +204,126 @@ class VnsfOrchestratorAdapter(object, metaclass=ABCMeta):
             }
         }
 
-    def __init__(self, protocol, server, port, api_basepath, logger=None):
+    # Only the calls which can be safely repeated are retried once the request reaches the Orchestrator.
+    IDEMPOTENT_METHODS = frozenset(['HEAD', 'GET', 'PUT', 'DELETE', 'OPTIONS', 'TRACE'])
+
+    # Replies worth retrying, as the Orchestrator (or the proxy in front of it) is momentarily unavailable.
+    RETRY_STATUS = frozenset([http_utils.HTTP_502_BAD_GATEWAY, http_utils.HTTP_503_SERVICE_UNAVAILABLE,
+                              http_utils.HTTP_504_TIMEOUT])
+
+    def __init__(self, protocol, server, port, api_basepath, logger=None, connect_timeout=None, read_timeout=None,
+                 retries=0, backoff_factor=0, pool_size=10, failure_threshold=5, reset_timeout=30, validator=None):
+        """
+        :param protocol: HTTP or HTTPS.
+        :param server: the server name or IP address.
+        :param port: the TCP port to reach the Orchestrator.
+        :param api_basepath: the Ochestrator base path to its API.
+        :param connect_timeout: the time (in seconds) to wait for the connection to the Orchestrator.
+        :param read_timeout: the time (in seconds) to wait for the Orchestrator to reply.
+        :param retries: the number of times a failed call is retried.
+        :param backoff_factor: the factor (in seconds) for the exponential wait between retries.
+        :param pool_size: the number of connections kept alive with the Orchestrator.
+        :param failure_threshold: the number of consecutive failed calls after which the Orchestrator is deemed
+        unavailable.
+        :param reset_timeout: the time (in seconds) the Orchestrator is deemed unavailable before trying it again.
+        :param validator: the descriptors validation stage (as in storeutils.validation_engine.ValidationEngine).
+        Descriptors aren't validated when None.
+        """
+
         self.logger = logger or logging.getLogger(__name__)
         self.issue = IssueHandling(self.logger)
 
         self.basepath = http_utils.build_url(server, port, api_basepath, protocol)
-
         self.logger.debug('vNSF Orchestrator API at: %s', self.basepath)
 
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = self._build_session(retries, backoff_factor, pool_size)
+        self.breaker = CircuitBreaker(self.basepath, failure_threshold, reset_timeout, self.logger)
+
+        self.validator = validator
+
+    def ensure_available(self):
+        """
+        Fails fast when the Orchestrator is deemed unavailable, sparing the work bound to fail.
+
+        :raise: VnsfOrchestratorUnreacheable: When the Orchestrator is deemed unavailable.
+        """
+
+        if self.breaker.state == OPEN:
+            self.issue.raise_ex(IssueElement.ERROR, self.errors['AVAILABILITY']['VNSFO_UNAVAILABLE'],
+                                [[self.basepath, self.breaker.retry_after()]])
+
+    def probe(self):
+        """
+        Checks whether the Orchestrator is reachable, feeding the outcome to the circuit breaker. Any reply other than
+        a gateway/availability error means the Orchestrator is up.
+
+        :return: True if the Orchestrator is reachable, False otherwise.
+        """
+
+        try:
+            r = self.session.get(self.basepath, timeout=self.timeout)
+            available = r.status_code not in self.RETRY_STATUS
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            available = False
+
+        if available:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+        return available
+
+    def _request(self, method, url, **kwargs):
+        """
+        Calls the Orchestrator REST interface, failing fast when the Orchestrator is deemed unavailable and keeping
+        track of the calls outcome otherwise.
+
+        :param method: the HTTP method.
+        :param url: the URL to call.
+        :param kwargs: the remaining requests library arguments.
+        :return: the Orchestrator reply.
+        :raise: VnsfOrchestratorUnreacheable: When the Orchestrator is deemed unavailable.
+        """
+
+        self.ensure_available()
+
+        try:
+            r = self.session.request(method, url, timeout=self.timeout, **kwargs)
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            self.breaker.record_failure()
+            raise
+
+        if r.status_code in self.RETRY_STATUS:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+        return r
+
+    def _build_session(self, retries, backoff_factor, pool_size):
+        """
+        Builds the HTTP session to talk to the Orchestrator, keeping the connections alive between calls.
+
+        :param retries: the number of times a failed call is retried.
+        :param backoff_factor: the factor (in seconds) for the exponential wait between retries.
+        :param pool_size: the number of connections kept alive with the Orchestrator.
+        :return: the HTTP session.
+        """
+
+        retry = Retry(total=retries, backoff_factor=backoff_factor, method_whitelist=self.IDEMPOTENT_METHODS,
+                      status_forcelist=self.RETRY_STATUS, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.verify = False
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        return session
+
     @abstractmethod
     def apply_policy(self, tenant_id, policy, data_format):
         """
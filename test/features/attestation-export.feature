@@ -0,0 +1,44 @@
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+
+Feature: Attestation Export
+  Validates the export of the attestation files of many vNSFs at once.
+
+
+  @coverage
+  Scenario: Exporting vNSF attestation files
+    Given I mock the vNSFO response with vnsf/mock-onboard-success-cirros_vnsf.json
+    When I onboard a vNSF vnsf/shield_cirros_vnsf.tar.gz
+    Then I expect the response code 201
+    When I export the attestation of the vNSF onboarded along with unknown_vnsf
+    Then I expect the response code 200
+    Then I expect the export index to account for every vNSF requested
+
+
+  @coverage
+  Scenario: Listing the attestations of every vNSF
+    When I ask for the attestations of every vNSF
+    Then I expect the response code 400
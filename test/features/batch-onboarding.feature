@@ -0,0 +1,80 @@
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+
+Feature: Batch Onboarding
+  Validates the onboarding of many packages in a single request, be it as many packages or as bundles of packages.
+
+
+  @coverage
+  Scenario Outline: Onboarding many vNSF packages at once
+    Given I mock the vNSFO response with <mock_file>
+    When I batch onboard the vNSF packages <packages>
+    Then I expect the response code 200
+    Then I expect the batch outcome codes to be <codes>
+
+    Examples:
+      | mock_file                                  | packages                                                                 | codes       |
+      # Every package onboarded.
+      | vnsf/mock-onboard-success-cirros_vnsf.json | vnsf/shield_cirros_vnsf.tar.gz,vnsf/shield_l23filter_vnsf.tar.gz         | 201,201     |
+      # A package which isn't a SHIELD one only fails its own onboarding.
+      | vnsf/mock-onboard-success-cirros_vnsf.json | vnsf/shield_cirros_vnsf.tar.gz,vnsf/shield_cirros_vnsf.other_format.zip  | 201,406     |
+      # vNSFO failure.
+      | vnsf/mock-onboard-failure-cirros_vnsf.json | vnsf/shield_cirros_vnsf.tar.gz                                           | 428         |
+
+
+  @coverage
+  Scenario Outline: Onboarding bundles of vNSF packages
+    Given I mock the vNSFO response with <mock_file>
+    When I batch onboard a bundle of the vNSF packages <packages>
+    Then I expect the response code 200
+    Then I expect the batch outcome codes to be <codes>
+
+    Examples:
+      | mock_file                                  | packages                                                                 | codes       |
+      | vnsf/mock-onboard-success-cirros_vnsf.json | vnsf/shield_cirros_vnsf.tar.gz,vnsf/shield_l23filter_vnsf.tar.gz         | 201,201     |
+      | vnsf/mock-onboard-success-cirros_vnsf.json | vnsf/shield_cirros_vnsf.tar.gz,vnsf/shield_cirros_vnsf.other_format.zip  | 201,406     |
+
+
+  @coverage
+  Scenario: Onboarding a NS along with the vNSFs it's made of
+    When I start following the catalogue changes
+    Then I expect the response code 200
+    Given I mock the vNSFO response with ns/mock-onboard-success-cirros_ns.json
+    # The NS package comes first yet it's onboarded once its vNSF is.
+    When I batch onboard the NS packages ns/shield_cirros_ns.tar.gz,vnsf/shield_cirros_vnsf.tar.gz
+    Then I expect the response code 200
+    Then I expect the batch outcome codes to be 201,201
+    When I wait for the catalogue changes following the batch
+    Then I expect the response code 200
+    Then I expect the vNSFs inserted ahead of the NSs among the changes
+
+
+  @coverage
+  Scenario: Onboarding NS packages in a vNSF batch
+    Given I mock the vNSFO response with vnsf/mock-onboard-success-cirros_vnsf.json
+    When I batch onboard the vNSF packages vnsf/shield_cirros_vnsf.tar.gz,ns/shield_cirros_ns.tar.gz
+    Then I expect the response code 200
+    Then I expect the batch outcome codes to be 201,406
@@ -0,0 +1,45 @@
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+
+Feature: Cursor Pagination
+  Validates paging through the vNSFs with a cursor rather than by page number.
+
+
+  @coverage
+  Scenario Outline: Paging through vNSFs with a cursor
+    Given I mock the vNSFO response with vnsf/mock-onboard-success-cirros_vnsf.json
+    When I onboard a vNSF vnsf/shield_cirros_vnsf.tar.gz
+    Then I expect the response code 201
+    When I onboard a vNSF vnsf/shield_cirros_vnsf.tar.gz
+    Then I expect the response code 201
+    When I page through the vNSFs with a cursor on <key>, <max_results> at a time
+    Then I expect every vNSF once and in order
+
+    Examples:
+      | key      | max_results |
+      | _id      | 1           |
+      | _id      | 2           |
+      | _updated | 1           |
@@ -0,0 +1,80 @@
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+
+Feature: Descriptor Validation
+  Validates the vNSF and NS descriptors on onboarding. A NS whose vNSFs passed validation has its syntax validated
+  along with its links.
+
+
+  @coverage
+  Scenario: Onboarding a vNSF with a valid descriptor
+    Given I mock the vNSFO response with vnsf/mock-onboard-success-cirros_vnsf.json
+    When I onboard a vNSF vnsf/shield_cirros_vnsf.tar.gz
+    Then I expect the response code 201
+    Then I expect the vNSF onboarded to have passed validation
+
+
+  @coverage
+  Scenario: Onboarding a vNSF with an invalid descriptor
+    Given I mock the vNSFO response with vnsf/mock-onboard-success-cirros_vnsf.json
+    When I onboard a vNSF vnsf/shield_cirros_vnsf_wrong_descriptor_syntax.tar.gz
+    Then I expect the response code 422
+    Then I expect the JSON response to be as in vnsf/onboard-failure-wrong_descriptor_syntax.json
+    Then I expect the validation to report the vNSF descriptor errors
+
+
+  @coverage
+  Scenario: Onboarding a NS with valid descriptors
+    Given I mock the vNSFO response with vnsf/mock-onboard-success-cirros_vnsf.json
+    When I onboard a vNSF vnsf/shield_cirros_vnsf.tar.gz
+    Then I expect the response code 201
+    Given I mock the vNSFO response with ns/mock-onboard-success-cirros_ns.json
+    When I onboard a NS ns/shield_cirros_ns.tar.gz
+    Then I expect the response code 201
+    Then I expect the NS onboarded to have passed validation
+
+
+  @coverage
+  Scenario: Onboarding a NS with an invalid descriptor
+    Given I mock the vNSFO response with vnsf/mock-onboard-success-cirros_vnsf.json
+    When I onboard a vNSF vnsf/shield_cirros_vnsf.tar.gz
+    Then I expect the response code 201
+    Given I mock the vNSFO response with ns/mock-onboard-success-cirros_ns.json
+    When I onboard a NS ns/shield_cirros_ns_wrong_descriptor_syntax.tar.gz
+    Then I expect the response code 422
+    Then I expect the JSON response to be as in ns/onboard-failure-wrong_descriptor_syntax.json
+    Then I expect the validation to report the NS descriptor errors
+
+
+  @coverage
+  Scenario: Resubmitting a vNSF the vNSFO failed to onboard
+    Given I mock the vNSFO response with vnsf/mock-onboard-failure-cirros_vnsf.json
+    When I onboard a vNSF vnsf/shield_cirros_vnsf.tar.gz
+    Then I expect the response code 428
+    # The descriptor is the same so its validation is too.
+    When I resubmit the vNSF vnsf/shield_cirros_vnsf.tar.gz
+    Then I expect the response code 428
+    Then I expect the validation of the former submission reused
@@ -0,0 +1,45 @@
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+
+Feature: Background Onboarding
+  Validates the onboarding of packages in the background, through onboarding jobs.
+
+
+  @coverage
+  Scenario Outline: Onboarding vNSF packages in the background
+    Given I mock the vNSFO response with <mock_file>
+    When I submit the vNSF <package> for background onboarding
+    Then I expect the response code 202
+    Then I expect the onboarding job to end up <state> with code <status>
+
+    Examples:
+      | mock_file                                  | package                                  | state     | status |
+      # Sucessful Store and the vNSFO operation.
+      | vnsf/mock-onboard-success-cirros_vnsf.json | vnsf/shield_cirros_vnsf.tar.gz           | succeeded | 201    |
+      # vNSFO failure.
+      | vnsf/mock-onboard-failure-cirros_vnsf.json | vnsf/shield_cirros_vnsf.tar.gz           | failed    | 428    |
+      # SHIELD package format isn't compliant.
+      | vnsf/mock-onboard-success-cirros_vnsf.json | vnsf/shield_cirros_vnsf.wrong_format.tar | failed    | 412    |
@@ -0,0 +1,48 @@
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+
+Feature: Response Cache
+  Validates the catalogue reads are served from the cache until the catalogue is written to.
+
+
+  @coverage
+  Scenario: Reading the catalogue while it's written to
+    When I look up the validations of this scenario
+    Then I expect the response code 200
+    Then I expect 0 validations found
+    When I look up the validations of this scenario
+    Then I expect 0 validations found
+    Then I expect the lookup served from the cache
+    # Adding to the catalogue invalidates the lookup cached.
+    When I add a validation for this scenario
+    Then I expect the response code 201
+    When I look up the validations of this scenario
+    Then I expect 1 validations found
+    # So does removing from it.
+    When I remove the validation added
+    Then I expect the response code 204
+    When I look up the validations of this scenario
+    Then I expect 0 validations found
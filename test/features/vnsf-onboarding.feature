@@ -72,4 +72,10 @@ Feature: vNSF Onboarding
       | vnsf/mock-onboard-success-cirros_vnsf.json | vnsf/shield_cirros_vnsf.impersonate_vnsfo.tar.gz  | 428    | vnsf/onboard-failure-impersonate_vnsfo.json     |
       # Manifest key for vNSF isn't compliant.
       | vnsf/mock-onboard-success-cirros_vnsf.json | vnsf/shield_cirros_vnsf_wrong_manifest_key.tar.gz | 406    | vnsf/onboard-failure-wrong_manifest_key.json |
+      # Attestation file changed after the manifest was issued.
+      | vnsf/mock-onboard-success-cirros_vnsf.json | vnsf/shield_cirros_vnsf.tampered_attestation.tar.gz | 406  | vnsf/onboard-failure-tampered_attestation.json |
+      # Package digest doesn't match the manifest.
+      | vnsf/mock-onboard-success-cirros_vnsf.json | vnsf/shield_cirros_vnsf.digest_mismatch.tar.gz    | 406    | vnsf/onboard-failure-digest_mismatch.json    |
+      # Manifest lacks the package digest.
+      | vnsf/mock-onboard-success-cirros_vnsf.json | vnsf/shield_cirros_vnsf.incomplete_manifest.tar.gz | 406   | vnsf/onboard-failure-incomplete_manifest.json |
 
@@ -0,0 +1,66 @@
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+
+Feature: vNSFO Availability
+  Validates the Store fails fast while the vNSFO is deemed unavailable and gets back to it once it recovers. The vNSFO
+  is deemed unavailable after VNSFO_FAILURE_THRESHOLD consecutive failures (3 in the QA environment).
+
+
+  @coverage
+  Scenario: Failing fast while the vNSFO is unavailable
+    Given I mock the vNSFO response with vnsf/mock-onboard-unavailable.json
+    When I onboard a vNSF vnsf/shield_cirros_vnsf_2.tar.gz
+    Then I expect the response code 428
+    When I onboard a vNSF vnsf/shield_cirros_vnsf_2.tar.gz
+    Then I expect the response code 428
+    When I onboard a vNSF vnsf/shield_cirros_vnsf_2.tar.gz
+    Then I expect the response code 428
+    # The circuit is open so the vNSFO isn't even reached.
+    When I onboard a vNSF vnsf/shield_cirros_vnsf_2.tar.gz
+    Then I expect the response code 503
+    Then I expect to be told when to retry
+    When I ask whether the Store is ready
+    Then I expect the response code 503
+    Then I expect the vNSFO circuit to be open
+    # Once the reset timeout elapses a call is let through, closing the circuit when it succeeds.
+    Given I mock the vNSFO response with vnsf/mock-onboard-success-cirros_vnsf.json
+    When I wait for the vNSFO circuit to let calls through
+    When I onboard a vNSF vnsf/shield_cirros_vnsf_2.tar.gz
+    Then I expect the response code 201
+    When I ask whether the Store is ready
+    Then I expect the response code 200
+    Then I expect the vNSFO circuit to be closed
+
+
+  @coverage
+  Scenario: Onboarding calls to the vNSFO aren't retried
+    Given I mock the vNSFO response with vnsf/mock-onboard-unavailable.json
+    When I onboard a vNSF vnsf/shield_cirros_vnsf_2.tar.gz
+    Then I expect the response code 428
+    # The same vNSFO adapter serves every request, and the onboarding went through once.
+    When I ask whether the Store is ready
+    Then I expect the response code 200
+    Then I expect the vNSFO failures counted to be 1
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+"""
+Stand-in for NSFVal in the Quality Assurance environment, so the features don't depend on the NSFVal service. It
+provides the validation functions NSFVal does, checking the descriptors syntax alone: each vNSF and NS descriptor entry
+must only hold known keys.
+"""
+
+import yaml
+
+__version__ = '0.1'
+
+# The keys known for each descriptor entry (namespace prefixes aside).
+KNOWN_KEYS = {
+    'vnfd': {'id', 'name', 'short-name', 'vendor', 'logo', 'description', 'version', 'vnf-configuration',
+             'mgmt-interface', 'internal-vld', 'ip-profiles', 'connection-point', 'vdu', 'vdu-dependency',
+             'service-function-chain', 'service-function-type', 'http-endpoint', 'scaling-group-descriptor',
+             'monitoring-param', 'placement-groups'},
+    'nsd':  {'id', 'name', 'short-name', 'vendor', 'logo', 'description', 'version', 'connection-point',
+             'scaling-group-descriptor', 'vnffgd', 'ip-profiles', 'vld', 'constituent-vnfd', 'vnf-dependency',
+             'service-primitive', 'initial-config-primitive', 'terminate-config-primitive', 'input-parameter-xpath',
+             'parameter-pool', 'key-pair', 'user', 'placement-groups', 'monitoring-param'},
+    }
+
+
+def _unprefixed(key):
+    return str(key).rsplit(':', 1)[-1]
+
+
+def _check_syntax(path):
+    """
+    :param path: the file system path to the descriptor.
+    :return: the issues found.
+    """
+
+    try:
+        with open(path) as f:
+            descriptor = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as e:
+        return ["Descriptor '{}' not readable: {}".format(path, e)]
+
+    if not isinstance(descriptor, dict) or not descriptor:
+        return ["Descriptor '{}' holds no catalog".format(path)]
+
+    issues = list()
+    for catalog in descriptor.values():
+        for kind, entries in (catalog or {}).items():
+            known = KNOWN_KEYS.get(_unprefixed(kind))
+            if known is None:
+                issues.append("Unknown descriptor kind '{}'".format(kind))
+                continue
+
+            for entry in entries or []:
+                issues.extend("Unknown key '{}' in {} '{}'".format(key, _unprefixed(kind), entry.get('id'))
+                              for key in entry if _unprefixed(key) not in known)
+
+    return issues
+
+
+def _outcome(issues):
+    return {
+        'result':   {'error_count': len(issues), 'warning_count': 0,
+                     'issues': [{'level': 'error', 'message': issue} for issue in issues]},
+        'topology': {},
+        'fwgraph':  {},
+        'log':      'Syntax validated: {} errors'.format(len(issues)),
+        }
+
+
+def validate_vnf(data_format, level, path):
+    return _outcome(_check_syntax(path))
+
+
+def validate_ns(data_format, level, path, addt_files=None):
+    issues = _check_syntax(path)
+    for vnfd_path in addt_files or []:
+        issues.extend(_check_syntax(vnfd_path))
+
+    return _outcome(issues)
@@ -24,7 +24,13 @@ world.env = {
 
 world.endpoints = {
     'vnsfs': '{}/{}'.format(world.env['hosts']['backend_api']['host'], 'vnsfs'),
-    'nss': '{}/{}'.format(world.env['hosts']['backend_api']['host'], 'nss')
+    'nss': '{}/{}'.format(world.env['hosts']['backend_api']['host'], 'nss'),
+    'jobs': '{}/{}'.format(world.env['hosts']['backend_api']['host'], 'jobs'),
+    'attestation_export': '{}/{}'.format(world.env['hosts']['backend_api']['host'], 'attestation/vnsfs/export'),
+    'changes': '{}/{}'.format(world.env['hosts']['backend_api']['host'], 'changes'),
+    'validation': '{}/{}'.format(world.env['hosts']['backend_api']['host'], 'validation'),
+    'ready': '{}/{}'.format(world.env['hosts']['backend_api']['host'], 'ready'),
+    'stats': '{}/{}'.format(world.env['hosts']['backend_api']['host'], 'stats')
     }
 
 world.mock_vnsfo_endpoints = {
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import io
+import json
+import re
+import tarfile
+from radish import then, when, world
+from storetestingutils.steps_utils import *
+
+
+@when(re.compile(u'I export the attestation of the vNSF onboarded along with (\w+)'))
+def attestation_export(step, unknown_vnsf_id):
+    http_get(step, '{}/{}'.format(world.endpoints['vnsfs'], step.context.api['response']['json']['_id']))
+    step.context.export = {'vnsf_id': step.context.api['response']['json']['vnsf_id'],
+                           'unknown_vnsf_id': unknown_vnsf_id}
+
+    http_get(step, '{}?vnsf_id={},{}'.format(world.endpoints['attestation_export'], step.context.export['vnsf_id'],
+                                             unknown_vnsf_id))
+
+
+@when(u'I ask for the attestations of every vNSF')
+def attestation_list(step):
+    # The attestation resource the export hangs off.
+    http_get(step, world.endpoints['attestation_export'].rsplit('/', 1)[0])
+
+
+@then(u'I expect the export index to account for every vNSF requested')
+def attestation_export_index(step):
+    with tarfile.open(fileobj=io.BytesIO(step.context.api['response']['content']), mode='r:') as tar:
+        members = tar.getmembers()
+
+        # The index is the last member.
+        assert members[-1].name == 'index.json', [member.name for member in members]
+        index = json.loads(tar.extractfile(members[-1]).read().decode('utf-8'))
+
+        files = {member.name: tar.extractfile(member).read() for member in members[:-1]}
+
+    # The same vNSF may have been onboarded more than once.
+    attestations = [attestation for attestation in index['attestations']
+                    if attestation['vnsf_id'] == step.context.export['vnsf_id']]
+    assert attestations, index
+
+    for attestation in attestations:
+        contents = files[attestation['filename']]
+        assert attestation['size'] == len(contents), index
+        assert attestation['sha256'] == hashlib.sha256(contents).hexdigest(), index
+
+    assert index['missing'] == [step.context.export['unknown_vnsf_id']], index
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+import re
+import requests
+from radish import then, when, world
+from storetestingutils.steps_utils import *
+
+# The longest time (in seconds) a long-poll waits for changes.
+CHANGES_WAIT = 10
+
+
+def changes_get(step, params):
+    r = requests.get(world.endpoints['changes'], params=params)
+    set_http_response(step, r)
+
+
+@when(u'I start following the catalogue changes')
+def changes_follow(step):
+    changes_get(step, {'wait': 0})
+    step.context.changes = {'cursor': step.context.api['response']['json']['_meta']['cursor']}
+
+
+@when(u'I wait for the catalogue changes following the onboarding')
+def changes_wait(step):
+    step.context.changes['document'] = step.context.api['response']['json']['_id']
+    changes_get(step, {'since': step.context.changes['cursor'], 'wait': CHANGES_WAIT})
+
+
+@when(u'I wait for the catalogue changes following the batch')
+def changes_wait_batch(step):
+    changes_get(step, {'since': step.context.changes['cursor'], 'wait': CHANGES_WAIT})
+
+
+@when(re.compile(u'I ask for the catalogue changes since (.*)'))
+def changes_since(step, since):
+    changes_get(step, {'since': since, 'wait': 0})
+
+
+@then(re.compile(u'I expect the vNSF onboarded among the changes, (\w+)'))
+def changes_onboarded(step, change):
+    changes = step.context.api['response']['json']
+    cursor = step.context.changes['cursor']
+
+    seqs = [item['seq'] for item in changes['_items']]
+    assert seqs == list(range(cursor + 1, cursor + 1 + len(seqs))), changes
+    assert changes['_meta']['cursor'] == seqs[-1], changes
+
+    assert any(item['resource'] == 'vnsfs' and item['change'] == change and
+               item['document'] == step.context.changes['document'] for item in changes['_items']), changes
+
+
+@then(u'I expect the vNSFs inserted ahead of the NSs among the changes')
+def changes_vnsfs_first(step):
+    changes = step.context.api['response']['json']
+
+    inserted = [item['resource'] for item in changes['_items'] if item['change'] == 'inserted']
+    assert 'vnsfs' in inserted and 'nss' in inserted, changes
+    assert max(i for i, resource in enumerate(inserted) if resource == 'vnsfs') < inserted.index('nss'), changes
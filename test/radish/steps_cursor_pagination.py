@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+import re
+import requests
+from email.utils import parsedate_to_datetime
+from radish import then, when, world
+from storetestingutils.steps_utils import *
+
+# The most pages followed, should the cursor never end.
+MAX_PAGES = 1000
+
+
+@when(re.compile(u'I page through the vNSFs with a cursor on (\w+), (\d+) at a time'))
+def vnsf_cursor_pages(step, key, max_results):
+    step.context.paging = {'key': key, 'items': []}
+
+    cursor = key
+    for _ in range(MAX_PAGES):
+        r = requests.get(world.endpoints['vnsfs'], params={'cursor': cursor, 'max_results': max_results})
+        set_http_response(step, r)
+        assert r.status_code == 200, r.text
+
+        page = r.json()
+        assert len(page['_items']) <= int(max_results), page
+        step.context.paging['items'].extend(page['_items'])
+
+        cursor = page['_meta']['cursor']
+        if cursor is None:
+            assert 'next' not in page['_links'], page
+            break
+        assert 'next' in page['_links'], page
+
+
+@then(u'I expect every vNSF once and in order')
+def vnsf_cursor_every_vnsf(step):
+    http_get(step, world.endpoints['vnsfs'])
+    total = step.context.api['response']['json']['_meta']['total']
+
+    key = step.context.paging['key']
+    items = step.context.paging['items']
+
+    ids = [item['_id'] for item in items]
+    assert len(ids) == len(set(ids)) == total, (len(ids), len(set(ids)), total)
+
+    # Ties are sorted by '_id'.
+    if key == '_id':
+        order = ids
+    else:
+        order = [(parsedate_to_datetime(item[key]), item['_id']) for item in items]
+    assert order == sorted(order), order
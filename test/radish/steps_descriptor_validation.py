@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+from radish import then, when, world
+from storetestingutils.steps_utils import *
+
+# The resource each kind of descriptor is onboarded to.
+RESOURCES = {'vNSF': 'vnsfs', 'NS': 'nss'}
+
+
+def validation_get(step, validation_id):
+    http_get(step, '{}/{}'.format(world.endpoints['validation'], validation_id))
+    return step.context.api['response']['json']
+
+
+@when(re.compile(u'I resubmit the vNSF (.*)'))
+def vnsf_resubmit(step, package):
+    # The validation of the former submission, to compare with.
+    step.context.validation = step.context.api['response']['json'].get('validation')
+
+    mock_vnsfo_response(step, 'onboard_vnsf')
+    with open(os.path.join(world.env['data']['input_data'], package), 'rb') as f:
+        http_post_file(step, world.endpoints['vnsfs'], {'package': f})
+
+
+@then(re.compile(u'I expect the (vNSF|NS) onboarded to have passed validation'))
+def validation_passed(step, kind):
+    http_get(step, '{}/{}'.format(world.endpoints[RESOURCES[kind]], step.context.api['response']['json']['_id']))
+    document = step.context.api['response']['json']
+    assert 'validation' in document, document
+
+    validation = validation_get(step, document['validation'])
+    assert validation['type'] == kind, validation
+    assert validation['result']['error_count'] == 0, validation
+
+
+@then(re.compile(u'I expect the validation to report the (vNSF|NS) descriptor errors'))
+def validation_failed(step, kind):
+    response = step.context.api['response']['json']
+    assert 'validation' in response, response
+
+    validation = validation_get(step, response['validation'])
+    assert validation['type'] == kind, validation
+    assert validation['result']['error_count'] > 0, validation
+
+
+@then(u'I expect the validation of the former submission reused')
+def validation_reused(step):
+    response = step.context.api['response']['json']
+    assert step.context.validation is not None, response
+    assert response.get('validation') == step.context.validation, response
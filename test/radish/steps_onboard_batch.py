@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import re
+import tarfile
+from radish import then, when, world
+from storetestingutils.steps_utils import *
+
+
+def input_files(packages):
+    """
+    :param packages: the comma-separated packages, relative to the input data folder.
+    :return: the path to each package.
+    """
+
+    return [os.path.join(world.env['data']['input_data'], package.strip()) for package in packages.split(',')]
+
+
+@when(re.compile(u'I batch onboard the vNSF packages (.*)'))
+def vnsf_onboard_batch(step, packages):
+    # Set proper vNSFO response.
+    mock_vnsfo_response(step, 'onboard_vnsf')
+
+    files = list()
+    try:
+        for path in input_files(packages):
+            files.append(('package', open(path, 'rb')))
+        http_post_file(step, '{}/batch'.format(world.endpoints['vnsfs']), files)
+
+    finally:
+        for _, f in files:
+            f.close()
+
+
+@when(re.compile(u'I batch onboard the NS packages (.*)'))
+def ns_onboard_batch(step, packages):
+    # Set proper vNSFO response, the same for the vNSFs and NSs.
+    mock_vnsfo_response(step, 'onboard_ns')
+
+    files = list()
+    try:
+        for path in input_files(packages):
+            files.append(('package', open(path, 'rb')))
+        http_post_file(step, '{}/batch'.format(world.endpoints['nss']), files)
+
+    finally:
+        for _, f in files:
+            f.close()
+
+
+@when(re.compile(u'I batch onboard a bundle of the vNSF packages (.*)'))
+def vnsf_onboard_bundle(step, packages):
+    # Set proper vNSFO response.
+    mock_vnsfo_response(step, 'onboard_vnsf')
+
+    bundle = io.BytesIO()
+    with tarfile.open(fileobj=bundle, mode='w:gz') as tar:
+        for path in input_files(packages):
+            tar.add(path, arcname=os.path.basename(path))
+    bundle.seek(0)
+
+    http_post_file(step, '{}/batch'.format(world.endpoints['vnsfs']), {'bundle': ('bundle.tar.gz', bundle)})
+
+
+@then(re.compile(u'I expect the batch outcome codes to be (.*)'))
+def batch_outcome_codes(step, codes):
+    items = step.context.api['response']['json']['_items']
+    assert [item['status_code'] for item in items] == [int(code) for code in codes.split(',')], items
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import time
+from radish import then, when, world
+from storetestingutils.steps_utils import *
+
+# The longest time (in seconds) an onboarding job is waited for. Jobs are picked up by the Store every few seconds.
+JOB_TIMEOUT = 60
+
+
+@when(re.compile(u'I submit the vNSF (.*) for background onboarding'))
+def vnsf_onboard_async(step, package):
+    # Set proper vNSFO response.
+    mock_vnsfo_response(step, 'onboard_vnsf')
+
+    # Ask for the onboarding to take place in the background.
+    set_http_headers(step, {'Prefer': 'respond-async'})
+    with open(os.path.join(world.env['data']['input_data'], package), 'rb') as f:
+        files = {'package': f}
+        http_post_file(step, world.endpoints['vnsfs'], files)
+
+
+@then(re.compile(u'I expect the onboarding job to end up (\w+) with code (\d+)'))
+def onboarding_job_outcome(step, state, status):
+    assert 'Location' in step.context.api['response']['headers']
+    url = '{}/{}'.format(world.endpoints['jobs'], step.context.api['response']['json']['_id'])
+
+    deadline = time.time() + JOB_TIMEOUT
+    while True:
+        http_get(step, url)
+        job = step.context.api['response']['json']
+        if job['state'] in ('succeeded', 'failed') or time.time() > deadline:
+            break
+        time.sleep(1)
+
+    assert job['state'] == state, job
+    assert job['status_code'] == int(status), job
+    if state == 'succeeded':
+        assert 'document' in job, job
+
+    # Only the onboarding workers care about the lease and the package stored.
+    assert job['stage'] == 'done', job
+    assert not {'lease_owner', 'lease_expires', 'package_file'} & set(job), job
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import json
+import re
+import uuid
+from urllib.parse import urlencode
+from radish import then, when, world
+from storetestingutils.steps_utils import *
+
+
+def cache_hits(step):
+    http_get(step, world.endpoints['stats'])
+    return step.context.api['response']['json']['response_cache']['hits']
+
+
+@when(u'I look up the validations of this scenario')
+def validations_lookup(step):
+    # The validations of each scenario are told apart by their log.
+    if not hasattr(step.context, 'cache'):
+        step.context.cache = {'marker': uuid.uuid4().hex}
+
+    step.context.cache['hits'] = cache_hits(step)
+
+    query = urlencode({'where': json.dumps({'log': step.context.cache['marker']})})
+    http_get(step, '{}?{}'.format(world.endpoints['validation'], query))
+
+
+@when(u'I add a validation for this scenario')
+def validation_add(step):
+    validation = {'type':     'vNSF',
+                  'result':   {'error_count': 0, 'warning_count': 0, 'issues': []},
+                  'topology': {},
+                  'fwgraph':  {},
+                  'log':      step.context.cache['marker']}
+    http_post_json(step, world.endpoints['validation'], validation)
+
+    step.context.cache['added'] = step.context.api['response']['json']
+
+
+@when(u'I remove the validation added')
+def validation_remove(step):
+    added = step.context.cache['added']
+    http_delete(step, '{}/{}'.format(world.endpoints['validation'], added['_id']), {'If-Match': added['_etag']})
+
+
+@then(re.compile(u'I expect (\d+) validations found'))
+def validations_found(step, count):
+    items = step.context.api['response']['json']['_items']
+    assert len(items) == int(count), items
+
+
+@then(u'I expect the lookup served from the cache')
+def lookup_cached(step):
+    hits = step.context.cache['hits']
+    assert cache_hits(step) == hits + 1, step.context.api['response']['json']
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import re
+from radish import then, when, world
+from storetestingutils.steps_utils import *
+
+
+def media_url(step, field):
+    """
+    Provides the endpoint of a media file of the vNSF just onboarded, looking the vNSF up the first time.
+
+    :param step: the test step context data.
+    :param field: the media field, e.g. 'attestation_file'.
+    :return: the media file endpoint.
+    """
+
+    if not hasattr(step.context, 'media'):
+        http_get(step, '{}/{}'.format(world.endpoints['vnsfs'], step.context.api['response']['json']['_id']))
+        step.context.media = {'vnsf_id': step.context.api['response']['json']['vnsf_id']}
+
+    return '{}/{}/{}'.format(world.endpoints['vnsfs'], step.context.media['vnsf_id'], field)
+
+
+@when(re.compile(u'I download the vNSF (\w+) in whole'))
+def media_download(step, field):
+    http_get(step, media_url(step, field))
+
+    # Kept for the partial and conditional downloads to compare with.
+    step.context.media['content'] = step.context.api['response']['content']
+    step.context.media['etag'] = step.context.api['response']['headers']['ETag']
+
+
+@when(re.compile(u'I download the bytes (\d+)-(\d+) of the vNSF (\w+)'))
+def media_download_range(step, first, last, field):
+    set_http_headers(step, {'Range': 'bytes={}-{}'.format(first, last)})
+    http_get(step, media_url(step, field))
+
+
+@when(re.compile(u'I download the vNSF (\w+) again unless changed'))
+def media_download_unless_changed(step, field):
+    set_http_headers(step, {'If-None-Match': step.context.media['etag']})
+    http_get(step, media_url(step, field))
+
+
+@then(re.compile(u'I expect the bytes (\d+)-(\d+) of the file downloaded'))
+def media_range_content(step, first, last):
+    content = step.context.media['content']
+    first, last = int(first), int(last)
+
+    assert step.context.api['response']['content'] == content[first:last + 1]
+    assert step.context.api['response']['headers']['Content-Range'] == 'bytes {}-{}/{}'.format(first, last,
+                                                                                                len(content))
+
+
+@then(u'I expect no file downloaded')
+def media_not_downloaded(step):
+    assert not step.context.api['response']['content']
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+import re
+import requests
+from radish import then, when, world
+from storetestingutils.steps_utils import *
+
+
+@when(re.compile(u'I search for the vNSFs whose (\w+) is (.*)'))
+def vnsf_search(step, name, value):
+    r = requests.get('{}/search'.format(world.endpoints['vnsfs']), params={name: value})
+    set_http_response(step, r)
+
+
+@then(re.compile(u'I expect every vNSF found and the (\w+) facet to match (.*)'))
+def vnsf_search_matches(step, facet, value):
+    found = step.context.api['response']['json']
+
+    total = found['_meta']['total']
+    assert total >= 1, found
+    assert all(item[facet] == value for item in found['_items']), found
+
+    # Only the vNSFs matching are counted.
+    assert found['_facets'][facet] == {value: total}, found
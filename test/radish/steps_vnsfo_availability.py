@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+import re
+import time
+from radish import then, when, world
+from storetestingutils.steps_utils import *
+
+# The longest time (in seconds) to wait for the circuit to let calls through again. Past the reset timeout.
+CIRCUIT_TIMEOUT = 60
+
+
+@when(u'I ask whether the Store is ready')
+def store_ready(step):
+    http_get(step, world.endpoints['ready'])
+
+
+@when(u'I wait for the vNSFO circuit to let calls through')
+def circuit_wait(step):
+    deadline = time.time() + CIRCUIT_TIMEOUT
+    while True:
+        store_ready(step)
+        state = step.context.api['response']['json']['vnsfo']['state']
+        if state != 'open' or time.time() > deadline:
+            break
+        time.sleep(1)
+
+    assert state != 'open', step.context.api['response']['json']
+
+
+@then(re.compile(u'I expect the vNSFO circuit to be (\w+)'))
+def circuit_state(step, state):
+    assert step.context.api['response']['json']['vnsfo']['state'] == state, step.context.api['response']['json']
+
+
+@then(u'I expect to be told when to retry')
+def retry_after(step):
+    assert int(step.context.api['response']['headers']['Retry-After']) > 0, step.context.api['response']['headers']
+
+
+@then(re.compile(u'I expect the vNSFO failures counted to be (\d+)'))
+def circuit_failures(step, failures):
+    assert step.context.api['response']['json']['vnsfo']['failures'] == int(failures), \
+        step.context.api['response']['json']
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+#  Copyright (c) 2017 SHIELD, UBIWHERE
+# ALL RIGHTS RESERVED.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Neither the name of the SHIELD, UBIWHERE nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# This work has been performed in the framework of the SHIELD project,
+# funded by the European Commission under Grant number 700199 through the
+# Horizon 2020 program. The authors would like to acknowledge the contributions
+# of their colleagues of the SHIELD partner consortium (www.shield-h2020.eu).
+
+
+
+"""
+Times the pure-Python and the libyaml-based safe YAML loader and dumper on descriptors.
+
+Usage: python yaml_benchmark.py <descriptor.yaml> [...]
+"""
+
+import sys
+import timeit
+
+import yaml
+from storeutils import yaml_utils
+
+
+def benchmark(document, number=20):
+    """
+    Times the pure-Python and the libyaml-based safe loader and dumper on a YAML document.
+
+    :param document: the YAML document.
+    :param number: the number of times each operation is timed.
+    :return: the average time (in seconds) per operation, by implementation and operation.
+    """
+
+    implementations = {'python': (yaml.SafeLoader, yaml.SafeDumper)}
+    if yaml_utils.LIBYAML:
+        implementations['libyaml'] = (yaml.CSafeLoader, yaml.CSafeDumper)
+
+    data = yaml_utils.load(document)
+
+    results = dict()
+    for name, (loader, dumper) in implementations.items():
+        results[name] = {
+            'load': timeit.timeit(lambda: yaml_utils.load(document, loader), number=number) / number,
+            'dump': timeit.timeit(lambda: yaml_utils.dump(data, dumper=dumper), number=number) / number,
+            }
+
+    return results
+
+
+if __name__ == '__main__':
+    for path in sys.argv[1:]:
+        with open(path, 'rb') as f:
+            timings = benchmark(f.read())
+
+        for name, timing in sorted(timings.items()):
+            print('{}: {:<8} load {:.6f}s  dump {:.6f}s'.format(path, name, timing['load'], timing['dump']))
+
+        if 'libyaml' in timings:
+            print('{}: libyaml speed-up load x{:.1f}  dump x{:.1f}'.format(
+                    path,
+                    timings['python']['load'] / timings['libyaml']['load'],
+                    timings['python']['dump'] / timings['libyaml']['dump']))
@@ -31,6 +31,7 @@ import re
 import requests
 from deepdiff import DeepDiff
 from radish import given, when, then, world
+from shutil import copyfile
 
 http_headers_to_send = dict()
 
@@ -60,6 +61,8 @@ def set_http_response(step, r):
     step.context.api = dict()
     step.context.api['response'] = dict()
     step.context.api['response']['status'] = r.status_code
+    step.context.api['response']['headers'] = r.headers
+    step.context.api['response']['content'] = r.content
     step.context.api['response']['text'] = r.text
 
     try:
@@ -103,6 +106,25 @@ def http_delete(step, url, headers):
     set_http_response(step, r)
 
 
+def mock_vnsfo_response(step, endpoint):
+    """
+    Sets the mock vNSF Orchestrator to reply to an endpoint with the response defined for the test step.
+
+    :param step: the test step context data.
+    :param endpoint: the mock vNSF Orchestrator endpoint, as named in the testing environment settings.
+    """
+
+    dest_file = os.path.join(world.env['mock']['vnsfo_folder'], world.mock_vnsfo_endpoints[endpoint],
+                             'index.post.json')
+    dest_path = os.path.dirname(dest_file)
+    if not os.path.exists(dest_path):
+        os.makedirs(dest_path, exist_ok=True)
+
+    src_file = os.path.join(world.env['mock']['vnsfo_data'], step.context.mock_vnsfo['response_file'])
+    assert os.path.isfile(src_file)
+    copyfile(src_file, dest_file)
+
+
 def matches_json_file(step, file):
     """
     Checks whether the JSON response from a request matches the expected data present in a file. Any mismatch